@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the hot lookup queries in ``services/repository.py``.
+
+Compares inline ``select()`` statements, rebuilt and re-keyed on every
+call, with the repository's prebuilt statements and with ``lambda_stmt``.
+Requests run against an in-memory SQLite database through
+``AsyncSession``, so the numbers include everything a request pays except
+network round trips.
+
+Reports:
+
+- statement build + cache key time per lookup (pure CPU, no execution)
+- CPU time per simulated request: data version, todo row, column settings
+"""
+
+import asyncio
+import os
+import sys
+import time
+import timeit
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from sqlalchemy import lambda_stmt, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from todo_api.core.serialization import TODO_COLUMNS  # noqa: E402
+from todo_api.models import Base, Todo, User, UserColumnSettings  # noqa: E402
+from todo_api.monitoring.metrics import get_statement_cache_hit_rate, setup_statement_cache_metrics  # noqa: E402
+from todo_api.services import repository  # noqa: E402
+
+REQUESTS = 2000
+REPEATS = 5
+
+
+def build_inline(todo_id: int, user_id: int):
+    return select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
+
+
+def build_lambda(todo_id: int, user_id: int):
+    return lambda_stmt(lambda: select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id))
+
+
+def build_prebuilt(todo_id: int, user_id: int):
+    return repository.TODO_BY_OWNER
+
+
+async def inline_request(db: AsyncSession, todo_id: int, user_id: int) -> None:
+    """The lookups of a ``GET /todos/{id}`` plus a settings read, written inline."""
+    (await db.execute(select(User.data_version).where(User.id == user_id))).scalar_one()
+    (await db.execute(select(*TODO_COLUMNS).where(Todo.id == todo_id, Todo.user_id == user_id))).first()
+    (await db.execute(
+        select(UserColumnSettings).where(UserColumnSettings.user_id == user_id)
+    )).scalar_one_or_none()
+
+
+async def lambda_request(db: AsyncSession, todo_id: int, user_id: int) -> None:
+    """The same lookups as ``lambda_stmt`` statements."""
+    (await db.execute(lambda_stmt(lambda: select(User.data_version).where(User.id == user_id)))).scalar_one()
+    (await db.execute(
+        lambda_stmt(lambda: select(*TODO_COLUMNS).where(Todo.id == todo_id, Todo.user_id == user_id))
+    )).first()
+    (await db.execute(
+        lambda_stmt(lambda: select(UserColumnSettings).where(UserColumnSettings.user_id == user_id))
+    )).scalar_one_or_none()
+
+
+async def repository_request(db: AsyncSession, todo_id: int, user_id: int) -> None:
+    """The same lookups through the repository."""
+    await repository.get_data_version(db, user_id)
+    await repository.get_todo_row(db, todo_id, user_id)
+    await repository.get_column_settings(db, user_id)
+
+
+async def cpu_per_request(db: AsyncSession, request, todo_id: int, user_id: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.process_time()
+        for _ in range(REQUESTS):
+            await request(db, todo_id, user_id)
+        best = min(best, (time.process_time() - start) / REQUESTS)
+    return best
+
+
+async def run_requests() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    setup_statement_cache_metrics(engine.sync_engine, "bench")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        user = User(email="bench@example.com", name="Bench")
+        db.add(user)
+        await db.flush()
+        todo = Todo(title="Benchmark", user_id=user.id, status="todo")
+        db.add(todo)
+        db.add(UserColumnSettings(user_id=user.id, column_order=["todo"], columns_config={}))
+        await db.commit()
+
+        print(f"\n{'per request (3 lookups)':<26} {'CPU (us)':>12} {'saved (us)':>11}")
+        inline = None
+        for name, request in (("inline", inline_request), ("lambda_stmt", lambda_request),
+                              ("repository", repository_request)):
+            # Warm the path so only steady-state cost is measured
+            await request(db, todo.id, user.id)
+            cpu = await cpu_per_request(db, request, todo.id, user.id)
+            inline = cpu if inline is None else inline
+            print(f"{name:<26} {cpu * 1e6:>12.1f} {(inline - cpu) * 1e6:>11.1f}")
+
+    await engine.dispose()
+    print(f"\ncompiled statement cache hit rate: {get_statement_cache_hit_rate():.2%}")
+
+
+def main() -> None:
+    number = 20000
+    print(f"{'select(Todo) build + key':<26} {'CPU (us)':>12}")
+    for name, build in (("inline", build_inline), ("lambda_stmt", build_lambda), ("prebuilt", build_prebuilt)):
+        cpu = min(timeit.repeat(
+            lambda: build(1, 2)._generate_cache_key(), number=number, repeat=REPEATS
+        )) / number
+        print(f"{name:<26} {cpu * 1e6:>12.2f}")
+
+    asyncio.run(run_requests())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for todo list response serialization.
+
+Compares the default FastAPI path (validate ORM objects through
+``TodoSchema``, ``jsonable_encoder``, stdlib ``json``) with the fast path
+used by ``GET /api/v1/todos`` (row tuples encoded by a precompiled
+``TypeAdapter``).
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from todo_api.core.serialization import TODO_FIELDS, dump_todo_rows  # noqa: E402
+from todo_api.models import Todo  # noqa: E402
+from todo_api.schemas.todo import TodoSchema  # noqa: E402
+
+SIZES = (100, 1000)
+REPEATS = 5
+
+
+def make_rows(count: int) -> list:
+    """Build row tuples in ``TODO_COLUMNS`` order."""
+    now = datetime.now(timezone.utc)
+    return [
+        (f"Todo {i}", f"Description for todo {i}", i % 3 == 0,
+         ("todo", "inProgress", "blocked", "done")[i % 4], i, 1, now, None, float(i + 1))
+        for i in range(count)
+    ]
+
+
+def make_todos(rows: list) -> List[Todo]:
+    """Build transient ORM objects from row tuples."""
+    return [Todo(**dict(zip(TODO_FIELDS, row))) for row in rows]
+
+
+def main() -> None:
+    list_adapter = TypeAdapter(List[TodoSchema])
+    response = JSONResponse(content=None)
+
+    def default_path(todos: List[Todo]) -> bytes:
+        validated = list_adapter.validate_python(todos, from_attributes=True)
+        return response.render(jsonable_encoder(validated))
+
+    print(f"{'items':>6} {'default (ms)':>14} {'fast path (ms)':>16} {'speedup':>9}")
+    for size in SIZES:
+        rows = make_rows(size)
+        todos = make_todos(rows)
+        number = max(1, 20000 // size)
+
+        default_time = min(timeit.repeat(lambda: default_path(todos), number=number, repeat=REPEATS)) / number
+        fast_time = min(timeit.repeat(lambda: dump_todo_rows(rows), number=number, repeat=REPEATS)) / number
+
+        print(f"{size:>6} {default_time * 1000:>14.3f} {fast_time * 1000:>16.3f} {default_time / fast_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
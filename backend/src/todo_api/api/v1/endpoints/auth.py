@@ -5,22 +5,32 @@ This module contains all HTTP endpoints related to user authentication,
 including Google OAuth flow and JWT token management.
 """
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
 from pydantic import BaseModel, ConfigDict
 
-from todo_api.config.database import get_db
+from todo_api.config.database import get_async_db, upsert_insert
 from todo_api.config.settings import settings
 from todo_api.config.logging import get_logger, log_api_call, log_authentication_event, log_error
+from todo_api.core.cache import claims_cache, invalidate_cached_user, user_cache
+from todo_api.core.etag import bump_data_version
+from todo_api.core.replicas import set_request_user
 from todo_api.models import User
+from todo_api.services import repository
+from todo_api.services.columns import upsert_column_settings
+from todo_api.services.http_client import get_http_client
 
 router = APIRouter()
 logger = get_logger("auth")
@@ -33,6 +43,9 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 
+# User columns kept in the user cache; data_version is always read fresh
+CACHED_USER_FIELDS = ("id", "email", "name", "google_id", "is_active")
+
 
 # Simple schemas for responses
 class UserSchema(BaseModel):
@@ -73,28 +86,85 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
+def token_claims(user: User) -> Dict[str, Any]:
     """
-    Verify and decode a JWT token.
+    Claims identifying a user in an access token.
+    
+    Args:
+        user: User the token is issued for
+        
+    Returns:
+        ``sub`` (email) and ``uid`` (user ID) claims
+    """
+    return {"sub": user.email, "uid": user.id}
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify and decode a JWT token, reusing earlier decodes of the same token.
+    
+    Decoded claims are cached under a digest of the token until the token
+    expires, so repeated requests skip signature verification.
     
     Args:
         token: JWT token to verify
         
     Returns:
-        Email from token payload or None if invalid
+        Token claims or None if the token is invalid or expired
     """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = claims_cache.get(key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: Optional[str] = payload.get("sub")
-        return email
     except JWTError:
         return None
+    
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        claims_cache.set(key, payload, ttl_seconds=min(claims_cache.ttl_seconds, expires_at - time.time()))
+    return payload
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def verify_token(token: str) -> Optional[str]:
+    """
+    Verify and decode a JWT token.
+    
+    Args:
+        token: JWT token to verify
+        
+    Returns:
+        Email from token payload or None if invalid
+    """
+    payload = decode_token(token)
+    return payload.get("sub") if payload else None
+
+
+def _detached_user(values: Dict[str, Any], data_version: Optional[int] = None) -> User:
+    """Build a per-request User that is not attached to any session."""
+    return User(**values, data_version=data_version)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_updated_user(mapper, connection, target: User) -> None:
+    """Drop cached records of users changed through the ORM, e.g. deactivated."""
+    invalidate_cached_user(target.id)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
     """
     Get the current authenticated user from JWT token.
     
+    Active users are cached by ID for ``AUTH_USER_CACHE_TTL_SECONDS``, so a
+    request with a cached token and user needs no database query. On a miss
+    the user is loaded by the token's ``uid`` claim (primary key); tokens
+    issued before that claim existed fall back to the email lookup.
+    
+    The returned user is detached and its ``data_version`` is only set on a
+    cache miss; readers that need it call ``load_data_version``.
+    
     Args:
         token: JWT token from Authorization header
         db: Database session
@@ -111,21 +181,71 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    email = verify_token(token)
+    payload = decode_token(token)
+    if payload is None:
+        raise credentials_exception
+    
+    email = payload.get("sub")
+    user_id = payload.get("uid")
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    if user_id is not None:
+        values = user_cache.get(user_id)
+        if values is not None and values["email"] == email:
+            set_request_user(user_id)
+            return _detached_user(values)
+        user = await repository.get_user(db, user_id)
+    else:
+        user = await repository.get_user_by_email(db, email)
+    
+    if user is None or user.email != email:
         raise credentials_exception
     
     if user.is_active is not True:
+        invalidate_cached_user(user.id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
     
-    return user
+    values = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+    user_cache.set(user.id, values)
+    set_request_user(user.id)
+    return _detached_user(values, data_version=user.data_version)
+
+
+async def upsert_google_user(
+    db: AsyncSession,
+    email: str,
+    name: Optional[str],
+    google_id: Optional[str]
+) -> User:
+    """
+    Create a user signing in with Google, or refresh an existing user's profile.
+    
+    Runs as a single ``INSERT ... ON CONFLICT (email)`` so concurrent first
+    logins cannot race on the unique email.
+    
+    Args:
+        db: Database session
+        email: Verified Google account email
+        name: Display name from Google
+        google_id: Google account ID (``sub``)
+        
+    Returns:
+        The stored user
+    """
+    stmt = upsert_insert(db, User).values(email=email, name=name, google_id=google_id, is_active=True)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={"name": stmt.excluded.name, "google_id": stmt.excluded.google_id, "updated_at": func.now()}
+    )
+    result = await db.execute(
+        stmt.returning(User),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one()
 
 
 @router.get("/google/login")
@@ -179,13 +299,20 @@ def google_auth():
 
 @router.get("/google/callback")
 @router.get("/google/callback")
-async def google_callback(code: str, db: Session = Depends(get_db)):
+async def google_callback(
+    code: str,
+    db: AsyncSession = Depends(get_async_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
+):
     """
     Handle Google OAuth callback and create/login user.
     
+    Google is called through the shared keep-alive HTTP client.
+    
     Args:
         code: Authorization code from Google
         db: Database session
+        http_client: Shared outbound HTTP client
         
     Returns:
         Redirect to frontend with JWT token
@@ -207,101 +334,94 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
     try:
         # Exchange authorization code for access token
         logger.info("Exchanging authorization code for access token")
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                }
+        token_response = await http_client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            }
+        )
+        
+        if token_response.status_code != 200:
+            logger.error(f"Token exchange failed with status {token_response.status_code}: {token_response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to exchange authorization code for token"
             )
-            
-            if token_response.status_code != 200:
-                logger.error(f"Token exchange failed with status {token_response.status_code}: {token_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to exchange authorization code for token"
-                )
-            
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
-            
-            if not access_token:
-                logger.error("No access token received from Google")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No access token received from Google"
-                )
-            
-            # Get user info from Google
-            logger.info("Fetching user info from Google")
-            user_response = await client.get(
-                GOOGLE_USER_INFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"}
+        
+        token_data = token_response.json()
+        access_token = token_data.get("access_token")
+        
+        if not access_token:
+            logger.error("No access token received from Google")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No access token received from Google"
             )
-            
-            if user_response.status_code != 200:
-                logger.error(f"User info fetch failed with status {user_response.status_code}: {user_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to get user info from Google"
-                )
-            
-            user_data = user_response.json()
-            user_email = user_data.get("email")
-            
-            logger.info(f"Google OAuth successful for user", extra={"user_email": user_email})
-            
-            # Create or get user
-            user = db.query(User).filter(User.email == user_email).first()
-            
-            if not user:
-                logger.info(f"Creating new user", extra={"user_email": user_email})
-                log_authentication_event(logger, "user_created", user_email)
-                user = User(
-                    email=user_email,
-                    name=user_data.get("name"),
-                    google_id=user_data.get("sub"),
-                    is_active=True
-                )
-                db.add(user)
-                db.commit()
-                db.refresh(user)
-            else:
-                logger.info(f"User login", extra={"user_id": user.id, "user_email": user_email})
-                log_authentication_event(logger, "user_login", str(user.id))
-                # Update user info if needed
-                if user.google_id != user_data.get("sub"):
-                    user.google_id = user_data.get("sub")
-                if user.name != user_data.get("name"):
-                    user.name = user_data.get("name")
-                db.commit()
-            
-            # Create JWT token
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-            jwt_token = create_access_token(
-                data={"sub": user.email},
-                expires_delta=access_token_expires
+        
+        # Get user info from Google
+        logger.info("Fetching user info from Google")
+        user_response = await http_client.get(
+            GOOGLE_USER_INFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        
+        if user_response.status_code != 200:
+            logger.error(f"User info fetch failed with status {user_response.status_code}: {user_response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to get user info from Google"
             )
-            
-            log_authentication_event(logger, "jwt_token_created", str(user.id))
-            
-            # Redirect to frontend with token
-            frontend_url = f"{settings.FRONTEND_URL}?token={jwt_token}"
-            logger.info(f"Redirecting to frontend", extra={"user_id": user.id, "frontend_url": settings.FRONTEND_URL})
-            return RedirectResponse(url=frontend_url)
-            
+        
+        user_data = user_response.json()
+        user_email = user_data.get("email")
+        
+        logger.info(f"Google OAuth successful for user", extra={"user_email": user_email})
+        
+        # Create or update the user in one statement; new users also get their
+        # default column settings so the first board load does no writes
+        user = await upsert_google_user(
+            db,
+            email=user_email,
+            name=user_data.get("name"),
+            google_id=user_data.get("sub")
+        )
+        created_settings = await upsert_column_settings(db, user.id, overwrite=False)
+        if created_settings is not None:
+            await bump_data_version(db, user.id)
+        await db.commit()
+        invalidate_cached_user(user.id)
+        
+        if created_settings is not None:
+            logger.info("Created default column settings", extra={"user_id": user.id})
+        logger.info(f"User login", extra={"user_id": user.id, "user_email": user_email})
+        log_authentication_event(logger, "user_login", str(user.id))
+        
+        # Create JWT token
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        jwt_token = create_access_token(
+            data=token_claims(user),
+            expires_delta=access_token_expires
+        )
+        
+        log_authentication_event(logger, "jwt_token_created", str(user.id))
+        
+        # Redirect to frontend with token
+        frontend_url = f"{settings.FRONTEND_URL}?token={jwt_token}"
+        logger.info(f"Redirecting to frontend", extra={"user_id": user.id, "frontend_url": settings.FRONTEND_URL})
+        return RedirectResponse(url=frontend_url)
+        
     except httpx.RequestError as e:
         log_error(logger, e, "google_oauth_request")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to communicate with Google OAuth service"
         )
-    except HTTPException:
-        # Re-raise HTTP exceptions
+    except (HTTPException, PoolTimeoutError):
+        # Re-raise HTTP exceptions and pool timeouts, which are answered with 503
         raise
     except Exception as e:
         log_error(logger, e, "google_oauth_general")
@@ -311,9 +431,9 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
         )
 
 @router.post("/token", response_model=AuthToken)
-def create_token_for_user(
+async def create_token_for_user(
     email: str,
-    db = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a JWT token for a user (for testing purposes).
@@ -328,7 +448,7 @@ def create_token_for_user(
     Raises:
         HTTPException: If user not found
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = await repository.get_user_by_email(db, email)
     
     if not user:
         raise HTTPException(
@@ -345,7 +465,7 @@ def create_token_for_user(
     # Use the already imported settings object
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email},
+        data=token_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -355,7 +475,7 @@ def create_token_for_user(
         expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
 @router.get("/me", response_model=UserSchema)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
     Get current user information.
     
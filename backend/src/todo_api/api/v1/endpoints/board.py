@@ -0,0 +1,110 @@
+"""
+Board endpoints for the Todo List Xtreme API.
+
+This module contains the board snapshot endpoint, which returns everything
+the frontend needs to render a user's board in a single response.
+"""
+
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from todo_api.api.v1.endpoints.auth import get_current_user
+from todo_api.config.database import get_async_db
+from todo_api.config.logging import get_logger, log_api_call, log_database_operation
+from todo_api.core.etag import load_data_version, make_etag, not_modified_response, set_etag_headers
+from todo_api.core.serialization import FastJSONResponse
+from todo_api.models import User, Todo
+from todo_api.schemas.board import BoardSchema
+from todo_api.schemas.column_settings import DefaultColumnSettings
+from todo_api.services import repository
+from todo_api.services.columns import task_order, with_task_ids
+
+router = APIRouter(default_response_class=FastJSONResponse)
+logger = get_logger("board")
+
+
+def _group_todos(todos: List[Todo], column_order: List[str]) -> Dict[str, List[Todo]]:
+    """
+    Group todos, already in board order, by status.
+    
+    Statuses without a configured column keep their own group so nothing
+    is dropped from the snapshot.
+    """
+    grouped: Dict[str, List[Todo]] = {column_id: [] for column_id in column_order}
+    for todo in todos:
+        grouped.setdefault(todo.status, []).append(todo)
+    return grouped
+
+
+@router.get("/", response_model=BoardSchema)
+async def get_board(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a complete snapshot of the current user's board.
+
+    Returns column order, column configuration, and todos grouped by column
+    in position order together with their photos. The snapshot is built
+    from a fixed number of queries on one session regardless of board size:
+    one for the column settings, one for the todos and one ``selectin``
+    load for all photos.
+    Responds with ``304 Not Modified`` when ``If-None-Match`` carries the
+    current ETag.
+
+    Args:
+        request: Incoming request
+        response: Outgoing response (used to set the ETag)
+        db: Database session
+        current_user: Authenticated user
+
+    Returns:
+        Board snapshot for the current user
+    """
+    log_api_call(logger, "/board", "GET", user_id=current_user.id)
+
+    await load_data_version(db, current_user)
+    etag = make_etag(current_user, "board")
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    set_etag_headers(response, etag)
+
+    settings = await repository.get_column_settings(db, current_user.id)
+
+    if settings:
+        column_order = settings.column_order or []
+        columns_config = settings.columns_config or {}
+    else:
+        # Read-only fallback; settings are persisted by the column-settings API
+        default_settings = DefaultColumnSettings.get_default()
+        column_order = default_settings.column_order
+        columns_config = {
+            k: v.model_dump() for k, v in default_settings.columns_config.items()
+        }
+
+    result = await db.execute(
+        select(Todo)
+        .options(selectinload(Todo.photos))
+        .where(Todo.user_id == current_user.id)
+        .order_by(*task_order())
+    )
+    todos = result.scalars().all()
+    grouped = _group_todos(todos, column_order)
+
+    log_database_operation(logger, "SELECT", "todos", user_id=current_user.id, count=len(todos))
+
+    return {
+        "column_order": column_order,
+        "columns_config": with_task_ids(
+            columns_config,
+            {status: [todo.id for todo in column_todos] for status, column_todos in grouped.items()}
+        ),
+        "todos": grouped,
+    }
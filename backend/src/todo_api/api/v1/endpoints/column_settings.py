@@ -5,14 +5,15 @@ This module contains all HTTP endpoints related to user column configuration,
 including getting, creating, updating, and resetting column settings.
 """
 
-import json
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from todo_api.config.database import get_db
+from todo_api.config.database import get_async_db, get_async_read_db
 from todo_api.config.logging import get_logger, log_api_call, log_database_operation, log_error
+from todo_api.core.cache import CachedResponse, response_cache, response_cache_key
+from todo_api.core.etag import bump_data_version, load_data_version, make_etag, not_modified_response
 from todo_api.models import User, UserColumnSettings
 from todo_api.schemas.column_settings import (
     ColumnSettingsSchema,
@@ -22,23 +23,49 @@ from todo_api.schemas.column_settings import (
     ColumnSettingsResponse
 )
 from todo_api.api.v1.endpoints.auth import get_current_user
+from todo_api.services import repository
+from todo_api.services.columns import apply_task_order, load_task_ids, upsert_column_settings, with_task_ids
 
 router = APIRouter()
 logger = get_logger("column_settings")
 
 
+async def settings_with_task_ids(db: AsyncSession, settings: UserColumnSettings) -> dict:
+    """
+    Build a column settings response with ``taskIds`` derived from todo positions.
+    
+    Args:
+        db: Database session
+        settings: Stored column settings
+        
+    Returns:
+        Column settings data matching ``ColumnSettingsSchema``
+    """
+    task_ids = await load_task_ids(db, settings.user_id)
+    return {
+        "id": settings.id,
+        "user_id": settings.user_id,
+        "column_order": settings.column_order,
+        "columns_config": with_task_ids(settings.columns_config or {}, task_ids),
+    }
+
+
 @router.get("/", response_model=ColumnSettingsSchema)
-def get_column_settings(
-    db: Session = Depends(get_db),
+async def get_column_settings(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get column settings for the current user.
     
     If no settings exist, creates and returns default settings including
-    the "Blocked" column.
+    the "Blocked" column. Responds with ``304 Not Modified`` when
+    ``If-None-Match`` carries the current ETag, and serves repeated reads
+    from the response cache.
     
     Args:
+        request: Incoming request
         db: Database session
         current_user: Authenticated user
         
@@ -47,33 +74,40 @@ def get_column_settings(
     """
     logger.info(f"Getting column settings for user {current_user.id}")
     
-    settings = db.query(UserColumnSettings).filter(
-        UserColumnSettings.user_id == current_user.id
-    ).first()
+    await load_data_version(db, current_user)
+    etag = make_etag(current_user, "column-settings")
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    
+    cache_key = response_cache_key(current_user, "column-settings")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response(etag)
+    
+    settings = await repository.get_column_settings(db, current_user.id)
     
     if not settings:
-        # Create default settings with the "Blocked" column
-        default_settings = DefaultColumnSettings.get_default()
-        
-        settings = UserColumnSettings(
-            user_id=current_user.id,
-            columns_config=json.dumps({
-                k: v.model_dump() for k, v in default_settings.columns_config.items()
-            }),
-            column_order=json.dumps(default_settings.column_order)
-        )
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
+        # Create default settings with the "Blocked" column; a concurrent
+        # request creating them first is not an error
+        settings = await upsert_column_settings(db, current_user.id)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
         logger.info(f"Created default column settings for user {current_user.id}")
+        await load_data_version(db, current_user, refresh=True)
+        etag = make_etag(current_user, "column-settings")
+        cache_key = response_cache_key(current_user, "column-settings")
     
-    return settings
+    body = ColumnSettingsSchema.model_validate(await settings_with_task_ids(db, settings))
+    cached = CachedResponse(body=body.model_dump_json().encode("utf-8"))
+    response_cache.set(cache_key, cached, owner=current_user.id)
+    return cached.to_response(etag)
 
 
 @router.post("/", response_model=ColumnSettingsSchema, status_code=status.HTTP_201_CREATED)
-def create_column_settings(
+async def create_column_settings(
     settings: ColumnSettingsCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -92,40 +126,43 @@ def create_column_settings(
     """
     logger.info(f"Creating column settings for user {current_user.id}")
     
-    # Check if settings already exist
-    existing_settings = db.query(UserColumnSettings).filter(
-        UserColumnSettings.user_id == current_user.id
-    ).first()
+    # Insert unless settings already exist; taskIds order is stored as todo positions
+    db_settings = await upsert_column_settings(
+        db,
+        current_user.id,
+        column_order=settings.column_order,
+        columns_config=settings.columns_config,
+        overwrite=False
+    )
     
-    if existing_settings:
+    if db_settings is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Column settings already exist for this user. Use PUT to update."
         )
     
-    # Create new settings
-    db_settings = UserColumnSettings(
-        user_id=current_user.id,
-        columns_config=json.dumps(settings.columns_config),
-        column_order=json.dumps(settings.column_order)
-    )
-    db.add(db_settings)
-    db.commit()
-    db.refresh(db_settings)
+    await apply_task_order(db, current_user.id, settings.columns_config)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
 
     logger.info(f"Created column settings for user {current_user.id}")
-    return db_settings
+    return await settings_with_task_ids(db, db_settings)
 
 
 @router.put("/", response_model=ColumnSettingsSchema)
-def update_column_settings(
+async def update_column_settings(
     settings_update: ColumnSettingsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update column settings for the current user.
     
+    The update is a single upsert, so settings are created if missing and
+    concurrent updates cannot overwrite each other with stale reads.
+    Column membership is not stored in ``columns_config``; the order of
+    any ``taskIds`` sent is saved as the todos' positions instead.
+    
     Args:
         settings_update: Updated column settings
         db: Database session
@@ -141,49 +178,30 @@ def update_column_settings(
         logger.info(f"Updating column settings for user {current_user.id}")
         logger.info(f"Update data received: {settings_update}")
         
-        settings = db.query(UserColumnSettings).filter(
-            UserColumnSettings.user_id == current_user.id
-        ).first()
-        
-        if not settings:
-            # Create default settings if they don't exist, then update
-            default_settings = DefaultColumnSettings.get_default()
-            
-            settings = UserColumnSettings(
-                user_id=current_user.id,
-                columns_config=json.dumps({
-                    k: v.model_dump() for k, v in default_settings.columns_config.items()
-                }),
-                column_order=json.dumps(default_settings.column_order)
-            )
-            db.add(settings)
-            db.flush()  # Flush to get the ID but don't commit yet
-            logger.info(f"Created default settings before update for user {current_user.id}")
-        
-        # Update settings
         update_data = settings_update.model_dump(exclude_unset=True)
         logger.info(f"Update data (exclude_unset): {update_data}")
         
-        if "columns_config" in update_data and update_data["columns_config"] is not None:
-            logger.info(f"Updating columns_config: {update_data['columns_config']}")
-            setattr(settings, "columns_config", json.dumps({
-                k: v.model_dump() if hasattr(v, 'model_dump') else v
-                for k, v in update_data["columns_config"].items()
-            }))
-        
-        if "column_order" in update_data and update_data["column_order"] is not None:
-            logger.info(f"Updating column_order: {update_data['column_order']}")
-            setattr(settings, "column_order", json.dumps(update_data["column_order"]))
+        # Column metadata stays in the settings row; taskIds order becomes todo positions.
+        # Missing settings are created from the defaults in the same statement.
+        columns_config = update_data.get("columns_config")
+        settings = await upsert_column_settings(
+            db,
+            current_user.id,
+            column_order=update_data.get("column_order"),
+            columns_config=columns_config
+        )
+        if columns_config is not None:
+            await apply_task_order(db, current_user.id, columns_config)
         
-        db.commit()
-        db.refresh(settings)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
         logger.info(f"Updated column settings for user {current_user.id}")
-        return settings
+        return await settings_with_task_ids(db, settings)
         
     except Exception as e:
         logger.error(f"Error updating column settings for user {current_user.id}: {str(e)}")
         logger.error(f"Exception type: {type(e)}")
-        db.rollback()
+        await db.rollback()
         from pydantic import ValidationError
         if isinstance(e, ValidationError):
             logger.error(f"Validation errors: {e.errors()}")
@@ -191,8 +209,8 @@ def update_column_settings(
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_column_settings(
-    db: Session = Depends(get_db),
+async def delete_column_settings(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -207,9 +225,7 @@ def delete_column_settings(
     Raises:
         HTTPException: If settings don't exist for the user
     """
-    settings = db.query(UserColumnSettings).filter(
-        UserColumnSettings.user_id == current_user.id
-    ).first()
+    settings = await repository.get_column_settings(db, current_user.id)
     
     if not settings:
         raise HTTPException(
@@ -217,13 +233,14 @@ def delete_column_settings(
             detail="Column settings not found"
         )
     
-    db.delete(settings)
-    db.commit()
+    await db.delete(settings)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
 
 
 @router.post("/reset", response_model=ColumnSettingsSchema)
-def reset_column_settings(
-    db: Session = Depends(get_db),
+async def reset_column_settings(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -238,31 +255,17 @@ def reset_column_settings(
     """
     logger.info(f"Resetting column settings for user {current_user.id}")
     
-    # Delete existing settings if they exist
-    existing_settings = db.query(UserColumnSettings).filter(
-        UserColumnSettings.user_id == current_user.id
-    ).first()
-    
-    if existing_settings:
-        db.delete(existing_settings)
-        db.flush()
-    
-    # Create new default settings
     default_settings = DefaultColumnSettings.get_default()
-    
-    new_settings = UserColumnSettings(
-        user_id=current_user.id,
-        columns_config=json.dumps({
-            k: v.model_dump() for k, v in default_settings.columns_config.items()
-        }),
-        column_order=json.dumps(default_settings.column_order)
+    new_settings = await upsert_column_settings(
+        db,
+        current_user.id,
+        column_order=default_settings.column_order,
+        columns_config=default_settings.columns_config
     )
-    
-    db.add(new_settings)
-    db.commit()
-    db.refresh(new_settings)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     logger.info(f"Reset column settings for user {current_user.id}")
-    return new_settings
+    return await settings_with_task_ids(db, new_settings)
 
 
 @router.get("/default", response_model=dict)
@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 
 # Import from new structure with fallback to old
 try:
-    from todo_api.config.database import get_db, check_database_connection
+    from todo_api.config.database import get_db, get_read_db, check_database_connection
     from todo_api.config.settings import get_settings
     from todo_api.models import User
     from todo_api.monitoring.metrics import get_current_db_metrics
@@ -18,6 +18,7 @@ except ImportError:
     # Fallback to old structure during transition
     from todo_api.config.database import get_db
     from todo_api.config import settings as app_settings
+    get_read_db = get_db
     from todo_api.models import User
     get_settings = lambda: app_settings
     check_database_connection = None
@@ -44,10 +45,13 @@ def health_check():
 
 
 @router.get("/detailed")
-def detailed_health_check(db: Session = Depends(get_db)):
+def detailed_health_check(db: Session = Depends(get_read_db)):
     """
     Detailed health check with database connectivity.
     
+    Reads from a read replica when one is configured and current; the
+    readiness probe checks the primary.
+    
     Args:
         db: Database session
         
@@ -107,7 +111,7 @@ def detailed_health_check(db: Session = Depends(get_db)):
 
 
 @router.get("/database")
-def database_health_check(db: Session = Depends(get_db)):
+def database_health_check(db: Session = Depends(get_read_db)):
     """
     Database-specific health check.
     
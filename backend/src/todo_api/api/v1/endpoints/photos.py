@@ -0,0 +1,161 @@
+"""
+Photo delivery endpoints for the Todo List Xtreme API.
+
+This module serves stored photos in the best size and image format a
+client accepts, redirecting to the chosen stored object. Photo bytes never
+pass through the API: the redirect points at the static upload mount, the
+public bucket or, for private buckets, a short-lived presigned S3 URL.
+It also accepts direct uploads on signed URLs for storage backends that
+cannot presign uploads themselves.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_api.config.database import get_async_db
+from todo_api.config.logging import get_logger
+from todo_api.config.settings import settings
+from todo_api.core.uploads import UploadTooLargeError, payload_too_large, spool_request_body
+from todo_api.services import repository
+from todo_api.services.direct_uploads import LOCAL_UPLOAD, InvalidUploadTokenError, read_upload_token
+from todo_api.services.photo_variants import select_variant
+from todo_api.services.storage import StorageBackend, get_storage_backend
+from todo_api.services.upload_executor import UploadQueueFullError, upload_executor
+
+router = APIRouter()
+logger = get_logger("photos")
+
+# Derivatives never change once recorded; photos still being processed may soon get some
+PROCESSED_CACHE_CONTROL = "public, max-age=86400"
+PENDING_CACHE_CONTROL = "public, max-age=60"
+
+
+@router.put("/uploads/{key:path}", status_code=status.HTTP_204_NO_CONTENT)
+async def put_photo_upload(
+    key: str,
+    request: Request,
+    token: str = Query(..., description="Signed token from the upload ticket URL"),
+    storage: StorageBackend = Depends(get_storage_backend)
+):
+    """
+    Store a photo sent to a signed upload URL.
+    
+    Used by storage backends without presigned uploads. The raw request
+    body is the file; the token in the URL authorizes exactly this key
+    until it expires, and a key can only be written once.
+    
+    Args:
+        key: Storage key from the upload ticket
+        request: Incoming request carrying the file
+        token: Signed upload token
+        storage: Photo storage backend
+        
+    Raises:
+        HTTPException: If the token is invalid or for another key (403),
+            the key is already stored (409), the file is too large (413)
+            or the upload queue is full (503)
+    """
+    try:
+        claims = read_upload_token(token, LOCAL_UPLOAD)
+    except InvalidUploadTokenError:
+        claims = {}
+    if claims.get("key") != key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload URL"
+        )
+    
+    if await run_in_threadpool(storage.object_size, key) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Photo already uploaded"
+        )
+    
+    max_size = claims["max"]
+    try:
+        body, size = await spool_request_body(request, max_size, settings.UPLOAD_CHUNK_SIZE * 16)
+    except UploadTooLargeError:
+        raise payload_too_large(max_size)
+    
+    try:
+        await upload_executor.run(storage.name, storage.save, key, body, claims["ct"], size=size)
+    except UploadTooLargeError:
+        raise payload_too_large(max_size)
+    except UploadQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many uploads in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
+    finally:
+        body.close()
+    
+    logger.info(f"Stored direct upload {key}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{key:path}", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+async def get_photo(
+    key: str,
+    request: Request,
+    size: Optional[int] = Query(None, ge=1, description="Edge length in pixels the photo is displayed at"),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend)
+):
+    """
+    Redirect to the smallest stored rendition of a photo the client accepts.
+    
+    The format is negotiated from the ``Accept`` header: WebP or AVIF
+    derivatives are chosen only for clients that list them, otherwise the
+    JPEG/PNG rendition or the original is served. Like stored photo URLs,
+    the address is unauthenticated so it can be used in ``<img>`` tags;
+    the storage key is unguessable.
+    
+    When the storage backend presigns URLs, stored photo and derivative
+    URLs point at this route; derivative keys are redirected to their
+    presigned URL directly, and redirects are cached for half the
+    presigned URL's lifetime.
+    
+    Args:
+        key: Storage key of the photo (``s3_key``) or of a derivative
+        request: Incoming request
+        size: Bounding box the photo is displayed in; omit for full size
+        db: Database session
+        storage: Photo storage backend
+    
+    Returns:
+        Redirect to the chosen derivative or the original
+    
+    Raises:
+        HTTPException: If no photo has this key
+    """
+    photo = await repository.get_photo_delivery(db, key)
+    
+    if photo is not None:
+        url, variants = photo
+        variant = select_variant(variants, request.headers.get("accept"), size)
+        if variant:
+            key, url = variant["key"], variant["url"]
+        cache_control = PROCESSED_CACHE_CONTROL if variants else PENDING_CACHE_CONTROL
+    elif storage.delivery_url_ttl and storage.owns_key(key):
+        # A derivative's stored URL, which is this route; it exists in one format only
+        url = request.url.path
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo not found"
+        )
+    
+    if storage.delivery_url_ttl:
+        url = storage.delivery_url(key, url)
+        cache_control = f"private, max-age={storage.delivery_url_ttl // 2}"
+    
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": cache_control, "Vary": "Accept"}
+    )
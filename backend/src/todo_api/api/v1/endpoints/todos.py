@@ -5,87 +5,129 @@ This module contains all HTTP endpoints related to todo item management,
 including CRUD operations, photo uploads, and bulk operations.
 """
 
+import mimetypes
 import os
 import uuid
-import json
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import boto3
-from botocore.exceptions import ClientError
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, File, Form, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from todo_api.api.v1.endpoints.auth import get_current_user
-from todo_api.config.database import get_db
+from todo_api.config.database import get_async_db, get_async_read_db
 from todo_api.config.settings import settings
 from todo_api.config.logging import get_logger, log_api_call, log_database_operation, log_error
-from todo_api.models import User, Todo, TodoPhoto, UserColumnSettings
-from todo_api.schemas.todo import TodoSchema, TodoCreate, TodoUpdate
-from todo_api.schemas.photo import TodoPhotoSchema
+from todo_api.core.cache import CachedResponse, response_cache, response_cache_key
+from todo_api.core.etag import bump_data_version, load_data_version, make_etag, not_modified_response
+from todo_api.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from todo_api.core.uploads import UploadTooLargeError, payload_too_large
+from todo_api.core.serialization import FastJSONResponse, TODO_COLUMNS, TODO_FIELDS, dump_todo_row, dump_todo_rows
+from todo_api.models import User, Todo, TodoPhoto
+from todo_api.models.todo import photo_storage_keys
+from todo_api.schemas.todo import TodoSchema, TodoCreate, TodoUpdate, TodoBatchRequest, TodoBatchResponse
+from todo_api.schemas.photo import PhotoUploadConfirm, PhotoUploadTicket, PhotoUploadUrlRequest, TodoPhotoSchema
+from todo_api.services import repository
+from todo_api.services.columns import assign_positions, load_last_positions, next_position
+from todo_api.services.deletion import schedule_photo_deletion
+from todo_api.services.direct_uploads import UPLOAD_TICKET, InvalidUploadTokenError, issue_upload, read_upload_token
+from todo_api.services.photo_variants import photo_variant_pipeline
+from todo_api.services.storage import StorageBackend, StorageError, get_storage_backend
+from todo_api.services.upload_executor import UploadQueueFullError, upload_executor
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = get_logger("todos")
 
 
-def get_s3_client():
-    """Get configured S3 client or None if not available."""
-    if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-        return boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-    return None
-
-
-def ensure_upload_directory():
-    """Ensure the upload directory exists."""
-    upload_dir = getattr(settings, 'UPLOAD_DIR', 'uploads')
-    os.makedirs(upload_dir, exist_ok=True)
-    return upload_dir
-
-
 @router.get("/", response_model=List[TodoSchema])
-def get_todos(
+async def get_todos(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get todos for the current user.
     
+    Todos are ordered by (status, id). When more results are available an
+    opaque cursor is returned in the ``X-Next-Cursor`` response header; pass
+    it back as ``cursor`` to fetch the next page with an index range scan.
+    
+    Responds with ``304 Not Modified`` when ``If-None-Match`` carries the
+    current ETag, without querying the todos. Serialized pages are cached
+    per user and data version, so repeated reads skip the database.
+    
     Args:
-        skip: Number of records to skip (pagination)
+        request: Incoming request
+        skip: Number of records to skip (legacy offset pagination, ignored with cursor)
         limit: Maximum number of records to return
         status: Filter by todo status (todo, inProgress, blocked, done)
+        cursor: Cursor from a previous page's ``X-Next-Cursor`` header
         db: Database session
         current_user: Authenticated user
         
     Returns:
         List of todo items for the current user
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     log_api_call(logger, "/", "GET", user_id=current_user.id, skip=skip, limit=limit, status=status)
     
-    query = db.query(Todo).filter(Todo.user_id == current_user.id)
+    await load_data_version(db, current_user)
+    etag = make_etag(current_user, "todos")
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    
+    cache_key = response_cache_key(current_user, "todos", skip, limit, status, cursor)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response(etag)
+    
+    # Select plain row tuples; they are encoded straight to JSON bytes
+    query = select(*TODO_COLUMNS).where(Todo.user_id == current_user.id)
     
     if status:
-        query = query.filter(Todo.status == status)
+        query = query.where(Todo.status == status)
     
-    todos = query.offset(skip).limit(limit).all()
+    query = query.order_by(Todo.status, Todo.id)
+    
+    if cursor:
+        try:
+            after_status, after_id = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(Todo.status, Todo.id) > tuple_(after_status, after_id))
+    elif skip:
+        query = query.offset(skip)
+    
+    # Fetch one extra row to learn whether another page exists
+    todos = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(todos) > limit
+    todos = todos[:limit]
+    
+    headers = {}
+    if has_more and todos:
+        headers["X-Next-Cursor"] = encode_cursor(todos[-1].status, todos[-1].id)
     
     log_database_operation(logger, "SELECT", "todos", user_id=current_user.id, count=len(todos))
     logger.info(f"Retrieved {len(todos)} todos", extra={"user_id": current_user.id, "status_filter": status})
     
-    return todos
+    cached = CachedResponse(body=dump_todo_rows(todos), headers=headers)
+    response_cache.set(cache_key, cached, owner=current_user.id)
+    return cached.to_response(etag)
 
 
 @router.post("/", response_model=TodoSchema, status_code=status.HTTP_201_CREATED)
-def create_todo(
+async def create_todo(
     todo: TodoCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -102,47 +144,225 @@ def create_todo(
     log_api_call(logger, "/", "POST", user_id=current_user.id, todo_title=todo.title)
     
     try:
-        db_todo = Todo(**todo.dict(), user_id=current_user.id)
+        # Append to the end of its column within the INSERT itself
+        db_todo = Todo(
+            **todo.model_dump(),
+            user_id=current_user.id,
+            position=next_position(current_user.id, todo.status)
+        )
         db.add(db_todo)
-        db.commit()
-        db.refresh(db_todo)
-
-        # Assign the todo to the correct column
-        column = db.query(UserColumnSettings).filter(
-            UserColumnSettings.user_id == current_user.id
-        ).first()
-
-        if column:
-            columns_config = json.loads(column.columns_config)
-            if todo.status in columns_config:
-                columns_config[todo.status]['taskIds'].append(db_todo.id)
-                column.columns_config = json.dumps(columns_config)
-                db.commit()
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        await db.refresh(db_todo)
 
         log_database_operation(logger, "INSERT", "todos", user_id=current_user.id, todo_id=db_todo.id)
         logger.info(f"Created new todo", extra={"user_id": current_user.id, "todo_id": db_todo.id, "title": todo.title})
         
         return db_todo
+    except PoolTimeoutError:
+        # Answered with 503 and Retry-After by the application's handler
+        raise
     except Exception as e:
         log_error(logger, e, "create_todo")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create todo"
         )
 
 
+@router.post("/batch", response_model=TodoBatchResponse)
+async def batch_todos(
+    batch: TodoBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply a list of create, update and delete operations in one transaction.
+    
+    Operations are resolved in request order against the todos' current
+    state, then written with one bulk statement per kind: a multi-row
+    INSERT, an UPDATE by primary key and a DELETE by ID list. Column
+    placement of created and moved todos is computed with one query.
+    Updates and deletes of todos that do not exist or belong to another
+    user are reported as 404 results without failing the rest of the batch,
+    as are updates of todos deleted by a later operation of the batch.
+    
+    Args:
+        batch: Operations to apply
+        db: Database session
+        storage: Photo storage backend
+        current_user: Authenticated user
+        
+    Returns:
+        Per-operation results, in request order
+        
+    Raises:
+        HTTPException: If the batch could not be written
+    """
+    operations = batch.operations
+    log_api_call(logger, "/batch", "POST", user_id=current_user.id, operations=len(operations))
+    
+    target_ids = {operation.id for operation in operations if operation.op != "create"}
+    statuses: Dict[int, str] = {}
+    if target_ids:
+        result = await db.execute(
+            select(Todo.id, Todo.status).where(Todo.user_id == current_user.id, Todo.id.in_(target_ids))
+        )
+        statuses = {todo_id: todo_status for todo_id, todo_status in result.all()}
+    original_statuses = dict(statuses)
+    
+    results: List[Optional[dict]] = [None] * len(operations)
+    creates: List[Tuple[int, dict]] = []
+    updates: Dict[int, dict] = {}
+    update_indexes: List[Tuple[int, int]] = []
+    deleted: List[int] = []
+    
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            creates.append((index, operation.model_dump(exclude={"op"})))
+            continue
+        
+        if operation.id not in statuses:
+            results[index] = {
+                "index": index,
+                "op": operation.op,
+                "status_code": status.HTTP_404_NOT_FOUND,
+                "id": operation.id,
+                "detail": "Todo not found",
+            }
+            continue
+        
+        if operation.op == "update":
+            values = operation.model_dump(exclude={"op", "id"}, exclude_unset=True)
+            # Only description may be cleared; null for other fields means "unchanged"
+            values = {k: v for k, v in values.items() if v is not None or k == "description"}
+            updates.setdefault(operation.id, {}).update(values)
+            statuses[operation.id] = values.get("status", statuses[operation.id])
+            update_indexes.append((index, operation.id))
+        else:
+            updates.pop(operation.id, None)
+            del statuses[operation.id]
+            deleted.append(operation.id)
+            results[index] = {
+                "index": index,
+                "op": operation.op,
+                "status_code": status.HTTP_204_NO_CONTENT,
+                "id": operation.id,
+            }
+    
+    # Todos changing column without an explicit position go to its end
+    moved = [
+        todo_id for todo_id, values in updates.items()
+        if statuses[todo_id] != original_statuses[todo_id] and values.get("position") is None
+    ]
+    placements = [values["status"] for _, values in creates] + [statuses[todo_id] for todo_id in moved]
+    
+    photo_keys: List[str] = []
+    try:
+        if placements:
+            starts = await load_last_positions(db, current_user.id, placements)
+            positions = iter(assign_positions(starts, placements))
+            for _, values in creates:
+                values["position"] = next(positions)
+            for todo_id in moved:
+                updates[todo_id]["position"] = next(positions)
+        
+        if deleted:
+            result = await db.execute(
+                select(TodoPhoto.s3_key, TodoPhoto.variants).where(TodoPhoto.todo_id.in_(deleted))
+            )
+            photo_keys = [key for row in result.all() for key in photo_storage_keys(*row)]
+            await db.execute(delete(TodoPhoto).where(TodoPhoto.todo_id.in_(deleted)))
+            await db.execute(delete(Todo).where(Todo.id.in_(deleted)))
+        
+        update_rows = [{"id": todo_id, **values} for todo_id, values in updates.items() if values]
+        if update_rows:
+            await db.execute(update(Todo), update_rows)
+        
+        created = []
+        if creates:
+            result = await db.execute(
+                insert(Todo).returning(*TODO_COLUMNS, sort_by_parameter_order=True),
+                [{**values, "user_id": current_user.id} for _, values in creates]
+            )
+            created = result.all()
+        
+        updated = {}
+        if updates:
+            result = await db.execute(select(*TODO_COLUMNS).where(Todo.id.in_(updates)))
+            updated = {row.id: row for row in result.all()}
+        
+        if deleted or update_rows or created:
+            await bump_data_version(db, current_user.id)
+        await db.commit()
+    except PoolTimeoutError:
+        # Answered with 503 and Retry-After by the application's handler
+        raise
+    except Exception as e:
+        log_error(logger, e, "batch_todos")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to apply batch"
+        )
+    
+    for (index, _), row in zip(creates, created):
+        results[index] = {
+            "index": index,
+            "op": "create",
+            "status_code": status.HTTP_201_CREATED,
+            "id": row.id,
+            "todo": dict(zip(TODO_FIELDS, row)),
+        }
+    
+    deleted_ids = set(deleted)
+    for index, todo_id in update_indexes:
+        if todo_id in deleted_ids:
+            results[index] = {
+                "index": index,
+                "op": "update",
+                "status_code": status.HTTP_404_NOT_FOUND,
+                "id": todo_id,
+                "detail": "Todo deleted later in the batch",
+            }
+            continue
+        results[index] = {
+            "index": index,
+            "op": "update",
+            "status_code": status.HTTP_200_OK,
+            "id": todo_id,
+            "todo": dict(zip(TODO_FIELDS, updated[todo_id])),
+        }
+    
+    # Queue stored photos for deletion only once the rows are gone
+    schedule_photo_deletion(storage, photo_keys)
+    
+    log_database_operation(
+        logger, "BATCH", "todos", user_id=current_user.id,
+        inserted=len(created), updated=len(update_rows), deleted=len(deleted)
+    )
+    
+    return {"results": results}
+
+
 @router.get("/{todo_id}", response_model=TodoSchema)
-def get_todo(
+async def get_todo(
     todo_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific todo item.
     
+    Responds with ``304 Not Modified`` when ``If-None-Match`` carries the
+    current ETag, and serves repeated reads from the response cache.
+    
     Args:
         todo_id: ID of the todo item
+        request: Incoming request
         db: Database session
         current_user: Authenticated user
         
@@ -152,10 +372,18 @@ def get_todo(
     Raises:
         HTTPException: If todo not found or access denied
     """
-    todo = db.query(Todo).filter(
-        Todo.id == todo_id,
-        Todo.user_id == current_user.id
-    ).first()
+    await load_data_version(db, current_user)
+    etag = make_etag(current_user, "todo")
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    
+    cache_key = response_cache_key(current_user, "todo", todo_id)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached.to_response(etag)
+    
+    todo = await repository.get_todo_row(db, todo_id, current_user.id)
     
     if not todo:
         raise HTTPException(
@@ -163,14 +391,16 @@ def get_todo(
             detail="Todo not found"
         )
     
-    return todo
+    cached = CachedResponse(body=dump_todo_row(todo))
+    response_cache.set(cache_key, cached, owner=current_user.id)
+    return cached.to_response(etag)
 
 
 @router.put("/{todo_id}", response_model=TodoSchema)
-def update_todo(
+async def update_todo(
     todo_id: int,
     todo_update: TodoUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -188,10 +418,7 @@ def update_todo(
     Raises:
         HTTPException: If todo not found or access denied
     """
-    todo = db.query(Todo).filter(
-        Todo.id == todo_id,
-        Todo.user_id == current_user.id
-    ).first()
+    todo = await repository.get_todo(db, todo_id, current_user.id)
     
     if not todo:
         raise HTTPException(
@@ -199,47 +426,29 @@ def update_todo(
             detail="Todo not found"
         )
     
-    # Store the old status before updating
-    old_status = todo.status
-    
     update_data = todo_update.dict(exclude_unset=True)
+    if update_data.get('position') is None:
+        update_data.pop('position', None)
+        # A todo moved to another column without a position goes to its end
+        new_status = update_data.get('status')
+        if new_status and new_status != todo.status:
+            update_data['position'] = next_position(current_user.id, new_status)
+    
     for field, value in update_data.items():
         setattr(todo, field, value)
     
-    db.commit()
-    db.refresh(todo)
-    
-    # Update column settings if status changed
-    if 'status' in update_data and old_status != todo.status:
-        column = db.query(UserColumnSettings).filter(
-            UserColumnSettings.user_id == current_user.id
-        ).first()
-        
-        if column:
-            columns_config = json.loads(column.columns_config)
-            
-            # Remove from old column
-            if old_status in columns_config:
-                if todo_id in columns_config[old_status]['taskIds']:
-                    columns_config[old_status]['taskIds'].remove(todo_id)
-                elif str(todo_id) in columns_config[old_status]['taskIds']:
-                    columns_config[old_status]['taskIds'].remove(str(todo_id))
-            
-            # Add to new column
-            if todo.status in columns_config:
-                if todo_id not in columns_config[todo.status]['taskIds']:
-                    columns_config[todo.status]['taskIds'].append(todo_id)
-            
-            column.columns_config = json.dumps(columns_config)
-            db.commit()
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    await db.refresh(todo)
     
     return todo
 
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+async def delete_todo(
     todo_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -248,15 +457,13 @@ def delete_todo(
     Args:
         todo_id: ID of the todo item
         db: Database session
+        storage: Photo storage backend
         current_user: Authenticated user
         
     Raises:
         HTTPException: If todo not found or access denied
     """
-    todo = db.query(Todo).filter(
-        Todo.id == todo_id,
-        Todo.user_id == current_user.id
-    ).first()
+    todo = await repository.get_todo(db, todo_id, current_user.id)
     
     if not todo:
         raise HTTPException(
@@ -265,52 +472,95 @@ def delete_todo(
         )
     
     # Delete associated photos first
-    photos = db.query(TodoPhoto).filter(TodoPhoto.todo_id == todo_id).all()
+    result = await db.execute(select(TodoPhoto).where(TodoPhoto.todo_id == todo_id))
+    photos = result.scalars().all()
+    photo_keys = [key for photo in photos for key in photo.storage_keys()]
     for photo in photos:
-        # Delete from S3 if configured
-        s3_client = get_s3_client()
-        if s3_client and getattr(photo, "s3_key", None):
-            try:
-                s3_client.delete_object(
-                    Bucket=settings.AWS_S3_BUCKET,
-                    Key=photo.s3_key
-                )
-            except ClientError:
-                pass  # Log error but don't fail the deletion
+        await db.delete(photo)
+    
+    await db.delete(todo)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    
+    schedule_photo_deletion(storage, photo_keys)
+
+
+def validate_photo_extension(filename: str) -> str:
+    """
+    Check that a file name has an allowed photo extension.
+    
+    Args:
+        filename: Name of the uploaded file
         
-        db.delete(photo)
+    Returns:
+        Lower-cased extension including the dot
+        
+    Raises:
+        HTTPException: If the extension is not allowed
+    """
+    allowed_extensions = getattr(settings, 'ALLOWED_EXTENSIONS', ['.jpg', '.jpeg', '.png', '.gif'])
+    file_extension = os.path.splitext(filename)[1].lower()
+    
+    if file_extension not in allowed_extensions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(allowed_extensions)}"
+        )
+    return file_extension
+
+
+async def ensure_todo_owned(db: AsyncSession, todo_id: int, user_id: int) -> None:
+    """
+    Check that a todo exists and belongs to a user.
     
-    db.delete(todo)
-    db.commit()
+    Args:
+        db: Database session
+        todo_id: ID of the todo item
+        user_id: ID of the user
+        
+    Raises:
+        HTTPException: If the todo is not found
+    """
+    if not await repository.todo_exists(db, todo_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo not found"
+        )
 
 
 @router.post("/{todo_id}/photos", response_model=TodoPhotoSchema)
 async def upload_photo(
     todo_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
     current_user: User = Depends(get_current_user)
 ):
     """
     Upload a photo for a todo item.
     
+    Resized derivatives and WebP/AVIF transcodes are generated after the
+    response is sent and appear in the photo's ``variants`` once stored.
+    The returned ``url`` stays valid; the upload is never rewritten.
+    
     Args:
         todo_id: ID of the todo item
+        background_tasks: Tasks run after the response is sent
         file: Uploaded photo file
         db: Database session
+        storage: Photo storage backend
         current_user: Authenticated user
         
     Returns:
         Created photo record
         
     Raises:
-        HTTPException: If todo not found, file invalid, or upload fails
+        HTTPException: If todo not found, file invalid, the upload queue is
+            full (503), or upload fails
     """
     # Verify todo exists and belongs to user
-    todo = db.query(Todo).filter(
-        Todo.id == todo_id,
-        Todo.user_id == current_user.id
-    ).first()
+    todo = await repository.get_todo(db, todo_id, current_user.id)
     
     if not todo:
         raise HTTPException(
@@ -319,65 +569,54 @@ async def upload_photo(
         )
     
     # Validate file type
-    allowed_extensions = getattr(settings, 'ALLOWED_EXTENSIONS', ['.jpg', '.jpeg', '.png', '.gif'])
-    filename = file.filename or ""
-    file_extension = os.path.splitext(filename)[1].lower()
+    file_extension = validate_photo_extension(file.filename or "")
     
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {', '.join(allowed_extensions)}"
-        )
+    # Reject files the multipart parser already knows are too large
+    max_size = settings.MAX_UPLOAD_SIZE
+    if file.size is not None and file.size > max_size:
+        raise payload_too_large(max_size)
     
     # Generate unique filename
     unique_filename = f"{uuid.uuid4()}{file_extension}"
+    # Store the type implied by the validated extension, not what the client claimed
+    content_type = mimetypes.guess_type(unique_filename)[0]
+    photo_key = storage.make_key(current_user.id, unique_filename)
     
     try:
-        # Try S3 upload first
-        s3_client = get_s3_client()
-        if s3_client:
-            s3_key = f"todo-photos/{current_user.id}/{unique_filename}"
-            
-            s3_client.upload_fileobj(
-                file.file,
-                settings.AWS_S3_BUCKET,
-                s3_key,
-                ExtraArgs={'ContentType': file.content_type}
+        # Stream the file to storage on the bounded upload pool
+        try:
+            photo_url = await upload_executor.run(
+                storage.name, storage.save, photo_key, file.file, content_type, size=file.size
             )
-            
-            photo_url = f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{s3_key}"
-            
-            # Save photo record
-            db_photo = TodoPhoto(
-                filename=file.filename,
-                url=photo_url,
-                s3_key=s3_key,
-                todo_id=todo_id
-            )
-        else:
-            # Fallback to local storage
-            upload_dir = ensure_upload_directory()
-            file_path = os.path.join(upload_dir, unique_filename)
-            
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            photo_url = f"/uploads/{unique_filename}"
-            
-            # Save photo record
-            db_photo = TodoPhoto(
-                filename=file.filename,
-                url=photo_url,
-                s3_key="",
-                todo_id=todo_id
+        except UploadTooLargeError:
+            raise payload_too_large(max_size)
+        except UploadQueueFullError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many uploads in progress, please retry",
+                headers={"Retry-After": "1"}
             )
         
+        # Save photo record
+        db_photo = TodoPhoto(
+            filename=file.filename,
+            url=photo_url,
+            s3_key=photo_key,
+            todo_id=todo_id
+        )
+        
         db.add(db_photo)
-        db.commit()
-        db.refresh(db_photo)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        await db.refresh(db_photo)
+        
+        background_tasks.add_task(
+            photo_variant_pipeline.generate, storage, db_photo.id, photo_key, current_user.id
+        )
         return db_photo
         
+    except (HTTPException, PoolTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -385,10 +624,138 @@ async def upload_photo(
         )
 
 
+@router.post("/{todo_id}/photos/upload-url", response_model=PhotoUploadTicket)
+async def create_photo_upload_url(
+    todo_id: int,
+    upload: PhotoUploadUrlRequest,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a URL to upload a photo straight to storage.
+    
+    With S3 storage this is a presigned POST, so the photo bytes never pass
+    through the API; other backends get a signed PUT URL on the API. Send
+    the file as described by the ticket, then call the confirm endpoint
+    with its ``upload_token``.
+    
+    Args:
+        todo_id: ID of the todo item
+        upload: Name of the file to upload
+        db: Database session
+        storage: Photo storage backend
+        current_user: Authenticated user
+        
+    Returns:
+        Upload ticket
+        
+    Raises:
+        HTTPException: If todo not found or the file type is not allowed
+    """
+    await ensure_todo_owned(db, todo_id, current_user.id)
+    validate_photo_extension(upload.filename)
+    
+    ticket = issue_upload(storage, current_user.id, todo_id, upload.filename)
+    log_api_call(logger, f"/todos/{todo_id}/photos/upload-url", "POST", user_id=current_user.id, key=ticket["key"])
+    return ticket
+
+
+@router.post("/{todo_id}/photos/confirm", response_model=TodoPhotoSchema)
+async def confirm_photo_upload(
+    todo_id: int,
+    confirmation: PhotoUploadConfirm,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Record a photo uploaded straight to storage.
+    
+    Checks the upload ticket, verifies the object exists and is within
+    the size limit, and creates the photo record. Derivatives are
+    generated in the background as for ``upload_photo``.
+    
+    Args:
+        todo_id: ID of the todo item
+        confirmation: Upload token from the ticket
+        background_tasks: Tasks run after the response is sent
+        db: Database session
+        storage: Photo storage backend
+        current_user: Authenticated user
+        
+    Returns:
+        Created photo record
+        
+    Raises:
+        HTTPException: If the token is invalid or for another todo (400),
+            todo not found, the upload is missing (400) or too large (413),
+            or it was already confirmed (409)
+    """
+    try:
+        ticket = read_upload_token(confirmation.upload_token, UPLOAD_TICKET)
+    except InvalidUploadTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired upload token"
+        )
+    if ticket.get("user") != current_user.id or ticket.get("todo") != todo_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload token was issued for another todo"
+        )
+    
+    await ensure_todo_owned(db, todo_id, current_user.id)
+    
+    photo_key = ticket["key"]
+    try:
+        size = await run_in_threadpool(storage.object_size, photo_key)
+    except StorageError as e:
+        log_error(logger, e, "confirm_photo_upload")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not verify the upload"
+        )
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload not found; send the file before confirming"
+        )
+    if size > settings.MAX_UPLOAD_SIZE:
+        schedule_photo_deletion(storage, [photo_key])
+        raise payload_too_large(settings.MAX_UPLOAD_SIZE)
+    
+    db_photo = TodoPhoto(
+        filename=ticket["filename"],
+        url=storage.url(photo_key),
+        s3_key=photo_key,
+        todo_id=todo_id
+    )
+    db.add(db_photo)
+    await bump_data_version(db, current_user.id)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload already confirmed"
+        )
+    await db.refresh(db_photo)
+    
+    log_database_operation(logger, "INSERT", "todo_photos", user_id=current_user.id, key=photo_key, bytes=size)
+    background_tasks.add_task(
+        photo_variant_pipeline.generate, storage, db_photo.id, photo_key, current_user.id
+    )
+    return db_photo
+
+
 @router.delete("/photos/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_photo(
+async def delete_photo(
     photo_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -397,15 +764,13 @@ def delete_photo(
     Args:
         photo_id: ID of the photo
         db: Database session
+        storage: Photo storage backend
         current_user: Authenticated user
         
     Raises:
         HTTPException: If photo not found or access denied
     """
-    photo = db.query(TodoPhoto).join(Todo).filter(
-        TodoPhoto.id == photo_id,
-        Todo.user_id == current_user.id
-    ).first()
+    photo = await repository.get_user_photo(db, photo_id, current_user.id)
     
     if not photo:
         raise HTTPException(
@@ -413,61 +778,52 @@ def delete_photo(
             detail="Photo not found"
         )
     
-    # Delete from S3 if configured
-    s3_client = get_s3_client()
-    if s3_client and getattr(photo, "s3_key", None) is not None and getattr(photo, "s3_key", None) != "":
-        try:
-            s3_client.delete_object(
-                Bucket=settings.AWS_S3_BUCKET,
-                Key=photo.s3_key
-            )
-        except ClientError:
-            pass  # Log error but don't fail the deletion
+    photo_keys = photo.storage_keys()
+    await db.delete(photo)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
     
-    db.delete(photo)
-    db.commit()
+    schedule_photo_deletion(storage, photo_keys)
 
 
 @router.delete("/column/{column_status}", status_code=status.HTTP_204_NO_CONTENT)
-def bulk_delete_todos_by_status(
+async def bulk_delete_todos_by_status(
     column_status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageBackend = Depends(get_storage_backend),
     current_user: User = Depends(get_current_user)
 ):
     """
     Bulk delete all todos in a specific column/status.
     
+    Runs a fixed number of statements regardless of column size: one
+    joined SELECT of photo keys, one photo DELETE by subquery and one todo
+    DELETE. Stored photo files are deleted by a background worker after
+    the rows are committed, so the response does not wait on object storage.
+    
     Args:
         column_status: Status of todos to delete (todo, inProgress, blocked, done)
         db: Database session
+        storage: Photo storage backend
         current_user: Authenticated user
     """
-    # Get all todos with the specified status
-    todos = db.query(Todo).filter(
-        Todo.user_id == current_user.id,
-        Todo.status == column_status
-    ).all()
-    
-    # Delete photos for all todos
-    for todo in todos:
-        photos = db.query(TodoPhoto).filter(TodoPhoto.todo_id == todo.id).all()
-        for photo in photos:
-            # Delete from S3 if configured
-            s3_client = get_s3_client()
-            if s3_client and getattr(photo, "s3_key", None) is not None and getattr(photo, "s3_key", None) != "":
-                try:
-                    s3_client.delete_object(
-                        Bucket=settings.AWS_S3_BUCKET,
-                        Key=photo.s3_key
-                    )
-                except ClientError:
-                    pass
-            db.delete(photo)
-    
-    # Delete all todos
-    db.query(Todo).filter(
-        Todo.user_id == current_user.id,
-        Todo.status == column_status
-    ).delete()
-    
-    db.commit()
+    column_todos = (Todo.user_id == current_user.id, Todo.status == column_status)
+    column_todo_ids = select(Todo.id).where(*column_todos)
+    
+    # Collect storage keys with one joined SELECT
+    result = await db.execute(select(TodoPhoto.s3_key, TodoPhoto.variants).join(Todo).where(*column_todos))
+    photo_keys = [key for row in result.all() for key in photo_storage_keys(*row)]
+    
+    # Set-based deletes; the photo DELETE is a no-op where ON DELETE CASCADE is installed
+    await db.execute(delete(TodoPhoto).where(TodoPhoto.todo_id.in_(column_todo_ids)))
+    result = await db.execute(delete(Todo).where(*column_todos).returning(Todo.id))
+    deleted_ids = result.scalars().all()
+    
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    
+    log_database_operation(
+        logger, "DELETE", "todos", user_id=current_user.id, status=column_status, count=len(deleted_ids)
+    )
+    
+    schedule_photo_deletion(storage, photo_keys)
@@ -7,7 +7,7 @@ including all endpoint collections and their configurations.
 
 from fastapi import APIRouter
 
-from .endpoints import auth, todos, column_settings, health
+from .endpoints import auth, todos, column_settings, board, health, photos
 
 # Create the main API router for version 1
 api_router = APIRouter()
@@ -31,6 +31,18 @@ api_router.include_router(
     tags=["column-settings"],
 )
 
+api_router.include_router(
+    board.router,
+    prefix="/board",
+    tags=["board"],
+)
+
+api_router.include_router(
+    photos.router,
+    prefix="/photos",
+    tags=["photos"],
+)
+
 api_router.include_router(
     health.router,
     prefix="/health",
@@ -6,13 +6,15 @@ settings, database configuration, and environment management.
 """
 
 from .settings import settings, get_settings
-from .database import get_db, engine, Base, create_tables, check_database_connection
+from .database import get_db, get_async_db, engine, async_engine, Base, create_tables, check_database_connection
 
 __all__ = [
     "settings",
     "get_settings", 
     "get_db",
+    "get_async_db",
     "engine",
+    "async_engine",
     "Base",
     "create_tables",
     "check_database_connection",
@@ -2,18 +2,29 @@
 Database configuration and session management.
 
 This module handles SQLAlchemy database setup, connection pooling,
-and provides database session dependencies for the API.
+and provides database session dependencies for the API. A synchronous
+engine serves scripts and health checks; API endpoints use the async
+engine so that concurrency scales with connections rather than threads.
+
+When read replicas are configured, sessions from the read dependencies
+(``get_read_db``, ``get_async_read_db``) send their queries to a replica,
+see ``core.replicas``; all other sessions use the primary.
 """
 
 import logging
 from functools import lru_cache
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, List
 
-from sqlalchemy import create_engine, event, text
-from sqlalchemy.engine import Engine
+from fastapi import Depends
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool
 
+from ..core.pool import MeteredAsyncQueuePool, MeteredQueuePool, PoolController, name_pool
+from ..core.replicas import AsyncRoutingSession, Replica, ReplicaRouter, RoutingSession
+from ..monitoring.metrics import setup_statement_cache_metrics
 from .settings import get_settings
 
 # Import metrics setup - handle gracefully if not available
@@ -30,6 +41,23 @@ logger = logging.getLogger(__name__)
 # Import the shared base class from models.base
 from ..models.base import Base
 
+# Async drivers for the schemes replica URLs are given in
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _engine_options() -> Dict[str, Any]:
+    """Pool and statement cache arguments shared by every engine."""
+    settings = get_settings()
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,  # Checkout latency budget
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verify connections before use
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "echo": settings.DEBUG,  # Log SQL queries in debug mode
+    }
+
 
 @lru_cache()
 def get_database_engine() -> Engine:
@@ -41,15 +69,9 @@ def get_database_engine() -> Engine:
     """
     settings = get_settings()
     
-    engine = create_engine(
-        settings.DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,  # Verify connections before use
-        pool_recycle=3600,   # Recycle connections after 1 hour
-        echo=settings.DEBUG,  # Log SQL queries in debug mode
-    )
+    engine = create_engine(settings.DATABASE_URL, poolclass=MeteredQueuePool, **_engine_options())
+    name_pool(engine, "sync")
+    setup_statement_cache_metrics(engine, "sync")
     
     # Set up database metrics monitoring
     if _metrics_available:
@@ -68,9 +90,102 @@ def get_database_engine() -> Engine:
     return engine
 
 
-# Create session factory
+@lru_cache()
+def get_async_database_engine() -> AsyncEngine:
+    """
+    Create and configure the async database engine (asyncpg).
+    
+    Connection checkouts are timed, and waiting longer than
+    ``DB_POOL_TIMEOUT`` raises ``sqlalchemy.exc.TimeoutError`` (answered
+    with 503) rather than queueing requests.
+    
+    Returns:
+        SQLAlchemy AsyncEngine instance with proper configuration
+    """
+    settings = get_settings()
+    
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, poolclass=MeteredAsyncQueuePool, **_engine_options()
+    )
+    name_pool(async_engine, "async")
+    setup_statement_cache_metrics(async_engine.sync_engine, "async")
+    
+    logger.info(f"Async database engine created for: {settings.POSTGRES_SERVER}")
+    return async_engine
+
+
+def _async_url(url: str) -> URL:
+    """Switch a replica URL to the matching async driver."""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+@lru_cache()
+def get_replicas() -> List[Replica]:
+    """
+    Create engines for the configured read replicas.
+    
+    Each replica gets a sync engine (health checks) and an async engine
+    (API endpoints) with the primary's pool settings.
+    
+    Returns:
+        Replicas in ``DATABASE_REPLICA_URLS`` order; empty if none are set
+    """
+    replicas = []
+    for number, url in enumerate(get_settings().DATABASE_REPLICA_URLS, start=1):
+        name = f"replica{number}"
+        replica_engine = create_engine(url, poolclass=MeteredQueuePool, **_engine_options())
+        name_pool(replica_engine, f"{name}-sync")
+        setup_statement_cache_metrics(replica_engine, f"{name}-sync")
+        replica_async_engine = create_async_engine(
+            _async_url(url), poolclass=MeteredAsyncQueuePool, **_engine_options()
+        )
+        name_pool(replica_async_engine, name)
+        setup_statement_cache_metrics(replica_async_engine.sync_engine, name)
+        replicas.append(Replica(name, replica_engine, replica_async_engine))
+        logger.info(f"Read replica {name} configured for: {make_url(url).host}")
+    return replicas
+
+
+_settings = get_settings()
+# Routes read-only sessions to replicas; its lag checks are started by the app lifespan
+replica_router = ReplicaRouter(
+    get_replicas(),
+    max_lag=_settings.REPLICA_MAX_LAG_SECONDS,
+    stickiness=_settings.REPLICA_STICKINESS_SECONDS,
+    check_interval=_settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
+# Create session factories
 engine = get_database_engine()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    info={"replica_router": replica_router},
+)
+
+async_engine = get_async_database_engine()
+# Objects stay usable after commit; async sessions cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=AsyncRoutingSession,
+    info={"replica_router": replica_router},
+)
+
+# Resizes the async pool's overflow from live checkout metrics; started by the app lifespan
+pool_controller = PoolController(
+    async_engine,
+    "async",
+    min_overflow=_settings.DB_POOL_MIN_OVERFLOW,
+    max_overflow=_settings.DB_POOL_MAX_OVERFLOW_LIMIT,
+    target_wait=_settings.DB_POOL_TARGET_WAIT_SECONDS,
+    step=_settings.DB_POOL_OVERFLOW_STEP,
+    interval=_settings.DB_POOL_CONTROL_INTERVAL_SECONDS,
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -97,6 +212,79 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for FastAPI.
+    
+    Yields:
+        SQLAlchemy async database session
+        
+    Usage:
+        @app.get("/")
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Todo))
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+
+def get_read_db(db: Session = Depends(get_db)) -> Session:
+    """
+    Database session dependency for unauthenticated read-only endpoints.
+    
+    Marks the request's session so its reads may be served by a replica.
+    Writes through it still go to the primary.
+    
+    Args:
+        db: Request's database session
+        
+    Returns:
+        The same session, routed to a replica for reads
+    """
+    db.info.update(read_only=True, anonymous_reads=True)
+    return db
+
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+    """
+    Async database session dependency for read-only endpoints.
+    
+    Marks the request's session so its reads may be served by a replica
+    once the user is authenticated; reads then go to the primary instead
+    if the user wrote recently or no replica is current enough. The
+    session is shared with ``get_current_user``, whose lookup stays on the
+    primary.
+    
+    Args:
+        db: Request's async database session
+        
+    Returns:
+        The same session, routed to a replica for reads
+    """
+    db.info["read_only"] = True
+    return db
+
+
+def upsert_insert(db: AsyncSession, entity: Any):
+    """
+    Build an INSERT supporting ``ON CONFLICT`` for the session's database.
+    
+    Args:
+        db: Database session the statement will run on
+        entity: Mapped class or table to insert into
+        
+    Returns:
+        PostgreSQL or SQLite ``Insert`` construct
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(entity)
+
+
 def create_tables():
     """Create all database tables."""
     logger.info("Creating database tables...")
@@ -17,6 +17,23 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 
+# Fields passed in ``extra`` that are copied into JSON log entries
+EXTRA_FIELDS = (
+    "request_id",
+    "user_id",
+    "endpoint",
+    "method",
+    "status_code",
+    "duration_ms",
+    "error_type",
+    "route",
+    "operation",
+    "query_fingerprint",
+    "rows",
+    "parameters",
+)
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
     
@@ -30,20 +47,9 @@ class JSONFormatter(logging.Formatter):
         }
         
         # Add extra fields if present
-        if hasattr(record, "request_id"):
-            log_entry["request_id"] = getattr(record, "request_id")
-        if hasattr(record, "user_id"):
-            log_entry["user_id"] = getattr(record, "user_id")
-        if hasattr(record, "endpoint"):
-            log_entry["endpoint"] = getattr(record, "endpoint")
-        if hasattr(record, "method"):
-            log_entry["method"] = getattr(record, "method")
-        if hasattr(record, "status_code"):
-            log_entry["status_code"] = getattr(record, "status_code")
-        if hasattr(record, "duration_ms"):
-            log_entry["duration_ms"] = getattr(record, "duration_ms")
-        if hasattr(record, "error_type"):
-            log_entry["error_type"] = getattr(record, "error_type")
+        for field in EXTRA_FIELDS:
+            if hasattr(record, field):
+                log_entry[field] = getattr(record, field)
         
         # Add exception info if present
         if record.exc_info:
@@ -51,6 +51,14 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
     
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Construct async (asyncpg) database URL from components."""
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+    
     # JWT settings
     SECRET_KEY: str = "supersecretkey"  # Should be overridden in production
     ALGORITHM: str = "HS256"
@@ -61,6 +69,46 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: str = "todo-list-xtreme"
+    AWS_S3_ENDPOINT_URL: Optional[str] = None  # S3-compatible service, e.g. MinIO
+    S3_MAX_POOL_CONNECTIONS: int = 50  # Shared HTTP connection pool size; >= UPLOAD_MAX_WORKERS * S3_MULTIPART_CONCURRENCY
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024  # Files at least this large use multipart upload
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024  # Part size for multipart uploads
+    S3_MULTIPART_CONCURRENCY: int = 4  # Parts uploaded in parallel per file
+    S3_PRESIGNED_URLS: bool = False  # Keep the bucket private and redirect photo requests to presigned URLs
+    S3_PRESIGN_EXPIRY_SECONDS: int = 300  # Lifetime of presigned photo URLs
+    
+    # Database connection pool (per engine)
+    DB_POOL_SIZE: int = 10  # Connections kept open
+    DB_MAX_OVERFLOW: int = 20  # Initial extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 2.0  # Checkout latency budget; longer waits fail with 503
+    DB_POOL_RECYCLE: int = 3600  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Verify connections before use
+    DB_QUERY_CACHE_SIZE: int = 500  # Compiled SQL statements cached per engine
+    DB_POOL_AUTOSCALE: bool = True  # Adjust max overflow from checkout waits and utilization
+    DB_POOL_MIN_OVERFLOW: int = 5
+    DB_POOL_MAX_OVERFLOW_LIMIT: int = 40  # Keep (pool size + this) * processes below the server's max_connections
+    DB_POOL_TARGET_WAIT_SECONDS: float = 0.05  # Checkout waits above this grow the overflow
+    DB_POOL_OVERFLOW_STEP: int = 5  # Connections added per control step under contention
+    DB_POOL_CONTROL_INTERVAL_SECONDS: float = 5.0
+    DB_SLOW_QUERY_SECONDS: float = 0.5  # Statements at least this slow are logged; 0 disables
+    DB_QUERY_FINGERPRINT_LIMIT: int = 200  # Statement fingerprints with their own metric labels
+    
+    # Read replicas: comma-separated SQLAlchemy URLs (postgresql://...); empty reads from the primary
+    DATABASE_REPLICA_URLS_STR: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 2.0  # Replicas lagging further behind are skipped
+    # After a write, the process that took it reads the user's data from the primary this long.
+    # That mark is per process; other workers rely on the written_version cookie, kept for
+    # as long, and clients that drop cookies may briefly read their older data from them.
+    REPLICA_STICKINESS_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 1.0
+    
+    @property
+    def DATABASE_REPLICA_URLS(self) -> List[str]:
+        """Parse read replica URLs from string."""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS_STR.split(",") if url.strip()]
+    
+    # Photo storage backend: "auto" (S3 if configured, else local), "s3", "local" or "memory"
+    STORAGE_BACKEND: str = "auto"
     
     # Google OAuth settings
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -68,6 +116,12 @@ class Settings(BaseSettings):
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/auth/google/callback"
     FRONTEND_URL: str = "http://localhost:3000"
     
+    # Shared outbound HTTP client (Google OAuth)
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    
     # Monitoring and observability
     OTEL_EXPORTER_OTLP_ENDPOINT: str = "http://localhost:4318"
     OTEL_RESOURCE_ATTRIBUTES: str = "service.name=todo-list-xtreme-api"
@@ -79,12 +133,39 @@ class Settings(BaseSettings):
     LOG_FORMAT: str = "json"  # "json" or "standard"
     LOG_FILE: Optional[str] = None  # Path to log file, None for console only
     
+    # Response cache settings (per-process LRU with TTL)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    # Cached per-user data versions let cache hits skip the database entirely; bounds how long
+    # writes by other processes can take to show to clients that did not make them (0 disables)
+    DATA_VERSION_CACHE_TTL_SECONDS: float = 2.0
+    
+    # Authentication cache settings (decoded token claims and user records)
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0  # Bounds staleness of changes made by other processes
+    
     # Development settings
     DEBUG: bool = False
     TESTING: bool = False
     
     # File upload settings
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # Bytes copied per read when streaming uploads
+    UPLOAD_MAX_WORKERS: int = 8  # Threads storing uploads concurrently
+    UPLOAD_MAX_QUEUE: int = 64  # Uploads allowed to wait for a worker before answering 503
+    DIRECT_UPLOAD_EXPIRY_SECONDS: int = 900  # Lifetime of direct-to-storage upload URLs
+    UPLOADS_ACCEL_REDIRECT_PREFIX: Optional[str] = None  # nginx internal location serving UPLOAD_DIR, e.g. "/_uploads"
+    
+    # Photo derivatives (resized copies and modern-format transcodes); require Pillow
+    PHOTO_VARIANTS_ENABLED: bool = True
+    PHOTO_VARIANT_SIZES: List[int] = [128, 512]  # Bounding box edge lengths in pixels
+    PHOTO_VARIANT_QUALITY: int = 80  # Encoder quality of resized derivatives
+    PHOTO_VARIANT_FORMATS: List[str] = ["webp", "avif"]  # Extra formats served by Accept; unsupported ones are skipped
+    PHOTO_REENCODE_ORIGINALS: bool = True  # Store a metadata-free full-size re-encode and serve it instead of the upload
+    PHOTO_ORIGINAL_QUALITY: int = 85  # Encoder quality of re-encoded originals and full-size transcodes
+    PHOTO_VARIANT_WORKERS: int = 2  # Processes rendering derivatives
     ALLOWED_EXTENSIONS: List[str] = [".jpg", ".jpeg", ".png", ".gif"]
     BASE_DIR: ClassVar[str] = os.path.dirname(os.path.abspath(__file__))
     UPLOAD_DIR: ClassVar[str] = os.path.join(BASE_DIR, "../../../uploads")
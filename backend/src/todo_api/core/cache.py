@@ -0,0 +1,211 @@
+"""
+In-process caching primitives.
+
+This module provides a bounded, thread-safe LRU cache with per-entry
+time-to-live, the shared cache for serialized per-user API responses and
+the caches used to authenticate requests without a database lookup.
+Response cache keys include the user's data version, so an entry can never
+be served after a write to that user's data, even from another worker.
+The versions themselves are cached for a few seconds; a write drops the
+writer's process entry at once, while other processes may serve the
+previous version until their entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from fastapi import Response
+
+from todo_api.config.settings import settings
+from todo_api.monitoring.metrics import record_cache_eviction, record_cache_hit, record_cache_miss
+
+# Clients must revalidate on every use, but may keep the body privately
+CACHE_CONTROL = "private, no-cache"
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a time-to-live.
+
+    Entries can be tagged with an owner (e.g. a user ID) so that all of an
+    owner's entries can be invalidated at once.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Optional[Hashable]]]" = OrderedDict()
+        self._owners: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or if the entry has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    record_cache_hit(self.name)
+                    return value
+                self._remove(key)
+                record_cache_eviction(self.name, "expired")
+
+        record_cache_miss(self.name)
+        return None
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        owner: Optional[Hashable] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            owner: Optional owner tag used for bulk invalidation
+            ttl_seconds: Optional TTL overriding the cache default
+        """
+        if self.max_entries <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + ttl, value, owner)
+            if owner is not None:
+                self._owners.setdefault(owner, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                record_cache_eviction(self.name, "capacity")
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_owner(self, owner: Hashable) -> None:
+        """Remove every entry tagged with the given owner."""
+        with self._lock:
+            keys = self._owners.pop(owner, set())
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    record_cache_eviction(self.name, "invalidated")
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._owners.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and its owner index. Caller must hold the lock."""
+        _, _, owner = self._entries.pop(key)
+        if owner is not None:
+            keys = self._owners.get(owner)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._owners[owner]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized JSON response body plus any headers it carries."""
+
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def to_response(self, etag: str) -> Response:
+        """Build an HTTP response carrying the given ETag."""
+        headers = dict(self.headers)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = CACHE_CONTROL
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+# Shared cache of serialized read responses, keyed per user and data version
+response_cache = TTLCache(
+    "responses",
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES if settings.RESPONSE_CACHE_ENABLED else 0,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def response_cache_key(user: Any, scope: str, *params: Hashable) -> Tuple[Hashable, ...]:
+    """
+    Build a response cache key for one of the user's reads.
+
+    Args:
+        user: Authenticated user
+        scope: Endpoint name, e.g. ``"todos"``
+        params: Query parameters that affect the response
+
+    Returns:
+        Hashable cache key
+    """
+    return (user.id, user.data_version or 0, scope, params)
+
+
+# Users' data versions keyed by user ID, so cached reads need no version query
+version_cache = TTLCache(
+    "data_versions",
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES if settings.RESPONSE_CACHE_ENABLED else 0,
+    ttl_seconds=settings.DATA_VERSION_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user_responses(user_id: int) -> None:
+    """Drop all cached responses and the cached data version for a user."""
+    response_cache.invalidate_owner(user_id)
+    version_cache.delete(user_id)
+
+
+_auth_cache_entries = settings.AUTH_CACHE_MAX_ENTRIES if settings.AUTH_CACHE_ENABLED else 0
+
+# Decoded JWT claims keyed by token digest; entries never outlive the token's exp
+claims_cache = TTLCache(
+    "auth_claims",
+    max_entries=_auth_cache_entries,
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+# Identity fields of active users keyed by user ID
+user_cache = TTLCache(
+    "auth_users",
+    max_entries=_auth_cache_entries,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user's cached record, e.g. after deactivation."""
+    user_cache.delete(user_id)
@@ -0,0 +1,163 @@
+"""
+Conditional request support based on per-user data versions.
+
+Every write to a user's todos, photos or column settings bumps
+``User.data_version``. Read endpoints derive a strong ETag from that
+version, so an unchanged ``If-None-Match`` can be answered with
+``304 Not Modified`` before any list query or serialization runs.
+
+The authenticated user may come from the in-process user cache, which
+does not hold the version; readers call ``load_data_version`` first, which
+takes it from ``version_cache`` unless the client or this process wrote
+since it was cached, and reads it from the database otherwise, so cached
+responses are served without a query. Read-only sessions may get it
+from a replica; when that replica has not replayed the client's last
+write yet, the session and the version are moved to the primary, so the
+data read after a version is never older than it. Sessions that use a
+cached version read from the primary for the same reason.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from todo_api.config.database import replica_router
+from todo_api.core.cache import CACHE_CONTROL, invalidate_user_responses, version_cache
+from todo_api.core.replicas import read_from_primary, written_version
+from todo_api.models import User
+from todo_api.services import repository
+
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> None:
+    """
+    Increment the user's data version as part of the current transaction.
+
+    The increment is done in SQL so concurrent writers never lose a bump.
+    The user's cached responses and version are dropped as well, and again
+    once the transaction commits; responses are keyed by version, so a
+    reader racing the commit can only repopulate the old key.
+    The user's reads are also pinned to the primary for a while, so read
+    replicas that have not caught up yet are not used, and the new version
+    is reported to the client for ``load_data_version`` to compare against.
+
+    Args:
+        db: Database session holding the write transaction
+        user_id: ID of the user whose data changed
+    """
+    version = await repository.increment_data_version(db, user_id)
+    invalidate_user_responses(user_id)
+    db.info.setdefault("bumped_users", set()).add(user_id)
+    replica_router.note_write(user_id, version)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_versions(session: Session) -> None:
+    """Drop versions cached by readers that raced a committed write."""
+    for user_id in session.info.pop("bumped_users", ()):
+        invalidate_user_responses(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_versions(session: Session) -> None:
+    """Forget bumps undone by a rollback."""
+    session.info.pop("bumped_users", None)
+
+
+async def load_data_version(db: AsyncSession, user: User, refresh: bool = False) -> int:
+    """
+    Make sure ``user.data_version`` holds the stored version.
+
+    Args:
+        db: Database session
+        user: Authenticated user from ``get_current_user``
+        refresh: Re-read the version even if it is already set or cached
+
+    Returns:
+        Current data version
+    """
+    if user.data_version is None and not refresh and not replica_router.wrote_recently(user.id):
+        cached = version_cache.get(user.id)
+        if cached is not None and cached >= written_version(user.id):
+            user.data_version = cached
+            # A replica may not have caught up with the cached version yet
+            db.info.setdefault("replica", None)
+
+    if user.data_version is None or refresh:
+        user.data_version = await repository.get_data_version(db, user.id)
+        if user.data_version < written_version(user.id) and read_from_primary(db):
+            # The replica has not replayed the client's last write yet
+            user.data_version = await repository.get_data_version(db, user.id)
+        version_cache.set(user.id, user.data_version)
+    return user.data_version
+
+
+def make_etag(user: User, scope: str) -> str:
+    """
+    Build a strong ETag for one of the user's resources.
+
+    Args:
+        user: Owner of the resource
+        scope: Short resource name, e.g. ``"todos"``
+
+    Returns:
+        Quoted ETag value
+    """
+    return f'"{scope}-{user.id}-{user.data_version or 0}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag.
+
+    Uses the weak comparison required for ``If-None-Match``, so a
+    ``W/`` prefix added by an intermediary still matches.
+
+    Args:
+        if_none_match: Raw header value, if any
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached copy is current
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def not_modified_response(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a ``304 Not Modified`` response if the client's copy is current.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        304 response, or None if the full response must be sent
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    return None
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    """Attach the ETag and revalidation headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,55 @@
+"""
+HTTP content negotiation helpers.
+"""
+
+from typing import Dict, Optional
+
+
+def parse_accept(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an ``Accept`` header into media ranges and their quality values.
+
+    Media ranges are lower-cased and parameters other than ``q`` are
+    dropped. Malformed quality values count as 1, as most servers treat
+    them.
+
+    Args:
+        header: Raw header value, or None if the request had none
+
+    Returns:
+        Quality value keyed by media range, e.g. ``{"image/webp": 1.0}``
+    """
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        media_range, *params = part.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    pass
+        accepted[media_range] = quality
+    return accepted
+
+
+def explicitly_accepts(accepted: Dict[str, float], content_type: str) -> bool:
+    """
+    Whether a client named ``content_type`` in its ``Accept`` header.
+
+    Wildcards such as ``image/*`` are ignored on purpose: browsers send
+    them regardless of which image formats they can actually decode, so
+    only an explicit listing shows support for newer formats.
+
+    Args:
+        accepted: Result of :func:`parse_accept`
+        content_type: Media type to check
+
+    Returns:
+        True if the type is listed with a non-zero quality
+    """
+    return accepted.get(content_type.lower(), 0.0) > 0.0
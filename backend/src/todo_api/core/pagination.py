@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens that encode the sort key of the last
+row on a page. Clients pass them back unchanged to fetch the next page,
+which lets the database seek straight to the next row through an index
+instead of scanning and discarding skipped rows.
+"""
+
+import base64
+import json
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(status: str, todo_id: int) -> str:
+    """
+    Encode a ``(status, id)`` sort key as an opaque cursor.
+
+    Args:
+        status: Status of the last todo on the page
+        todo_id: ID of the last todo on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([status, todo_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        Tuple of (status, id) to resume after
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        status, todo_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeEncodeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if not isinstance(status, str) or not isinstance(todo_id, int) or isinstance(todo_id, bool):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    return status, todo_id
@@ -0,0 +1,194 @@
+"""
+Database connection pool instrumentation and adaptive sizing.
+
+The metered pool classes time every connection checkout and report the
+wait to ``monitoring.metrics``. ``pool_timeout`` is used as the checkout
+latency budget: a request that cannot get a connection within it fails
+with ``sqlalchemy.exc.TimeoutError``, which the application answers with
+``503`` and ``Retry-After`` instead of letting requests queue.
+
+``PoolController`` periodically reads the checkout statistics and the
+pool's utilization and moves ``max_overflow`` between configured bounds:
+it grows quickly while checkouts wait longer than the target, and shrinks
+one connection at a time while the pool is mostly idle, returning
+connections to the database for other processes.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from todo_api.monitoring.metrics import (
+    CheckoutStats,
+    record_db_checkout,
+    set_db_pool_max_overflow,
+    take_db_checkout_stats,
+)
+
+# Imported by config.database, so the config package cannot be used here
+logger = logging.getLogger(__name__)
+
+# Utilization below which an uncontended pool gives back overflow capacity
+IDLE_UTILIZATION = 0.5
+
+
+class CheckoutTimingMixin:
+    """Times ``QueuePool`` checkouts and reports them under ``metrics_name``."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            record_db_checkout(self.metrics_name, time.perf_counter() - start, timed_out=True)
+            raise
+        record_db_checkout(self.metrics_name, time.perf_counter() - start)
+        return record
+
+    def max_overflow(self) -> int:
+        """Current limit on connections opened beyond ``pool_size``."""
+        return self._max_overflow
+
+    def set_max_overflow(self, max_overflow: int) -> None:
+        """
+        Change the overflow limit of the live pool.
+
+        Taken under the pool's overflow lock, so a concurrent checkout
+        counts its overflow connection against either the old or the new
+        limit, never a mix. A lowered limit only stops new overflow
+        connections; open ones are closed when returned to a full pool.
+
+        Args:
+            max_overflow: New limit; must be at least 0
+        """
+        with self._overflow_lock:
+            self._max_overflow = max_overflow
+
+    def recreate(self):
+        # Pools are recreated on dispose() and after invalidation; keep the name
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class MeteredQueuePool(CheckoutTimingMixin, QueuePool):
+    """``QueuePool`` that reports checkout wait times."""
+
+
+class MeteredAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that reports checkout wait times."""
+
+
+def name_pool(engine: Union[Engine, AsyncEngine], name: str) -> None:
+    """Set the name an engine's metered pool reports its metrics under."""
+    pool = engine.pool
+    if isinstance(pool, CheckoutTimingMixin):
+        pool.metrics_name = name
+
+
+class PoolController:
+    """Adjusts a pool's ``max_overflow`` from its checkout waits and utilization."""
+
+    def __init__(
+        self,
+        engine: Union[Engine, AsyncEngine],
+        name: str,
+        min_overflow: int,
+        max_overflow: int,
+        target_wait: float,
+        step: int,
+        interval: float
+    ):
+        self.engine = engine
+        self.name = name
+        self.min_overflow = min_overflow
+        self.max_overflow = max(max_overflow, min_overflow)
+        self.target_wait = target_wait
+        self.step = max(step, 1)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pool(self) -> CheckoutTimingMixin:
+        # The engine swaps in a new pool object on dispose()
+        return self.engine.pool
+
+    def next_overflow(self, current: int, stats: CheckoutStats, utilization: float) -> int:
+        """
+        Decide the overflow limit for the next interval.
+
+        Args:
+            current: Current ``max_overflow``
+            stats: Checkouts since the last decision
+            utilization: Checked-out connections over current capacity
+
+        Returns:
+            New ``max_overflow``, within the configured bounds
+        """
+        if stats.timeouts or stats.max_wait > self.target_wait:
+            target = current + self.step
+        elif utilization < IDLE_UTILIZATION:
+            target = current - 1
+        else:
+            target = current
+        return min(max(target, self.min_overflow), self.max_overflow)
+
+    def adjust(self) -> int:
+        """
+        Apply one control step to the pool.
+
+        Returns:
+            The pool's ``max_overflow`` after the step
+        """
+        pool = self.pool
+        stats = take_db_checkout_stats(self.name)
+        current = pool.max_overflow()
+        capacity = pool.size() + max(current, 0)
+        utilization = pool.checkedout() / capacity if capacity else 1.0
+
+        new = self.next_overflow(current, stats, utilization)
+        if new != current:
+            # QueuePool reads the limit on every checkout, so the change is immediate
+            pool.set_max_overflow(new)
+            logger.info(
+                f"Pool {self.name}: max_overflow {current} -> {new} "
+                f"(max wait {stats.max_wait * 1000:.1f}ms, timeouts {stats.timeouts}, "
+                f"utilization {utilization:.0%})"
+            )
+        set_db_pool_max_overflow(self.name, new)
+        return new
+
+    def start(self) -> None:
+        """Start adjusting the pool every ``interval`` seconds on the running loop."""
+        if self._task is None:
+            pool = self.pool
+            # Start inside the bounds even if the configured initial overflow is not
+            pool.set_max_overflow(min(max(pool.max_overflow(), self.min_overflow), self.max_overflow))
+            set_db_pool_max_overflow(self.name, pool.max_overflow())
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the control loop."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.warning(f"Pool {self.name}: control step failed: {e}")
@@ -0,0 +1,328 @@
+"""
+Read-replica routing.
+
+``RoutingSession`` sends the reads of read-only sessions to a read replica
+and everything else to the primary. A session is read-only when its
+``info["read_only"]`` is set, which the read dependencies in
+``config.database`` do for endpoints that only read.
+
+The replica is chosen once per session, at its first read:
+
+- a user who wrote through this process within the stickiness window
+  reads from the primary, so they always see their own writes;
+- replicas whose last measured lag exceeds the limit, or that could not be
+  reached, are skipped, falling back to the primary if none is left;
+- otherwise replicas are used in turn.
+
+A read-only session that flushes or executes an INSERT, UPDATE or DELETE
+is switched to the primary for the rest of its life.
+
+Write marks are kept in process memory, so with several workers or
+instances the next request may land on a process that never saw the
+write. ``ReadYourWritesMiddleware`` covers that case: it hands the client
+the data version each write produced in a short-lived cookie, and
+``load_data_version`` moves a session to the primary when its replica
+returns an older version than the client wrote. The same cookie keeps
+``load_data_version`` from trusting a version cached before the write.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todo_api.monitoring.metrics import record_db_replica_fallback, set_db_replica_lag
+
+# Imported by config.database, so the config package cannot be used here
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction, or 0 when fully caught up
+# (an idle primary must not make a current replica look stale)
+LAG_QUERIES = {
+    "postgresql": text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+NO_LAG_QUERY = text("SELECT 0")
+
+# Expired write marks are purged once this many users are tracked
+RECENT_WRITERS_PURGE_SIZE = 10_000
+
+# Cookie holding "<user id>:<data version>" of the client's last write
+WRITTEN_VERSION_COOKIE = "written_version"
+
+# The authenticated user of the current request, set by ``get_current_user``
+_request_user: ContextVar[Optional[int]] = ContextVar("request_user", default=None)
+
+
+class RequestWrites:
+    """The last write a client reported and the last one made by its current request."""
+
+    __slots__ = ("reported", "made")
+
+    def __init__(self, reported: Optional[Tuple[int, int]]):
+        # (user ID, data version) pairs
+        self.reported = reported
+        self.made: Optional[Tuple[int, int]] = None
+
+
+# Set per request by ``ReadYourWritesMiddleware``; shared by reference with copied contexts
+_request_writes: ContextVar[Optional[RequestWrites]] = ContextVar("request_writes", default=None)
+
+
+def set_request_user(user_id: int) -> None:
+    """Record the authenticated user of the current request for read routing."""
+    _request_user.set(user_id)
+
+
+def written_version(user_id: int) -> int:
+    """
+    Data version the client says its last write for the user produced.
+
+    Args:
+        user_id: Authenticated user of the request
+
+    Returns:
+        The version from the request's cookie, or 0 if it has none for this user
+    """
+    writes = _request_writes.get()
+    if writes is not None and writes.reported is not None and writes.reported[0] == user_id:
+        return writes.reported[1]
+    return 0
+
+
+def read_from_primary(session: Union[Session, AsyncSession]) -> bool:
+    """
+    Send the remaining reads of a session to the primary.
+
+    Args:
+        session: Session, or ``AsyncSession``, that may be reading from a replica
+
+    Returns:
+        True if the session was reading from a replica
+    """
+    if session.info.get("replica") is None:
+        return False
+    session.info["replica"] = None
+    record_db_replica_fallback("recent_write")
+    return True
+
+
+def _parse_written_version(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    user_id, _, version = (value or "").partition(":")
+    if not (user_id.isdigit() and version.isdigit()):
+        return None
+    return int(user_id), int(version)
+
+
+class Replica:
+    """A read replica's engines and its last measured replication lag."""
+
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        # Unknown until first checked, and while unreachable
+        self.lag: Optional[float] = None
+
+
+class ReplicaRouter:
+    """Chooses the replica, if any, a read-only session reads from."""
+
+    def __init__(
+        self,
+        replicas: Iterable[Replica],
+        max_lag: float,
+        stickiness: float,
+        check_interval: float
+    ):
+        self.replicas: List[Replica] = list(replicas)
+        self.max_lag = max_lag
+        self.stickiness = stickiness
+        self.check_interval = check_interval
+        # User ID -> monotonic time until which their reads use the primary
+        self._recent_writes: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def note_write(self, user_id: int, version: Optional[int] = None) -> None:
+        """
+        Send the user's reads to the primary for the stickiness window.
+
+        Args:
+            user_id: User whose data was written
+            version: Data version the write produced, reported to the client
+                by ``ReadYourWritesMiddleware``
+        """
+        writes = _request_writes.get()
+        if writes is not None and version is not None:
+            writes.made = (user_id, version)
+        if not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent_writes) >= RECENT_WRITERS_PURGE_SIZE:
+                self._recent_writes = {
+                    user: until for user, until in self._recent_writes.items() if until > now
+                }
+            self._recent_writes[user_id] = now + self.stickiness
+
+    def wrote_recently(self, user_id: int) -> bool:
+        """Check whether the user wrote within the stickiness window."""
+        return self._recent_writes.get(user_id, 0.0) > time.monotonic()
+
+    def choose(self, user_id: Optional[int]) -> Optional[Replica]:
+        """
+        Pick the replica for a read-only session.
+
+        Args:
+            user_id: User the session reads for, if known
+
+        Returns:
+            Replica to read from, or None to read from the primary
+        """
+        if not self.replicas:
+            return None
+
+        if user_id is not None and self.wrote_recently(user_id):
+            record_db_replica_fallback("recent_write")
+            return None
+
+        current = [r for r in self.replicas if r.lag is not None and r.lag <= self.max_lag]
+        if not current:
+            record_db_replica_fallback("lag")
+            return None
+        return current[next(self._turn) % len(current)]
+
+    async def check(self) -> None:
+        """Measure every replica's lag; unreachable replicas get no lag."""
+        for replica in self.replicas:
+            try:
+                lag = await asyncio.wait_for(self._measure(replica), timeout=max(self.check_interval, 1.0))
+            except Exception as e:
+                if replica.lag is not None:
+                    logger.warning(f"Replica {replica.name} unavailable, reading from the primary: {e}")
+                lag = None
+            replica.lag = lag
+            set_db_replica_lag(replica.name, lag)
+
+    @staticmethod
+    async def _measure(replica: Replica) -> float:
+        async with replica.async_engine.connect() as connection:
+            query = LAG_QUERIES.get(connection.dialect.name, NO_LAG_QUERY)
+            lag = await connection.scalar(query)
+        return max(float(lag or 0), 0.0)
+
+    def start(self) -> None:
+        """Start checking replica lag every ``check_interval`` seconds on the running loop."""
+        if self.replicas and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the lag checks."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica while ``info["read_only"]`` is set.
+
+    The router is taken from ``info["replica_router"]``. Reads made before
+    the request's user is known (authentication itself) go to the primary
+    unless ``info["anonymous_reads"]`` is set.
+    """
+
+    # Bind to replicas' async engines, for sessions driven by ``AsyncSession``
+    async_engines = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self.info.get("read_only"):
+            if self._flushing or getattr(clause, "is_dml", False):
+                # Whatever the session reads after writing must come from the primary
+                self.info["read_only"] = False
+            elif clause is not None:
+                replica = self._read_replica()
+                if replica is not None:
+                    return replica.async_engine.sync_engine if self.async_engines else replica.engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _read_replica(self) -> Optional[Replica]:
+        if "replica" not in self.info:
+            user_id = _request_user.get()
+            if user_id is None and not self.info.get("anonymous_reads"):
+                return None
+            self.info["replica"] = self.info["replica_router"].choose(user_id)
+        return self.info["replica"]
+
+
+class AsyncRoutingSession(RoutingSession):
+    """``RoutingSession`` used as the ``sync_session_class`` of ``AsyncSession``."""
+
+    async_engines = True
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware that keeps read-your-writes across processes.
+
+    Responses to requests that bumped a data version set the
+    ``WRITTEN_VERSION_COOKIE`` for ``max_age`` seconds; the version the
+    client sends back is what ``written_version`` returns. Clients that do
+    not keep cookies only get the in-process stickiness, and see writes
+    made through other processes once cached data versions expire.
+    """
+
+    def __init__(self, app: ASGIApp, max_age: float):
+        self.app = app
+        self.max_age = max(int(math.ceil(max_age)), 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookie = next((value for name, value in scope["headers"] if name == b"cookie"), b"")
+        reported = cookie_parser(cookie.decode("latin-1")).get(WRITTEN_VERSION_COOKIE)
+        writes = RequestWrites(_parse_written_version(reported))
+        token = _request_writes.set(writes)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes.made is not None:
+                user_id, version = writes.made
+                value = (
+                    f"{WRITTEN_VERSION_COOKIE}={user_id}:{version}; Max-Age={self.max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = [*message.get("headers", []), (b"set-cookie", value.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _request_writes.reset(token)
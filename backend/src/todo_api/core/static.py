@@ -0,0 +1,84 @@
+"""
+Serving of locally stored photos.
+
+Every stored photo and derivative gets a fresh UUID-based name and is
+never rewritten, so responses can be cached by browsers and proxies
+forever. ``UploadFiles`` marks them ``immutable`` and gives them a strong
+ETag derived from the name and size, which stays the same on every
+replica serving the same files. Range requests are answered by
+Starlette's ``FileResponse``, which hands the whole file to the server
+through the ASGI ``pathsend`` extension where supported. Behind nginx,
+``accel_redirect_prefix`` passes the file to the proxy with
+``X-Accel-Redirect`` instead, so it is sent with ``sendfile(2)`` and the
+bytes never pass through a worker.
+"""
+
+import hashlib
+import os
+from mimetypes import guess_type
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+# Stored files never change, so caches may keep them for a year without revalidating
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def file_etag(path: str, size: int) -> str:
+    """
+    Strong ETag of an immutable stored file.
+
+    Args:
+        path: Path of the file
+        size: File size in bytes
+
+    Returns:
+        Quoted ETag value
+    """
+    digest = hashlib.sha256(f"{os.path.basename(path)}:{size}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class UploadFiles(StaticFiles):
+    """``StaticFiles`` for the upload directory with long-lived caching headers."""
+
+    def __init__(self, *, directory: str, accel_redirect_prefix: Optional[str] = None):
+        super().__init__(directory=directory)
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") if accel_redirect_prefix else None
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        name = os.path.basename(full_path)
+        if name.startswith("."):
+            # Partially written uploads are hidden temporary files
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": file_etag(full_path, stat_result.st_size),
+        }
+        if self.accel_redirect_prefix:
+            # nginx serves the file, including Range requests, from an internal location
+            relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = f"{self.accel_redirect_prefix}/{relative_path}"
+            response = Response(
+                status_code=status_code,
+                headers=headers,
+                media_type=guess_type(name)[0] or "application/octet-stream"
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
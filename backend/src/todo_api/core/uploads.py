@@ -0,0 +1,209 @@
+"""
+Bounded-memory handling of uploaded files.
+
+Photo uploads are streamed to disk in fixed-size chunks instead of being
+read into memory, and oversized request bodies are rejected at the ASGI
+layer before the multipart parser spools them. Memory used per upload is
+O(chunk size) regardless of the file's size.
+"""
+
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional, Pattern, Tuple
+
+from fastapi import HTTPException, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Starlette renamed the 413 constant; use the code so either version works
+PAYLOAD_TOO_LARGE = 413
+
+# Allowance for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+def payload_too_large(max_bytes: int) -> HTTPException:
+    """Build the error returned for bodies over the upload limit."""
+    return HTTPException(
+        status_code=PAYLOAD_TOO_LARGE,
+        detail=f"Upload exceeds the maximum size of {max_bytes} bytes"
+    )
+
+
+def save_upload(
+    source: BinaryIO,
+    directory: str,
+    filename: str,
+    max_bytes: int,
+    chunk_size: int
+) -> int:
+    """
+    Stream a file into ``directory`` and atomically move it into place.
+
+    Data is copied chunk by chunk into a temporary file in the target
+    directory, flushed to disk and then renamed to ``filename``, so readers
+    never observe a partially written upload. Blocking; run it in a worker
+    thread from async code.
+
+    Args:
+        source: Readable binary file object
+        directory: Destination directory
+        filename: Final file name inside ``directory``
+        max_bytes: Maximum number of bytes to accept
+        chunk_size: Number of bytes to copy per read
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        UploadTooLargeError: If the file exceeds ``max_bytes``
+    """
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                buffer.write(chunk)
+            buffer.flush()
+            os.fsync(buffer.fileno())
+        os.replace(temp_path, os.path.join(directory, filename))
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
+
+
+async def spool_request_body(request: Request, max_bytes: int, spool_size: int) -> Tuple[BinaryIO, int]:
+    """
+    Receive a raw request body into a temporary file.
+
+    Bodies up to ``spool_size`` bytes stay in memory; larger ones roll
+    over to disk, so memory use stays bounded.
+
+    Args:
+        request: Request whose body is the uploaded file
+        max_bytes: Maximum number of bytes to accept
+        spool_size: Bytes kept in memory before spilling to disk
+
+    Returns:
+        Temporary file positioned at the start, which the caller closes,
+        and the number of bytes received
+
+    Raises:
+        UploadTooLargeError: If the body exceeds ``max_bytes``
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, received
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that caps request body size on upload routes.
+
+    Requests whose ``Content-Length`` exceeds the limit are answered with
+    ``413`` without reading the body. Bodies without a length (chunked
+    transfer) are counted as they are received; once they cross the limit
+    the ``413`` is sent, the app sees a client disconnect and its own
+    response is discarded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int,
+        path_pattern: Optional[str] = r"/photos/?$|/photos/uploads/"
+    ):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_pattern: Optional[Pattern[str]] = re.compile(path_pattern) if path_pattern else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        if self.path_pattern and not self.path_pattern.search(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.max_body_size
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > max_body_size
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    # Answer now and make the app see a client disconnect
+                    rejected = True
+                    if not response_started:
+                        await self._reject(send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    async def _reject(self, send: Send) -> None:
+        body = b'{"detail":"%s"}' % payload_too_large(self.max_body_size).detail.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": PAYLOAD_TOO_LARGE,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -11,10 +11,13 @@ from contextlib import asynccontextmanager
 import sys
 from pathlib import Path
 
-from fastapi import FastAPI, Depends
+import httpx
+from fastapi import FastAPI, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from prometheus_fastapi_instrumentator import Instrumentator
 
@@ -28,9 +31,20 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExport
 from opentelemetry import trace
 
 from .config.settings import settings
-from .config.database import get_db, engine, check_database_connection, create_tables
+from .config.database import (
+    get_async_db, get_read_db, engine, async_engine, pool_controller, replica_router,
+    check_database_connection, create_tables,
+)
 from .config.logging import setup_logging, RequestResponseLoggingMiddleware, get_logger
-from .monitoring.metrics import setup_database_metrics
+from .core.replicas import ReadYourWritesMiddleware
+from .core.static import UploadFiles
+from .core.uploads import MULTIPART_OVERHEAD, RequestSizeLimitMiddleware
+from .monitoring.metrics import configure_query_metrics, set_query_route, setup_database_metrics
+from .services.deletion import photo_deletion_worker
+from .services.http_client import close_http_client, get_http_client, open_http_client
+from .services.photo_variants import photo_variant_pipeline
+from .services.storage import get_storage_backend
+from .services.upload_executor import upload_executor
 from .models import User
 from .api.v1.router import api_router
 
@@ -86,14 +100,30 @@ def setup_metrics(app: FastAPI) -> None:
             include_in_schema=False
         )
         
-        # Set up database metrics
-        setup_database_metrics(engine)
+        # Set up database metrics for the async engine that serves API traffic
+        # and the sync engine behind the health checks
+        configure_query_metrics(settings.DB_QUERY_FINGERPRINT_LIMIT, settings.DB_SLOW_QUERY_SECONDS)
+        setup_database_metrics(async_engine.sync_engine, "async")
+        setup_database_metrics(engine, "sync")
+        # Replica pools use the names their checkout waits are recorded under
+        for replica in replica_router.replicas:
+            setup_database_metrics(replica.async_engine.sync_engine, replica.name)
+            setup_database_metrics(replica.engine, f"{replica.name}-sync")
         
         logger.info("Prometheus metrics configured successfully")
     except Exception as e:
         logger.error(f"Failed to configure metrics: {e}")
 
 
+async def record_query_route(request: Request) -> None:
+    """Tag the request's database statements with its route template for the slow query log."""
+    route = request.scope.get("route")
+    # FastAPI versions that include routers lazily keep the prefixed template here
+    included = request.scope.get("fastapi", {}).get("effective_route_context")
+    template = getattr(included, "path", None) or getattr(route, "path", None)
+    set_query_route(f"{request.method} {template}" if template else None)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management."""
@@ -109,12 +139,32 @@ async def lifespan(app: FastAPI):
     if not settings.TESTING:
         create_tables()
     
+    # Build the shared photo storage client before the first upload
+    get_storage_backend()
+    upload_executor.start()
+    photo_variant_pipeline.start()
+    photo_deletion_worker.start()
+    await open_http_client()
+    if settings.DB_POOL_AUTOSCALE:
+        pool_controller.start()
+    replica_router.start()
+    
     logger.info("Todo List Xtreme API started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Todo List Xtreme API...")
+    # Finish in-flight uploads and queued photo deletions before the process exits
+    await run_in_threadpool(upload_executor.stop)
+    await run_in_threadpool(photo_variant_pipeline.stop)
+    await run_in_threadpool(photo_deletion_worker.stop)
+    await close_http_client()
+    await pool_controller.stop()
+    await replica_router.stop()
+    await async_engine.dispose()
+    for replica in replica_router.replicas:
+        await replica.async_engine.dispose()
 
 
 def create_application() -> FastAPI:
@@ -129,6 +179,7 @@ def create_application() -> FastAPI:
         docs_url="/docs" if not settings.TESTING else None,
         redoc_url="/redoc" if not settings.TESTING else None,
         lifespan=lifespan,
+        dependencies=[Depends(record_query_route)],
     )
     
     # Set up OpenTelemetry
@@ -149,11 +200,34 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor"],
     )
     
     # Add request/response logging middleware
     app.add_middleware(RequestResponseLoggingMiddleware)
     
+    # Reject oversized upload bodies before they are parsed
+    app.add_middleware(
+        RequestSizeLimitMiddleware,
+        max_body_size=settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    )
+    
+    # Tell clients the version their writes produced, so any process can tell stale replicas and caches
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        max_age=max(settings.REPLICA_STICKINESS_SECONDS, settings.DATA_VERSION_CACHE_TTL_SECONDS),
+    )
+    
+    # No connection within the pool's checkout budget: shed load instead of queueing
+    @app.exception_handler(sa_exc.TimeoutError)
+    async def pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError):
+        logger.warning(f"Database pool exhausted for {request.method} {request.url.path}: {exc}")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database is busy, please retry"},
+            headers={"Retry-After": "1"},
+        )
+    
     # Include API routers
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -162,7 +236,13 @@ def create_application() -> FastAPI:
         os.makedirs(settings.UPLOAD_DIR)
 
     if not settings.TESTING:
-        app.mount("/backend/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+        upload_files = UploadFiles(
+            directory=settings.UPLOAD_DIR,
+            accel_redirect_prefix=settings.UPLOADS_ACCEL_REDIRECT_PREFIX,
+        )
+        # Stored photo URLs are /uploads/<name>; /backend/uploads is kept for older links
+        app.mount("/uploads", upload_files, name="uploads")
+        app.mount("/backend/uploads", upload_files, name="backend-uploads")
     
     # Add basic endpoints
     @app.get("/")
@@ -175,7 +255,7 @@ def create_application() -> FastAPI:
         }
     
     @app.get("/health")
-    async def health_check(db: Session = Depends(get_db)):
+    async def health_check(db: Session = Depends(get_read_db)):
         """Health check endpoint."""
         try:
             # Test database connection
@@ -200,10 +280,14 @@ def create_application() -> FastAPI:
     
     # Add Google OAuth callback route (outside API prefix for Google OAuth compatibility)
     @app.get("/auth/google/callback")
-    async def google_callback_redirect(code: str, db: Session = Depends(get_db)):
+    async def google_callback_redirect(
+        code: str,
+        db: AsyncSession = Depends(get_async_db),
+        http_client: httpx.AsyncClient = Depends(get_http_client)
+    ):
         """Redirect Google OAuth callback to the proper API endpoint."""
         from .api.v1.endpoints.auth import google_callback
-        return await google_callback(code, db)
+        return await google_callback(code, db, http_client)
     
     return app
 
@@ -8,13 +8,17 @@ used across all database models in the application.
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy import JSON, Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
 
 # Update to new declarative_base
 Base = declarative_base()
 
+# Native JSONB on PostgreSQL, JSON (stored as text) elsewhere, e.g. SQLite in tests
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class TimestampMixin:
     """Mixin to add created_at and updated_at timestamps to models."""
@@ -5,10 +5,12 @@ This module contains the Todo model and related database models
 for todo items and their associated photos.
 """
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Boolean, Column, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, JSONDocument
 
 
 class Todo(BaseModel):
@@ -20,17 +22,25 @@ class Todo(BaseModel):
         description: Optional detailed description
         is_completed: Whether the todo is completed
         status: Current status/column position (todo, inProgress, blocked, done)
+        position: Fractional rank of the todo within its column
         user_id: Foreign key to User who owns this todo
         owner: Related User instance
         photos: Related TodoPhoto instances
     """
     
     __tablename__ = "todos"
+    __table_args__ = (
+        # Covers per-user listing and keyset pagination on (status, id)
+        Index("ix_todos_user_id_status_id", "user_id", "status", "id"),
+        # Serves board-ordered reads and end-of-column lookups
+        Index("ix_todos_user_id_status_position", "user_id", "status", "position"),
+    )
     
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     is_completed = Column(Boolean, default=False, nullable=False)
     status = Column(String, default="todo", nullable=False)  # Column position
+    position = Column(Float, nullable=True)  # Order within the column
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationships
@@ -39,7 +49,10 @@ class Todo(BaseModel):
         "TodoPhoto", 
         back_populates="todo", 
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        lazy="select",
+        order_by="TodoPhoto.id",
+        # Let ON DELETE CASCADE remove unloaded photos instead of loading them
+        passive_deletes=True,
     )
     
     def __repr__(self) -> str:
@@ -54,6 +67,8 @@ class TodoPhoto(BaseModel):
         filename: Original filename of the uploaded photo
         url: URL where the photo can be accessed
         s3_key: Unique key for S3 storage
+        variants: Resized derivatives (url, key, size, content type), filled in
+            in the background after upload
         todo_id: Foreign key to Todo item
         todo: Related Todo instance
     """
@@ -63,10 +78,31 @@ class TodoPhoto(BaseModel):
     filename = Column(String, nullable=False)
     url = Column(String, nullable=False)
     s3_key = Column(String, unique=True, nullable=False)
-    todo_id = Column(Integer, ForeignKey("todos.id"), nullable=False)
+    variants = Column(JSONDocument, nullable=True)  # List of derivative descriptions
+    todo_id = Column(Integer, ForeignKey("todos.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
     todo = relationship("Todo", back_populates="photos")
     
+    def storage_keys(self) -> List[str]:
+        """Keys of the original and every stored derivative."""
+        return photo_storage_keys(self.s3_key, self.variants)
+    
     def __repr__(self) -> str:
         return f"<TodoPhoto(id={self.id}, filename='{self.filename}')>"
+
+
+def photo_storage_keys(s3_key: Optional[str], variants: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """
+    List the storage keys of a photo and its derivatives.
+    
+    Args:
+        s3_key: Key of the original upload
+        variants: Stored ``TodoPhoto.variants`` value
+        
+    Returns:
+        Non-empty keys, original first
+    """
+    keys = [s3_key] if s3_key else []
+    keys.extend(variant["key"] for variant in variants or [] if variant.get("key"))
+    return keys
@@ -5,10 +5,10 @@ This module contains the User model and related database models
 for user authentication and profile management.
 """
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, JSONDocument
 
 
 class User(BaseModel):
@@ -20,6 +20,7 @@ class User(BaseModel):
         name: User's display name
         google_id: Google OAuth ID (unique)
         is_active: Whether the user account is active
+        data_version: Monotonic counter bumped on every write to the user's data
         todos: Related Todo items
         column_settings: User's column configuration
     """
@@ -30,6 +31,7 @@ class User(BaseModel):
     name = Column(String, nullable=True)
     google_id = Column(String, unique=True, index=True, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     todos = relationship(
@@ -55,16 +57,16 @@ class UserColumnSettings(BaseModel):
     
     Attributes:
         user_id: Foreign key to User
-        column_order: JSON string of column order
-        columns_config: JSON string of column configurations
+        column_order: JSON array of column IDs
+        columns_config: JSON object of column configurations keyed by column ID
         user: Related User instance
     """
     
     __tablename__ = "user_column_settings"
     
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
-    column_order = Column(Text, nullable=True)  # JSON string of column order
-    columns_config = Column(Text, nullable=True)  # JSON string of column configurations
+    column_order = Column(JSONDocument, nullable=True)  # List of column IDs
+    columns_config = Column(JSONDocument, nullable=True)  # Column metadata keyed by column ID
     
     # Relationships
     user = relationship("User", back_populates="column_settings")
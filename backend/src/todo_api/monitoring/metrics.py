@@ -2,33 +2,67 @@
 Database metrics module for monitoring connection pool usage.
 
 This module provides comprehensive database monitoring capabilities
-for the Todo List Xtreme API using Prometheus metrics.
+for the Todo List Xtreme API using Prometheus metrics. Connection pool
+state is read by a collector when ``/metrics`` is scraped, so pool
+checkouts and checkins do no metrics work.
+
+Statements are also grouped by fingerprint: the SQL with literals and
+bound parameters replaced by ``?``. Each fingerprint gets its own latency
+and row count histograms, up to a configured number of fingerprints, and
+statements slower than a threshold are logged with the route that ran
+them and the shape of their parameters.
 """
 from prometheus_client import Gauge, Counter, Histogram, REGISTRY, CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
-from sqlalchemy.pool import Pool
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.pool import Pool, QueuePool
+from contextvars import ContextVar
+from functools import lru_cache
+import hashlib
+import logging
+import re
 import time
 import threading
-from typing import Union, Optional, List, Tuple
+from typing import Any, Dict, NamedTuple, Union, Optional, List, Tuple
+
+# Imported by config.database, so the config package cannot be used here
+slow_query_logger = logging.getLogger("todo_api.slow_queries")
 
 # Global references to metrics - properly typed
-db_connections_active: Optional[Gauge] = None
-db_connections_total: Optional[Gauge] = None
-db_connections_idle: Optional[Gauge] = None
 db_connections_created_total: Optional[Counter] = None
 db_connections_closed_total: Optional[Counter] = None
 db_query_duration_seconds: Optional[Histogram] = None
 db_query_total: Optional[Counter] = None
+cache_hits_total: Optional[Counter] = None
+cache_misses_total: Optional[Counter] = None
+cache_evictions_total: Optional[Counter] = None
+storage_deletes_total: Optional[Counter] = None
+storage_upload_queue_depth: Optional[Gauge] = None
+storage_uploads_in_progress: Optional[Gauge] = None
+storage_uploads_total: Optional[Counter] = None
+storage_upload_bytes_total: Optional[Counter] = None
+storage_upload_duration_seconds: Optional[Histogram] = None
+db_pool_checkout_wait_seconds: Optional[Histogram] = None
+db_pool_checkout_timeouts_total: Optional[Counter] = None
+db_pool_max_overflow: Optional[Gauge] = None
+db_replica_lag_seconds: Optional[Gauge] = None
+db_replica_fallbacks_total: Optional[Counter] = None
+db_statement_cache_total: Optional[Counter] = None
+db_query_fingerprint_duration_seconds: Optional[Histogram] = None
+db_query_fingerprint_rows: Optional[Histogram] = None
+db_query_fingerprint_info: Optional[Gauge] = None
 
-def _get_or_create_gauge(name: str, description: str) -> Gauge:
+def _get_or_create_gauge(name: str, description: str, labelnames: Optional[List[str]] = None) -> Gauge:
     """Get existing gauge or create new one."""
     try:
-        return Gauge(name, description)
+        return Gauge(name, description, labelnames or ())
     except ValueError:
         # Metric already exists, use a simple fallback
         # Create with a prefix to avoid conflicts
-        return Gauge(f"{name}_fallback", description)
+        return Gauge(f"{name}_fallback", description, labelnames or ())
 
 def _get_or_create_counter(name: str, description: str, labelnames: Optional[List[str]] = None) -> Counter:
     """Get existing counter or create new one."""
@@ -44,44 +78,32 @@ def _get_or_create_counter(name: str, description: str, labelnames: Optional[Lis
         else:
             return Counter(f"{name}_fallback", description)
 
-def _get_or_create_histogram(name: str, description: str, buckets: Optional[Tuple[float, ...]] = None) -> Histogram:
+def _get_or_create_histogram(
+    name: str,
+    description: str,
+    buckets: Optional[Tuple[float, ...]] = None,
+    labelnames: Optional[List[str]] = None
+) -> Histogram:
     """Get existing histogram or create new one."""
+    kwargs = {"buckets": buckets} if buckets else {}
     try:
-        if buckets:
-            return Histogram(name, description, buckets=buckets)
-        else:
-            return Histogram(name, description)
+        return Histogram(name, description, labelnames or (), **kwargs)
     except ValueError:
         # Metric already exists, use a simple fallback
-        if buckets:
-            return Histogram(f"{name}_fallback", description, buckets=buckets)
-        else:
-            return Histogram(f"{name}_fallback", description)
+        return Histogram(f"{name}_fallback", description, labelnames or (), **kwargs)
 
 def _initialize_metrics():
     """Initialize all metrics safely."""
-    global db_connections_active, db_connections_total, db_connections_idle
     global db_connections_created_total, db_connections_closed_total
     global db_query_duration_seconds, db_query_total
+    global cache_hits_total, cache_misses_total, cache_evictions_total
+    global storage_deletes_total
+    global storage_upload_queue_depth, storage_uploads_in_progress
+    global storage_uploads_total, storage_upload_bytes_total, storage_upload_duration_seconds
+    global db_pool_checkout_wait_seconds, db_pool_checkout_timeouts_total, db_pool_max_overflow
+    global db_replica_lag_seconds, db_replica_fallbacks_total, db_statement_cache_total
+    global db_query_fingerprint_duration_seconds, db_query_fingerprint_rows, db_query_fingerprint_info
     
-    if db_connections_active is None:
-        db_connections_active = _get_or_create_gauge(
-            'db_connections_active', 
-            'Number of active database connections'
-        )
-
-    if db_connections_total is None:
-        db_connections_total = _get_or_create_gauge(
-            'db_connections_total',
-            'Total number of database connections in pool'  
-        )
-
-    if db_connections_idle is None:
-        db_connections_idle = _get_or_create_gauge(
-            'db_connections_idle',
-            'Number of idle database connections'
-        )
-
     if db_connections_created_total is None:
         db_connections_created_total = _get_or_create_counter(
             'db_connections_created_total',
@@ -108,103 +130,597 @@ def _initialize_metrics():
             ['operation']
         )
 
+    if cache_hits_total is None:
+        cache_hits_total = _get_or_create_counter(
+            'cache_hits_total',
+            'Total number of in-process cache hits',
+            ['cache']
+        )
+
+    if cache_misses_total is None:
+        cache_misses_total = _get_or_create_counter(
+            'cache_misses_total',
+            'Total number of in-process cache misses',
+            ['cache']
+        )
+
+    if cache_evictions_total is None:
+        cache_evictions_total = _get_or_create_counter(
+            'cache_evictions_total',
+            'Total number of in-process cache evictions',
+            ['cache', 'reason']
+        )
+
+    if storage_deletes_total is None:
+        storage_deletes_total = _get_or_create_counter(
+            'storage_deletes_total',
+            'Total number of stored photo objects processed by background deletion',
+            ['result']
+        )
+
+    if storage_upload_queue_depth is None:
+        storage_upload_queue_depth = _get_or_create_gauge(
+            'storage_upload_queue_depth',
+            'Number of photo uploads waiting for an upload worker'
+        )
+
+    if storage_uploads_in_progress is None:
+        storage_uploads_in_progress = _get_or_create_gauge(
+            'storage_uploads_in_progress',
+            'Number of photo uploads currently being stored'
+        )
+
+    if storage_uploads_total is None:
+        storage_uploads_total = _get_or_create_counter(
+            'storage_uploads_total',
+            'Total number of photo uploads by storage backend and result',
+            ['backend', 'result']
+        )
+
+    if storage_upload_bytes_total is None:
+        storage_upload_bytes_total = _get_or_create_counter(
+            'storage_upload_bytes_total',
+            'Total bytes of photos stored',
+            ['backend']
+        )
+
+    if storage_upload_duration_seconds is None:
+        storage_upload_duration_seconds = _get_or_create_histogram(
+            'storage_upload_duration_seconds',
+            'Time spent storing a photo upload, excluding queue wait',
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+        )
+
+    if db_pool_checkout_wait_seconds is None:
+        db_pool_checkout_wait_seconds = _get_or_create_histogram(
+            'db_pool_checkout_wait_seconds',
+            'Time spent waiting for a connection from the pool',
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+            labelnames=['pool']
+        )
+
+    if db_pool_checkout_timeouts_total is None:
+        db_pool_checkout_timeouts_total = _get_or_create_counter(
+            'db_pool_checkout_timeouts_total',
+            'Total number of pool checkouts that gave up waiting for a connection',
+            ['pool']
+        )
+
+    if db_pool_max_overflow is None:
+        db_pool_max_overflow = _get_or_create_gauge(
+            'db_pool_max_overflow',
+            'Current overflow connection limit of the pool',
+            ['pool']
+        )
+
+    if db_replica_lag_seconds is None:
+        db_replica_lag_seconds = _get_or_create_gauge(
+            'db_replica_lag_seconds',
+            'Replication lag of a read replica at the last check; -1 when unreachable',
+            ['replica']
+        )
+
+    if db_replica_fallbacks_total is None:
+        db_replica_fallbacks_total = _get_or_create_counter(
+            'db_replica_fallbacks_total',
+            'Total number of replica-eligible read sessions sent to the primary',
+            ['reason']
+        )
+
+    if db_statement_cache_total is None:
+        db_statement_cache_total = _get_or_create_counter(
+            'db_statement_cache_total',
+            'Total number of statement executions by compiled SQL cache result',
+            ['engine', 'result']
+        )
+
+    if db_query_fingerprint_duration_seconds is None:
+        db_query_fingerprint_duration_seconds = _get_or_create_histogram(
+            'db_query_fingerprint_duration_seconds',
+            'Time spent executing database queries, by statement fingerprint',
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+            labelnames=['fingerprint', 'operation']
+        )
+
+    if db_query_fingerprint_rows is None:
+        db_query_fingerprint_rows = _get_or_create_histogram(
+            'db_query_fingerprint_rows',
+            'Rows returned or affected by database queries, by statement fingerprint',
+            buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000),
+            labelnames=['fingerprint', 'operation']
+        )
+
+    if db_query_fingerprint_info is None:
+        db_query_fingerprint_info = _get_or_create_gauge(
+            'db_query_fingerprint_info',
+            'Normalized SQL of each statement fingerprint',
+            ['fingerprint', 'statement']
+        )
+
 # Initialize metrics on module load
 _initialize_metrics()
 
-# Thread-local storage for query timing
-_local = threading.local()
+
+class PoolCollector(Collector):
+    """
+    Reports the state of registered connection pools at scrape time.
+    
+    Each engine's current pool is read when metrics are collected (the
+    engine replaces its pool on ``dispose()``), instead of setting gauges
+    on every checkout and checkin.
+    """
+    
+    def __init__(self):
+        self._engines: Dict[str, Engine] = {}
+    
+    def add(self, name: str, engine: Engine) -> None:
+        """Report an engine's pool under the ``pool`` label ``name``."""
+        self._engines[name] = engine
+    
+    def describe(self):
+        return self._families()
+    
+    def collect(self):
+        families = self._families()
+        active, total, idle, overflow = families
+        for name, engine in list(self._engines.items()):
+            pool = engine.pool
+            # Other pool classes (NullPool, StaticPool) keep no counts
+            if not isinstance(pool, QueuePool):
+                continue
+            active.add_metric([name], pool.checkedout())
+            total.add_metric([name], pool.size())
+            idle.add_metric([name], pool.checkedin())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        return families
+    
+    @staticmethod
+    def _families() -> List[GaugeMetricFamily]:
+        return [
+            GaugeMetricFamily(
+                'db_connections_active', 'Number of connections checked out of the pool', labels=['pool']
+            ),
+            GaugeMetricFamily(
+                'db_connections_total', 'Configured number of connections kept in the pool', labels=['pool']
+            ),
+            GaugeMetricFamily(
+                'db_connections_idle', 'Number of idle connections in the pool', labels=['pool']
+            ),
+            GaugeMetricFamily(
+                'db_connections_overflow', 'Number of connections open beyond the pool size', labels=['pool']
+            ),
+        ]
+
+
+pool_collector = PoolCollector()
+try:
+    REGISTRY.register(pool_collector)
+except ValueError:
+    # Already registered by an earlier import of this module
+    pass
+
+
+class CheckoutStats(NamedTuple):
+    """Pool checkouts observed since the previous ``take_db_checkout_stats`` call."""
+    
+    count: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    timeouts: int = 0
+
+
+# Checkout statistics per pool, read and reset by the pool controller
+_checkout_stats: Dict[str, CheckoutStats] = {}
+_checkout_stats_lock = threading.Lock()
+
+# Label values for an execution context's ``cache_hit``
+_STATEMENT_CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: 'hit',
+    CacheStats.CACHE_MISS: 'miss',
+    CacheStats.CACHING_DISABLED: 'disabled',
+    CacheStats.NO_CACHE_KEY: 'no_key',
+    CacheStats.NO_DIALECT_SUPPORT: 'unsupported',
+}
+
+# Fingerprint label of statements seen after the fingerprint limit was reached
+OTHER_FINGERPRINT = 'other'
+
+# Fingerprints given their own label, and the slow query threshold (0 disables)
+_fingerprint_limit = 200
+_slow_query_seconds = 0.0
+_fingerprint_labels: Dict[str, str] = {}
+_fingerprint_lock = threading.Lock()
+
+# Route of the current request, for the slow query log
+_query_route: ContextVar[Optional[str]] = ContextVar("query_route", default=None)
+
+_SQL_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+# String and numeric literals, and the placeholders of every DBAPI paramstyle
+_SQL_VALUE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_SQL_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SQL_ROW_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SQL_SPACE = re.compile(r"\s+")
+
+
+class QueryFingerprint(NamedTuple):
+    """A statement's normalized SQL and the short ID used as its metric label."""
+    
+    id: str
+    statement: str
+    operation: str
+
+
+def configure_query_metrics(fingerprint_limit: int, slow_query_seconds: float) -> None:
+    """
+    Set the limits of per-fingerprint query metrics.
+    
+    Args:
+        fingerprint_limit: Distinct fingerprints given their own label; later
+            ones are recorded as ``other``
+        slow_query_seconds: Statements taking at least this long are logged;
+            0 disables the slow query log
+    """
+    global _fingerprint_limit, _slow_query_seconds
+    _fingerprint_limit = fingerprint_limit
+    _slow_query_seconds = slow_query_seconds
+
+
+def set_query_route(route: Optional[str]) -> None:
+    """Record the route of the current request for the slow query log."""
+    _query_route.set(route)
 
 
-def setup_database_metrics(engine: Engine):
+@lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> QueryFingerprint:
+    """
+    Normalize a SQL statement to its literal-free fingerprint.
+    
+    Comments are dropped, literals and placeholders become ``?``, lists
+    of values (``IN (?, ?)``, multi-row ``VALUES``) become ``(...)`` and
+    whitespace is collapsed, so statements differing only in their values
+    or the length of a list share a fingerprint. SQLAlchemy reuses the
+    string of a cached compiled statement, so repeats hit this cache.
+    
+    Args:
+        statement: SQL sent to the DBAPI cursor
+        
+    Returns:
+        Fingerprint of the statement
+    """
+    normalized = _SQL_COMMENT.sub(" ", statement)
+    normalized = _SQL_VALUE.sub("?", normalized)
+    normalized = _SQL_VALUE_LIST.sub("(...)", normalized)
+    normalized = _SQL_ROW_LIST.sub("(...)", normalized)
+    normalized = _SQL_SPACE.sub(" ", normalized).strip()
+    fingerprint_id = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return QueryFingerprint(fingerprint_id, normalized, _get_operation_type(normalized))
+
+
+def _fingerprint_label(fingerprint: QueryFingerprint) -> str:
+    """Label for a fingerprint, or ``other`` once the fingerprint limit is reached."""
+    label = _fingerprint_labels.get(fingerprint.id)
+    if label is not None:
+        return label
+    
+    with _fingerprint_lock:
+        if fingerprint.id not in _fingerprint_labels:
+            if len(_fingerprint_labels) >= _fingerprint_limit:
+                return OTHER_FINGERPRINT
+            _fingerprint_labels[fingerprint.id] = fingerprint.id
+            if db_query_fingerprint_info:
+                db_query_fingerprint_info.labels(
+                    fingerprint=fingerprint.id, statement=fingerprint.statement
+                ).set(1)
+        return _fingerprint_labels[fingerprint.id]
+
+
+def _value_shape(value: Any) -> str:
+    """Type of a bound value, with the length of strings and collections."""
+    if isinstance(value, (str, bytes, list, tuple, set, frozenset, dict)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """
+    Describe bound parameters without their values.
+    
+    Args:
+        parameters: Parameters passed to the DBAPI cursor
+        executemany: Whether ``parameters`` is a list of parameter sets
+        
+    Returns:
+        Value types by name or position; for ``executemany``, the number
+        of parameter sets and the shape of the first
+    """
+    if executemany:
+        parameters = list(parameters or ())
+        return {
+            "sets": len(parameters),
+            "first": _parameter_shape(parameters[0], False) if parameters else None,
+        }
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return None if parameters is None else _value_shape(parameters)
+
+
+def _record_query(
+    statement: str,
+    parameters: Any,
+    executemany: bool,
+    duration: float,
+    rows: int
+) -> None:
+    """Record an executed statement by fingerprint and log it if it was slow."""
+    fingerprint = fingerprint_statement(statement)
+    if db_query_total:
+        db_query_total.labels(operation=fingerprint.operation).inc()
+    
+    label = _fingerprint_label(fingerprint)
+    if db_query_fingerprint_duration_seconds:
+        db_query_fingerprint_duration_seconds.labels(
+            fingerprint=label, operation=fingerprint.operation
+        ).observe(duration)
+    # DBAPIs report -1 when the count is unknown, e.g. SQLite SELECTs
+    if rows >= 0 and db_query_fingerprint_rows:
+        db_query_fingerprint_rows.labels(fingerprint=label, operation=fingerprint.operation).observe(rows)
+    
+    if _slow_query_seconds and duration >= _slow_query_seconds:
+        route = _query_route.get()
+        slow_query_logger.warning(
+            f"Slow query {fingerprint.id} ({duration * 1000:.1f} ms) "
+            f"on {route or 'no route'}: {fingerprint.statement}",
+            extra={
+                "query_fingerprint": fingerprint.id,
+                "operation": fingerprint.operation,
+                "duration_ms": round(duration * 1000, 2),
+                "rows": rows if rows >= 0 else None,
+                "route": route,
+                "parameters": _parameter_shape(parameters, executemany),
+            }
+        )
+
+
+def setup_database_metrics(engine: Engine, name: str = "default"):
     """
     Set up database metrics collection for the given SQLAlchemy engine.
     
+    The pool is reported by ``pool_collector`` at scrape time; the only
+    listeners are on connection creation and close and around statement
+    execution. Checkout waits are recorded by the metered pool classes in
+    ``core.pool``. Statements are recorded by fingerprint as set up by
+    ``configure_query_metrics``.
+    
     Args:
         engine: SQLAlchemy engine instance
+        name: Value of the ``pool`` label for this engine's pool
     """
     # Ensure metrics are initialized
     _initialize_metrics()
+    pool_collector.add(name, engine)
     
     @event.listens_for(engine, "connect")
     def receive_connect(dbapi_connection, connection_record):
         """Called when a connection is created"""
         if db_connections_created_total:
             db_connections_created_total.inc()
-        _update_connection_pool_metrics(engine)
     
     @event.listens_for(engine, "close")
     def receive_close(dbapi_connection, connection_record):
         """Called when a connection is closed"""
         if db_connections_closed_total:
             db_connections_closed_total.inc()
-        _update_connection_pool_metrics(engine)
-    
-    @event.listens_for(engine, "checkout")
-    def receive_checkout(dbapi_connection, connection_record, connection_proxy):
-        """Called when a connection is retrieved from the pool"""
-        _update_connection_pool_metrics(engine)
-    
-    @event.listens_for(engine, "checkin")
-    def receive_checkin(dbapi_connection, connection_record):
-        """Called when a connection is returned to the pool"""
-        _update_connection_pool_metrics(engine)
     
     @event.listens_for(engine, "before_cursor_execute")
     def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         """Called before SQL execution"""
-        _local.query_start_time = time.time()
-        
-        # Determine operation type
-        operation = _get_operation_type(statement)
-        context._query_operation = operation
+        # Kept on the execution context: it is per statement, unlike a thread or task
+        context._query_start = time.perf_counter()
     
     @event.listens_for(engine, "after_cursor_execute")
     def receive_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         """Called after SQL execution"""
-        if hasattr(_local, 'query_start_time'):
-            duration = time.time() - _local.query_start_time
-            if db_query_duration_seconds:
-                db_query_duration_seconds.observe(duration)
-            
-            # Count the query by operation type
-            operation = getattr(context, '_query_operation', 'unknown')
-            if db_query_total:
-                db_query_total.labels(operation=operation).inc()
-
-
-def _update_connection_pool_metrics(engine: Engine):
-    """Update connection pool metrics"""
-    try:
-        pool = engine.pool
+        start = getattr(context, '_query_start', None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        if db_query_duration_seconds:
+            db_query_duration_seconds.observe(duration)
         
-        # Try to get pool metrics safely using getattr
-        try:
-            # For QueuePool and similar pools
-            size_method = getattr(pool, 'size', None)
-            if size_method and callable(size_method):
-                size_value = size_method()
-                if isinstance(size_value, (int, float)) and db_connections_total:
-                    db_connections_total.set(float(size_value))
-                
-            checkedout_method = getattr(pool, 'checkedout', None)
-            if checkedout_method and callable(checkedout_method):
-                checkedout_value = checkedout_method()
-                if isinstance(checkedout_value, (int, float)) and db_connections_active:
-                    db_connections_active.set(float(checkedout_value))
-                
-            checkedin_method = getattr(pool, 'checkedin', None)
-            if checkedin_method and callable(checkedin_method):
-                checkedin_value = checkedin_method()
-                if isinstance(checkedin_value, (int, float)) and db_connections_idle:
-                    db_connections_idle.set(float(checkedin_value))
-                
-        except (AttributeError, TypeError, ValueError):
-            # Fall back to basic metrics if specific pool methods aren't available
-            pass
-            
-    except Exception as e:
-        # Silently handle any pool introspection issues
-        pass
+        _record_query(statement, parameters, executemany, duration, getattr(cursor, 'rowcount', -1))
+
+
+def record_cache_hit(cache: str) -> None:
+    """Count a hit in the named in-process cache."""
+    if cache_hits_total:
+        cache_hits_total.labels(cache=cache).inc()
+
+
+def record_cache_miss(cache: str) -> None:
+    """Count a miss in the named in-process cache."""
+    if cache_misses_total:
+        cache_misses_total.labels(cache=cache).inc()
+
+
+def record_cache_eviction(cache: str, reason: str) -> None:
+    """
+    Count an eviction from the named in-process cache.
+    
+    Args:
+        cache: Cache name
+        reason: Why the entry was removed (capacity, expired, invalidated)
+    """
+    if cache_evictions_total:
+        cache_evictions_total.labels(cache=cache, reason=reason).inc()
+
+
+def record_storage_deletes(result: str, count: int = 1) -> None:
+    """
+    Count stored objects handled by the background deletion worker.
+    
+    Args:
+        result: Outcome (deleted, retried, failed)
+        count: Number of objects
+    """
+    if storage_deletes_total and count:
+        storage_deletes_total.labels(result=result).inc(count)
+
+
+def set_storage_upload_queue(waiting: int, running: int) -> None:
+    """
+    Publish the upload executor's queue state.
+    
+    Args:
+        waiting: Uploads waiting for a worker
+        running: Uploads being stored
+    """
+    if storage_upload_queue_depth:
+        storage_upload_queue_depth.set(waiting)
+    if storage_uploads_in_progress:
+        storage_uploads_in_progress.set(running)
+
+
+def record_storage_upload(
+    backend: str,
+    result: str,
+    duration: Optional[float] = None,
+    size: Optional[int] = None
+) -> None:
+    """
+    Record a finished or refused photo upload.
+    
+    Throughput is ``rate(storage_upload_bytes_total)``.
+    
+    Args:
+        backend: Storage backend name
+        result: Outcome (stored, failed, rejected)
+        duration: Seconds spent storing the file, if it ran
+        size: Bytes stored, if known
+    """
+    if storage_uploads_total:
+        storage_uploads_total.labels(backend=backend, result=result).inc()
+    if duration is not None and storage_upload_duration_seconds:
+        storage_upload_duration_seconds.observe(duration)
+    if size and storage_upload_bytes_total:
+        storage_upload_bytes_total.labels(backend=backend).inc(size)
+
+
+def record_db_checkout(pool: str, wait: float, timed_out: bool = False) -> None:
+    """
+    Record how long a connection checkout waited.
+    
+    Args:
+        pool: Pool name
+        wait: Seconds spent waiting for a connection
+        timed_out: Whether the checkout gave up instead of getting one
+    """
+    with _checkout_stats_lock:
+        stats = _checkout_stats.get(pool, CheckoutStats())
+        _checkout_stats[pool] = CheckoutStats(
+            count=stats.count + 1,
+            total_wait=stats.total_wait + wait,
+            max_wait=max(stats.max_wait, wait),
+            timeouts=stats.timeouts + int(timed_out),
+        )
+    if db_pool_checkout_wait_seconds:
+        db_pool_checkout_wait_seconds.labels(pool=pool).observe(wait)
+    if timed_out and db_pool_checkout_timeouts_total:
+        db_pool_checkout_timeouts_total.labels(pool=pool).inc()
+
+
+def take_db_checkout_stats(pool: str) -> CheckoutStats:
+    """
+    Return and reset the checkout statistics gathered for a pool.
+    
+    Args:
+        pool: Pool name
+        
+    Returns:
+        Statistics since the previous call
+    """
+    with _checkout_stats_lock:
+        return _checkout_stats.pop(pool, CheckoutStats())
+
+
+def set_db_pool_max_overflow(pool: str, max_overflow: int) -> None:
+    """Publish a pool's current overflow limit."""
+    if db_pool_max_overflow:
+        db_pool_max_overflow.labels(pool=pool).set(max_overflow)
+
+
+def set_db_replica_lag(replica: str, lag: Optional[float]) -> None:
+    """Record a replica's measured replication lag (None if unreachable)."""
+    if db_replica_lag_seconds:
+        db_replica_lag_seconds.labels(replica=replica).set(-1 if lag is None else lag)
+
+
+def record_db_replica_fallback(reason: str) -> None:
+    """Record a read sent to the primary, e.g. for ``"recent_write"`` or ``"lag"``."""
+    if db_replica_fallbacks_total:
+        db_replica_fallbacks_total.labels(reason=reason).inc()
+
+
+def setup_statement_cache_metrics(engine: Engine, name: str) -> None:
+    """
+    Count an engine's executions by compiled SQL cache result.
+    
+    A ``miss`` compiles the statement; a steady share of misses means the
+    cache is too small or statements are built with varying structure.
+    ``no_key`` statements (e.g. plain text SQL) are compiled every time.
+    
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+        name: Value of the ``engine`` label
+    """
+    _initialize_metrics()
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Called before SQL execution"""
+        if db_statement_cache_total and context is not None:
+            result = _STATEMENT_CACHE_RESULTS.get(context.cache_hit, 'other')
+            db_statement_cache_total.labels(engine=name, result=result).inc()
+
+
+def get_statement_cache_hit_rate() -> Optional[float]:
+    """
+    Share of cacheable statement executions whose compiled SQL was cached.
+    
+    Returns:
+        Hits over hits plus misses across all engines, or None before any
+    """
+    if not db_statement_cache_total:
+        return None
+    counts = {'hit': 0.0, 'miss': 0.0}
+    for metric in db_statement_cache_total.collect():
+        for sample in metric.samples:
+            result = sample.labels.get('result')
+            if sample.name == 'db_statement_cache_total' and result in counts:
+                counts[result] += sample.value
+    total = counts['hit'] + counts['miss']
+    return counts['hit'] / total if total else None
 
 
 def _get_operation_type(statement: str) -> str:
@@ -220,7 +736,8 @@ def _get_operation_type(statement: str) -> str:
     if not statement:
         return 'unknown'
     
-    statement_lower = statement.lower().strip()
+    # Only the leading keyword matters; avoid copying the whole statement
+    statement_lower = statement.lstrip()[:6].lower()
     
     if statement_lower.startswith('select'):
         return 'select'
@@ -258,36 +775,19 @@ def get_current_db_metrics() -> dict:
             'total_queries': 0
         }
         
-        # Try to get values through collect() method which is the proper way
-        if db_connections_active:
-            try:
-                for sample in db_connections_active.collect():
-                    for metric in sample.samples:
-                        if metric.name == 'db_connections_active':
-                            result['active_connections'] = int(metric.value)
-                            break
-            except Exception:
-                pass
-                
-        if db_connections_total:
-            try:
-                for sample in db_connections_total.collect():
-                    for metric in sample.samples:
-                        if metric.name == 'db_connections_total':
-                            result['total_connections'] = int(metric.value)
-                            break
-            except Exception:
-                pass
-                
-        if db_connections_idle:
-            try:
-                for sample in db_connections_idle.collect():
-                    for metric in sample.samples:
-                        if metric.name == 'db_connections_idle':
-                            result['idle_connections'] = int(metric.value)
-                            break
-            except Exception:
-                pass
+        # Pool gauges are summed over every reported pool
+        pool_keys = {
+            'db_connections_active': 'active_connections',
+            'db_connections_total': 'total_connections',
+            'db_connections_idle': 'idle_connections',
+        }
+        try:
+            for family in pool_collector.collect():
+                key = pool_keys.get(family.name)
+                if key:
+                    result[key] = int(sum(sample.value for sample in family.samples))
+        except Exception:
+            pass
                 
         if db_connections_created_total:
             try:
@@ -319,6 +819,8 @@ def get_current_db_metrics() -> dict:
                 result['total_queries'] = int(total_queries)
             except Exception:
                 pass
+        
+        result['statement_cache_hit_rate'] = get_statement_cache_hit_rate()
                 
         return result
         
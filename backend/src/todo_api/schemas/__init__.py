@@ -5,10 +5,17 @@ This package contains all Pydantic models for request/response validation,
 serialization, and API documentation.
 """
 
-from .todo import TodoBase, TodoCreate, TodoUpdate, TodoSchema, TodoSummary, TodoListResponse
-from .photo import TodoPhotoBase, TodoPhotoCreate, TodoPhotoSchema, PhotoUploadResponse
+from .todo import (
+    TodoBase, TodoCreate, TodoUpdate, TodoSchema, TodoWithPhotosSchema, TodoSummary, TodoListResponse,
+    TodoBatchCreate, TodoBatchUpdate, TodoBatchDelete, TodoBatchRequest, TodoBatchResult, TodoBatchResponse,
+)
+from .photo import (
+    TodoPhotoBase, TodoPhotoCreate, TodoPhotoSchema, PhotoUploadResponse, PhotoVariantSchema,
+    PhotoUploadUrlRequest, PhotoUploadTicket, PhotoUploadConfirm,
+)
 from .user import UserBase, UserCreate, UserSchema, UserUpdate
 from .column_settings import ColumnSettingsBase, ColumnSettingsCreate, ColumnSettingsUpdate, ColumnSettingsSchema
+from .board import BoardSchema
 
 # Export all schemas for easy importing
 __all__ = [
@@ -17,13 +24,24 @@ __all__ = [
     "TodoCreate", 
     "TodoUpdate",
     "TodoSchema",
+    "TodoWithPhotosSchema",
     "TodoSummary",
     "TodoListResponse",
+    "TodoBatchCreate",
+    "TodoBatchUpdate",
+    "TodoBatchDelete",
+    "TodoBatchRequest",
+    "TodoBatchResult",
+    "TodoBatchResponse",
     # Photo schemas
     "TodoPhotoBase",
     "TodoPhotoCreate",
     "TodoPhotoSchema", 
     "PhotoUploadResponse",
+    "PhotoVariantSchema",
+    "PhotoUploadUrlRequest",
+    "PhotoUploadTicket",
+    "PhotoUploadConfirm",
     # User schemas
     "UserBase",
     "UserCreate",
@@ -34,4 +52,6 @@ __all__ = [
     "ColumnSettingsCreate",
     "ColumnSettingsUpdate", 
     "ColumnSettingsSchema",
+    # Board schemas
+    "BoardSchema",
 ]
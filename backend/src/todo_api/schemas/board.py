@@ -0,0 +1,24 @@
+"""
+Board-related Pydantic schemas.
+
+This module contains the Pydantic models for the board snapshot, which
+combines column settings, todos and photos into a single response.
+"""
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from .column_settings import ColumnConfig
+from .todo import TodoWithPhotosSchema
+
+
+class BoardSchema(BaseModel):
+    """Complete board snapshot for API responses."""
+    
+    column_order: List[str] = Field(..., description="Order of columns")
+    columns_config: Dict[str, ColumnConfig] = Field(..., description="Configuration for each column")
+    todos: Dict[str, List[TodoWithPhotosSchema]] = Field(
+        ...,
+        description="Todos grouped by column/status, in board order"
+    )
@@ -6,9 +6,9 @@ validation, serialization, and API documentation.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, ConfigDict
+from pydantic import BaseModel, Field, HttpUrl, ConfigDict, field_validator
 
 
 class TodoPhotoBase(BaseModel):
@@ -25,6 +25,17 @@ class TodoPhotoCreate(TodoPhotoBase):
     pass
 
 
+class PhotoVariantSchema(BaseModel):
+    """A resized or transcoded derivative of an uploaded photo."""
+    
+    label: str = Field(..., description="Bounding box size the derivative was rendered for, e.g. \"128\", or \"original\"")
+    url: str = Field(..., description="URL where the derivative can be accessed")
+    width: int = Field(..., description="Width in pixels")
+    height: int = Field(..., description="Height in pixels")
+    content_type: str = Field(..., description="MIME type of the derivative")
+    bytes: int = Field(..., description="Size of the derivative in bytes")
+
+
 class TodoPhotoSchema(TodoPhotoBase):
     """Complete photo schema for API responses."""
     
@@ -33,9 +44,19 @@ class TodoPhotoSchema(TodoPhotoBase):
     s3_key: Optional[str] = Field(None, description="S3 storage key (if using S3)")
     todo_id: int = Field(..., description="ID of the associated todo item")
     created_at: datetime = Field(..., description="When the photo was uploaded")
+    variants: List[PhotoVariantSchema] = Field(
+        default_factory=list,
+        description="Resized and WebP/AVIF derivatives, smallest first; empty until generated"
+    )
     
     # Use ConfigDict for Pydantic v2
     model_config = ConfigDict(from_attributes=True)
+    
+    @field_validator('variants', mode='before')
+    @classmethod
+    def default_variants(cls, v):
+        """Treat photos without derivatives as having none."""
+        return v or []
 
 
 class PhotoUploadResponse(BaseModel):
@@ -45,6 +66,30 @@ class PhotoUploadResponse(BaseModel):
     message: str = Field(..., description="Success message")
 
 
+class PhotoUploadUrlRequest(BaseModel):
+    """Request for a direct-to-storage upload ticket."""
+    
+    filename: str = Field(..., description="Original filename of the photo to upload")
+
+
+class PhotoUploadTicket(BaseModel):
+    """How to send a photo straight to storage and then confirm it."""
+    
+    key: str = Field(..., description="Storage key the photo will be stored under")
+    method: str = Field(..., description="POST (multipart form with ``fields`` then ``file``) or PUT (raw body)")
+    url: str = Field(..., description="Where to send the upload")
+    fields: Dict[str, str] = Field(default_factory=dict, description="Form fields to send before the file")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Headers to send with a PUT upload")
+    upload_token: str = Field(..., description="Token to pass to the confirm endpoint")
+    expires_at: datetime = Field(..., description="When the upload URL stops working")
+
+
+class PhotoUploadConfirm(BaseModel):
+    """Confirmation that a direct-to-storage upload finished."""
+    
+    upload_token: str = Field(..., description="``upload_token`` from the upload ticket")
+
+
 class PhotoUploadRequest(BaseModel):
     """Schema for photo upload request validation."""
     
@@ -6,9 +6,12 @@ serialization, and API documentation.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, ConfigDict
+from typing_extensions import Annotated
+
+from .photo import TodoPhotoSchema
 
 
 class TodoBase(BaseModel):
@@ -35,6 +38,10 @@ class TodoUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=1000)
     is_completed: Optional[bool] = None
     status: Optional[str] = Field(None, pattern="^(todo|inProgress|blocked|done)$")
+    position: Optional[float] = Field(
+        None,
+        description="Rank within the column; a midpoint between neighbours reorders in place"
+    )
 
 
 class TodoSchema(TodoBase):
@@ -44,11 +51,76 @@ class TodoSchema(TodoBase):
     user_id: int = Field(..., description="ID of the user who owns this todo")
     created_at: datetime = Field(..., description="When the todo was created")
     updated_at: Optional[datetime] = Field(None, description="When the todo was last updated")
+    position: Optional[float] = Field(None, description="Rank of the todo within its column")
     
     # Use ConfigDict for Pydantic v2
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoWithPhotosSchema(TodoSchema):
+    """Todo schema including the item's photos."""
+    
+    photos: List[TodoPhotoSchema] = Field(default_factory=list, description="Photos attached to the todo")
+
+
+# Upper bound on operations accepted by a single batch request
+MAX_BATCH_OPERATIONS = 500
+
+
+class TodoBatchCreate(TodoCreate):
+    """Batch operation creating a todo item."""
+    
+    op: Literal["create"] = Field(..., description="Operation type")
+
+
+class TodoBatchUpdate(TodoUpdate):
+    """Batch operation updating an existing todo item."""
+    
+    op: Literal["update"] = Field(..., description="Operation type")
+    id: int = Field(..., description="ID of the todo to update")
+
+
+class TodoBatchDelete(BaseModel):
+    """Batch operation deleting a todo item."""
+    
+    op: Literal["delete"] = Field(..., description="Operation type")
+    id: int = Field(..., description="ID of the todo to delete")
+
+
+TodoBatchOperation = Annotated[
+    Union[TodoBatchCreate, TodoBatchUpdate, TodoBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class TodoBatchRequest(BaseModel):
+    """Request schema for applying several todo mutations at once."""
+    
+    operations: List[TodoBatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_OPERATIONS,
+        description="Operations to apply, in order"
+    )
+
+
+class TodoBatchResult(BaseModel):
+    """Outcome of a single batch operation."""
+    
+    index: int = Field(..., description="Position of the operation in the request")
+    op: str = Field(..., description="Operation type")
+    status_code: int = Field(..., description="HTTP-equivalent status of the operation")
+    id: Optional[int] = Field(None, description="ID of the affected todo")
+    todo: Optional[TodoSchema] = Field(None, description="Resulting todo for creates and updates")
+    detail: Optional[str] = Field(None, description="Error detail for failed operations")
+
+
+class TodoBatchResponse(BaseModel):
+    """Response schema for batch todo mutations."""
+    
+    results: List[TodoBatchResult] = Field(..., description="Per-operation results, in request order")
+
+
 class TodoSummary(BaseModel):
     """Summary schema for todo statistics."""
     
@@ -0,0 +1,344 @@
+"""
+Column membership and ordering of todos.
+
+A todo's column is its ``status`` and its place in the column is its
+``position``, a fractional rank indexed together with ``(user_id, status)``.
+Moving or reordering a todo is therefore a single-row UPDATE: a todo is
+placed between two neighbours by giving it the midpoint of their positions,
+or at the end of a column with ``MAX(position) + POSITION_STEP``.
+
+``UserColumnSettings.columns_config`` keeps only column metadata (id and
+title) in a JSONB document. The ``taskIds`` lists clients see are derived
+from the todo rows on read, and settings rows are written with a single
+``INSERT ... ON CONFLICT`` so concurrent requests never overwrite each
+other's read-modify-write.
+"""
+
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from todo_api.config.database import upsert_insert
+from todo_api.models import Todo, UserColumnSettings
+from todo_api.schemas.column_settings import DefaultColumnSettings
+
+# Gap between consecutive positions when appending or renumbering
+POSITION_STEP = 1.0
+
+
+def next_position(user_id: int, status: str) -> ColumnElement:
+    """
+    SQL expression for the position after the last todo in a column.
+
+    Evaluated inside the INSERT or UPDATE that uses it, so appending a todo
+    needs no separate read.
+
+    Args:
+        user_id: Owner of the column
+        status: Column/status the todo is placed in
+
+    Returns:
+        Scalar subquery yielding the next free position
+    """
+    return (
+        select(func.coalesce(func.max(Todo.position), 0.0) + POSITION_STEP)
+        .where(Todo.user_id == user_id, Todo.status == status)
+        .scalar_subquery()
+    )
+
+
+def position_between(before: Optional[float], after: Optional[float]) -> float:
+    """
+    Rank that sorts between two neighbouring positions.
+
+    Args:
+        before: Position of the todo that should precede, if any
+        after: Position of the todo that should follow, if any
+
+    Returns:
+        New position
+    """
+    if before is None and after is None:
+        return POSITION_STEP
+    if before is None:
+        return after - POSITION_STEP
+    if after is None:
+        return before + POSITION_STEP
+    return (before + after) / 2
+
+
+def _ordered_subset(positions: Sequence[Optional[float]]) -> Set[int]:
+    """Indexes of a longest strictly increasing run of positions, skipping missing ones."""
+    tails: List[int] = []  # Index of the smallest tail of each run length
+    tail_positions: List[float] = []
+    previous: List[Optional[int]] = [None] * len(positions)
+    for index, position in enumerate(positions):
+        if position is None:
+            continue
+        length = bisect.bisect_left(tail_positions, position)
+        previous[index] = tails[length - 1] if length else None
+        if length == len(tails):
+            tails.append(index)
+            tail_positions.append(position)
+        else:
+            tails[length] = index
+            tail_positions[length] = position
+
+    kept: Set[int] = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        kept.add(index)
+        index = previous[index]
+    return kept
+
+
+def order_positions(current: Sequence[Optional[float]]) -> List[float]:
+    """
+    Positions that sort todos in a wanted order, changing as few as possible.
+
+    The longest run of todos already in order keeps its positions; every
+    other todo is placed between its new neighbours with
+    ``position_between``, so moving one card updates one row. The column
+    is renumbered only when a gap is too small to split any further.
+
+    Args:
+        current: Current positions of a column's todos, in the wanted order
+
+    Returns:
+        Position for each todo, in the same order
+    """
+    kept = _ordered_subset(current)
+    following: List[Optional[float]] = [None] * len(current)
+    upcoming = None
+    for index in range(len(current) - 1, -1, -1):
+        following[index] = upcoming
+        if index in kept:
+            upcoming = current[index]
+
+    positions: List[float] = []
+    before = None
+    for index, position in enumerate(current):
+        if index not in kept:
+            position = position_between(before, following[index])
+            if (before is not None and position <= before) or (
+                following[index] is not None and position >= following[index]
+            ):
+                return [(i + 1) * POSITION_STEP for i in range(len(current))]
+        positions.append(position)
+        before = position
+    return positions
+
+
+def task_order():
+    """ORDER BY clauses listing a user's todos in board order."""
+    return (Todo.status, Todo.position.asc().nulls_last(), Todo.id)
+
+
+async def load_task_ids(db: AsyncSession, user_id: int) -> Dict[str, List[int]]:
+    """
+    Derive every column's ordered todo IDs with one index-ordered query.
+
+    Args:
+        db: Database session
+        user_id: Owner of the todos
+
+    Returns:
+        Todo IDs keyed by status, in board order
+    """
+    result = await db.execute(
+        select(Todo.id, Todo.status).where(Todo.user_id == user_id).order_by(*task_order())
+    )
+    task_ids: Dict[str, List[int]] = {}
+    for todo_id, status in result.all():
+        task_ids.setdefault(status, []).append(todo_id)
+    return task_ids
+
+
+def with_task_ids(columns_config: Dict[str, Any], task_ids: Dict[str, List[int]]) -> Dict[str, Any]:
+    """
+    Fill each configured column's ``taskIds`` from derived membership.
+
+    Args:
+        columns_config: Parsed column configuration keyed by column ID
+        task_ids: Ordered todo IDs keyed by status
+
+    Returns:
+        New configuration with derived ``taskIds``
+    """
+    return {
+        column_id: {**column, "taskIds": task_ids.get(column_id, [])}
+        for column_id, column in columns_config.items()
+    }
+
+
+def dump_columns_config(columns_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prepare column configuration for storage, without membership.
+
+    Args:
+        columns_config: Column configuration; values may be dicts or models
+
+    Returns:
+        JSON-compatible document with empty ``taskIds`` lists
+    """
+    stored = {}
+    for column_id, column in columns_config.items():
+        column = column.model_dump() if hasattr(column, "model_dump") else dict(column)
+        column["taskIds"] = []
+        stored[column_id] = column
+    return stored
+
+
+async def upsert_column_settings(
+    db: AsyncSession,
+    user_id: int,
+    column_order: Optional[List[str]] = None,
+    columns_config: Optional[Dict[str, Any]] = None,
+    overwrite: bool = True
+) -> Optional[UserColumnSettings]:
+    """
+    Create or update a user's column settings in one statement.
+
+    Values left as ``None`` fall back to the defaults when the row is
+    created and keep their stored value when it already exists. The row is
+    never read into Python first, so concurrent writers cannot lose each
+    other's updates or race on the unique ``user_id``.
+
+    Args:
+        db: Database session
+        user_id: Owner of the settings
+        column_order: Column IDs in display order
+        columns_config: Column configuration keyed by column ID
+        overwrite: Update an existing row; when False an existing row is
+            left untouched and ``None`` is returned
+
+    Returns:
+        The stored settings row, or ``None`` if it existed and
+        ``overwrite`` is False
+    """
+    default_settings = DefaultColumnSettings.get_default()
+    values = {
+        "column_order": column_order if column_order is not None else default_settings.column_order,
+        "columns_config": dump_columns_config(
+            columns_config if columns_config is not None else default_settings.columns_config
+        ),
+    }
+
+    stmt = upsert_insert(db, UserColumnSettings).values(user_id=user_id, **values)
+    if overwrite:
+        # An empty SET would skip RETURNING, so always touch updated_at
+        changes = {"updated_at": func.now()}
+        if column_order is not None:
+            changes["column_order"] = stmt.excluded.column_order
+        if columns_config is not None:
+            changes["columns_config"] = stmt.excluded.columns_config
+        stmt = stmt.on_conflict_do_update(index_elements=[UserColumnSettings.user_id], set_=changes)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[UserColumnSettings.user_id])
+
+    result = await db.execute(
+        stmt.returning(UserColumnSettings),
+        execution_options={"populate_existing": True}
+    )
+    return result.scalar_one_or_none()
+
+
+async def apply_task_order(db: AsyncSession, user_id: int, columns_config: Dict[str, Any]) -> int:
+    """
+    Store the order of ``taskIds`` lists sent by clients as todo positions.
+
+    Supports clients that still save whole boards through the column
+    settings API. Only the user's own todos listed in the column matching
+    their status are considered, and only those out of order are moved
+    (see ``order_positions``).
+
+    Args:
+        db: Database session
+        user_id: Owner of the todos
+        columns_config: Column configuration with ``taskIds`` lists
+
+    Returns:
+        Number of todos repositioned
+    """
+    wanted: Dict[int, str] = {}
+    for column_id, column in columns_config.items():
+        ids = column.get("taskIds") if isinstance(column, dict) else getattr(column, "taskIds", None)
+        for task_id in ids or []:
+            try:
+                wanted.setdefault(int(task_id), column_id)
+            except (TypeError, ValueError):
+                continue
+
+    if not wanted:
+        return 0
+
+    result = await db.execute(
+        select(Todo.id, Todo.status, Todo.position)
+        .where(Todo.user_id == user_id, Todo.id.in_(wanted))
+    )
+    current = {todo_id: position for todo_id, status, position in result.all() if wanted[todo_id] == status}
+
+    # Dicts keep insertion order, so each column lists its todos in the order sent
+    columns: Dict[str, List[int]] = {}
+    for todo_id, column_id in wanted.items():
+        if todo_id in current:
+            columns.setdefault(column_id, []).append(todo_id)
+
+    rows = []
+    for ids in columns.values():
+        positions = order_positions([current[todo_id] for todo_id in ids])
+        rows.extend(
+            {"id": todo_id, "position": position}
+            for todo_id, position in zip(ids, positions)
+            if position != current[todo_id]
+        )
+    if rows:
+        await db.execute(update(Todo), rows)
+    return len(rows)
+
+
+def assign_positions(
+    starts: Dict[str, float],
+    statuses: Iterable[str]
+) -> List[float]:
+    """
+    Allocate consecutive end-of-column positions for several new placements.
+
+    Args:
+        starts: Current last position per status; updated in place
+        statuses: Status of each placement, in order
+
+    Returns:
+        Position for each placement
+    """
+    positions = []
+    for status in statuses:
+        starts[status] = starts.get(status, 0.0) + POSITION_STEP
+        positions.append(starts[status])
+    return positions
+
+
+async def load_last_positions(db: AsyncSession, user_id: int, statuses: Iterable[str]) -> Dict[str, float]:
+    """
+    Current last position of each given column.
+
+    Args:
+        db: Database session
+        user_id: Owner of the columns
+        statuses: Columns to look up
+
+    Returns:
+        Last position keyed by status; empty columns are omitted
+    """
+    statuses = set(statuses)
+    if not statuses:
+        return {}
+    result = await db.execute(
+        select(Todo.status, func.max(Todo.position))
+        .where(Todo.user_id == user_id, Todo.status.in_(statuses))
+        .group_by(Todo.status)
+    )
+    return {status: position for status, position in result.all() if position is not None}
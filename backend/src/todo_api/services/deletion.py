@@ -0,0 +1,194 @@
+"""
+Background deletion of stored photo files.
+
+Deleting a todo or clearing a column removes the photo rows in the request
+transaction and hands the storage keys to ``photo_deletion_worker``. A
+single background thread batches queued keys per storage backend, deletes
+them with ``StorageBackend.delete_many`` (one S3 ``DeleteObjects`` call per
+1000 keys) and retries failed keys with exponential backoff, so responses
+no longer wait on object storage round trips.
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from todo_api.config.logging import get_logger
+from todo_api.monitoring.metrics import record_storage_deletes
+from todo_api.services.storage import DELETE_BATCH_SIZE, StorageBackend, StorageError
+
+logger = get_logger("photo_deletion")
+
+# Sentinel placed on the queue to stop the worker after it drains
+_STOP = object()
+
+
+class PhotoDeletionWorker:
+    """Thread that deletes queued storage keys in batches, with retries."""
+
+    def __init__(
+        self,
+        batch_size: int = DELETE_BATCH_SIZE,
+        linger_seconds: float = 0.05,
+        max_attempts: int = 5,
+        retry_backoff_seconds: float = 0.5
+    ):
+        self.batch_size = batch_size
+        self.linger_seconds = linger_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of keys waiting to be deleted."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="photo-deletion", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Stop the worker after it has processed every queued key.
+
+        Blocking; call it from a worker thread in async code.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"Photo deletion worker did not drain within {timeout}s; {self.pending} keys pending")
+
+    def enqueue(self, storage: StorageBackend, keys: Iterable[str]) -> int:
+        """
+        Queue stored files for deletion and return immediately.
+
+        Args:
+            storage: Backend holding the files
+            keys: Storage keys to delete; empty keys are skipped
+
+        Returns:
+            Number of keys queued
+        """
+        count = 0
+        for key in keys:
+            if key:
+                self._queue.put((storage, key))
+                count += 1
+        if count:
+            self.start()
+        return count
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, delete it, repeat until stopped."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batches: Dict[int, Tuple[StorageBackend, List[str]]] = {}
+            self._add(batches, item)
+            collected = 1
+
+            # Linger briefly so bursts of deletes share a request
+            deadline = time.monotonic() + self.linger_seconds
+            while collected < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                self._add(batches, item)
+                collected += 1
+
+            for storage, keys in batches.values():
+                self._delete_with_retries(storage, keys)
+
+        # Drain anything queued behind the stop sentinel
+        leftovers: Dict[int, Tuple[StorageBackend, List[str]]] = {}
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self._add(leftovers, item)
+        for storage, keys in leftovers.values():
+            self._delete_with_retries(storage, keys)
+
+    @staticmethod
+    def _add(batches: Dict[int, Tuple[StorageBackend, List[str]]], item: object) -> None:
+        """Group a queued (storage, key) pair by backend."""
+        storage, key = item  # type: ignore[misc]
+        batches.setdefault(id(storage), (storage, []))[1].append(key)
+
+    def _delete_with_retries(self, storage: StorageBackend, keys: List[str]) -> None:
+        """Delete keys, retrying only the ones that failed, with exponential backoff."""
+        for start in range(0, len(keys), self.batch_size):
+            remaining = keys[start:start + self.batch_size]
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    storage.delete_many(remaining)
+                except StorageError as e:
+                    failed = e.failed_keys or remaining
+                    record_storage_deletes("deleted", len(remaining) - len(failed))
+                    if attempt == self.max_attempts:
+                        record_storage_deletes("failed", len(failed))
+                        logger.error(
+                            f"Giving up deleting {len(failed)} stored photos after {attempt} attempts: {e}",
+                            extra={"storage": storage.name, "failed_keys": failed[:20]}
+                        )
+                        break
+                    record_storage_deletes("retried", len(failed))
+                    remaining = failed
+                    time.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+                except Exception as e:
+                    # Never let one bad batch kill the worker thread
+                    record_storage_deletes("failed", len(remaining))
+                    logger.error(f"Unexpected error deleting stored photos: {e}", exc_info=True)
+                    break
+                else:
+                    record_storage_deletes("deleted", len(remaining))
+                    break
+
+
+# Shared worker used by the todo endpoints; started on first use or at startup
+photo_deletion_worker = PhotoDeletionWorker()
+
+
+def schedule_photo_deletion(storage: StorageBackend, keys: Iterable[str]) -> int:
+    """
+    Queue stored photo files for background deletion.
+
+    Call this only after the photo rows have been committed as deleted.
+
+    Args:
+        storage: Backend holding the files
+        keys: Storage keys of the deleted photos
+
+    Returns:
+        Number of keys queued
+    """
+    return photo_deletion_worker.enqueue(storage, keys)
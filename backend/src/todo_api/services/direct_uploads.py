@@ -0,0 +1,115 @@
+"""
+Direct-to-storage photo uploads.
+
+Instead of streaming a photo through an API worker, a client asks for an
+upload ticket, sends the file straight to the storage backend and then
+confirms it:
+
+1. ``issue_upload`` picks the storage key and returns the request to send:
+   a presigned S3 POST whose policy pins the key, content type and size,
+   or, for backends without presigning, a PUT to the API's signed upload
+   route.
+2. The client sends the file.
+3. The confirm endpoint checks the ticket's ``upload_token``, verifies the
+   object exists and creates the ``TodoPhoto`` row.
+
+Tickets are JWTs signed with ``SECRET_KEY``. They carry a ``typ`` claim
+and no ``sub``/``uid`` claims, so they can never authenticate a user and
+access tokens can never pass as tickets.
+"""
+
+import mimetypes
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from jose import JWTError, jwt
+
+from todo_api.config.settings import settings
+from todo_api.services.storage import StorageBackend
+
+# Proves a storage key was issued to a user for one of their todos
+UPLOAD_TICKET = "photo_upload"
+# Authorizes one PUT to the signed local upload route
+LOCAL_UPLOAD = "photo_local_upload"
+
+
+class InvalidUploadTokenError(ValueError):
+    """Raised when an upload token is malformed, expired or of the wrong type."""
+
+
+def _encode(claims: Dict[str, Any], token_type: str, expires_at: datetime) -> str:
+    """Sign upload claims as a JWT."""
+    payload = {**claims, "typ": token_type, "exp": expires_at}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def read_upload_token(token: str, token_type: str) -> Dict[str, Any]:
+    """
+    Verify an upload token and return its claims.
+
+    Args:
+        token: Token from an upload ticket or signed upload URL
+        token_type: Expected ``typ`` claim
+
+    Returns:
+        Decoded claims
+
+    Raises:
+        InvalidUploadTokenError: If the token is invalid, expired or not a
+            ``token_type`` token
+    """
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise InvalidUploadTokenError(str(e)) from e
+    if claims.get("typ") != token_type:
+        raise InvalidUploadTokenError("Wrong token type")
+    return claims
+
+
+def issue_upload(storage: StorageBackend, user_id: int, todo_id: int, filename: str) -> Dict[str, Any]:
+    """
+    Reserve a storage key for a photo and describe how to upload it.
+
+    Args:
+        storage: Photo storage backend
+        user_id: Owner of the todo
+        todo_id: Todo the photo will be attached to
+        filename: Original file name; its extension must already be validated
+
+    Returns:
+        Data matching ``PhotoUploadTicket``
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    key = storage.make_key(user_id, f"{uuid.uuid4()}{extension}")
+    content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+    expires_in = settings.DIRECT_UPLOAD_EXPIRY_SECONDS
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=expires_in)
+
+    upload = storage.presign_upload(key, content_type, settings.MAX_UPLOAD_SIZE, expires_in)
+    if upload is None:
+        put_token = _encode(
+            {"key": key, "ct": content_type, "max": settings.MAX_UPLOAD_SIZE}, LOCAL_UPLOAD, expires_at
+        )
+        upload = {
+            "method": "PUT",
+            "url": f"{settings.API_V1_STR}/photos/uploads/{key}?token={put_token}",
+            "fields": {},
+        }
+
+    # Confirming may take place a while after an upload sent just before the deadline
+    upload_token = _encode(
+        {"key": key, "user": user_id, "todo": todo_id, "filename": filename},
+        UPLOAD_TICKET,
+        expires_at + timedelta(seconds=expires_in),
+    )
+    return {
+        **upload,
+        "key": key,
+        "headers": {"Content-Type": content_type},
+        "upload_token": upload_token,
+        "expires_at": expires_at,
+    }
@@ -0,0 +1,63 @@
+"""
+Shared outbound HTTP client.
+
+Calls to external services (Google OAuth) go through one ``httpx.AsyncClient``
+owned by the application lifespan. Its connection pool keeps TCP and TLS
+connections alive between requests, so a login does not pay a new handshake
+to every upstream host.
+"""
+
+from typing import Optional
+
+import httpx
+
+from todo_api.config.logging import get_logger
+from todo_api.config.settings import settings
+
+logger = get_logger("http_client")
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build an async HTTP client with pooled keep-alive connections."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client.
+
+    The lifespan opens the client at startup; if it has not run (e.g. a test
+    client used without its context manager), the client is created on
+    first use and closed by :func:`close_http_client`.
+
+    Returns:
+        Shared async HTTP client
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client at application startup."""
+    client = get_http_client()
+    logger.info("Shared HTTP client ready")
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
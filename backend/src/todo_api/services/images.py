@@ -0,0 +1,163 @@
+"""
+Image processing used to build photo derivatives.
+
+These functions are CPU-bound and run in worker processes, so this module
+deliberately imports nothing from the application: a spawned worker only
+needs Pillow and the standard library. Pillow is optional; without it
+``IMAGING_AVAILABLE`` is False and no derivatives are produced.
+"""
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow not installed
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+    features = None  # type: ignore[assignment]
+
+IMAGING_AVAILABLE = Image is not None
+
+# Label of derivatives rendered at the original's full size
+ORIGINAL_LABEL = "original"
+
+# Pillow format name, content type and extension of each output format
+OUTPUT_FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+    "png": ("PNG", "image/png", ".png"),
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "avif": ("AVIF", "image/avif", ".avif"),
+}
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    """One encoded derivative of an uploaded image."""
+
+    label: str
+    data: bytes
+    width: int
+    height: int
+    content_type: str
+    extension: str
+
+
+@dataclass
+class RenderedPhoto:
+    """Everything rendered from one upload."""
+
+    # Re-encoded original without metadata; None when the upload is kept as is
+    original: Optional[RenderedImage] = None
+    variants: List[RenderedImage] = field(default_factory=list)
+
+
+def supported_formats(formats: Sequence[str]) -> List[str]:
+    """
+    Filter modern output formats down to those this Pillow build can encode.
+
+    Args:
+        formats: Requested format names, e.g. ``["webp", "avif"]``
+
+    Returns:
+        Supported names in the given order
+    """
+    if not IMAGING_AVAILABLE:
+        return []
+    return [
+        name for name in formats
+        if name in OUTPUT_FORMATS and (name in ("jpeg", "png") or features.check(name))
+    ]
+
+
+def _encode(image, label: str, name: str, quality: int) -> RenderedImage:
+    """Encode an image in one output format without metadata."""
+    format, content_type, extension = OUTPUT_FORMATS[name]
+    options = {"icc_profile": image.info["icc_profile"]} if "icc_profile" in image.info else {}
+    if name == "jpeg":
+        options.update(quality=quality, optimize=True, progressive=True)
+    elif name == "png":
+        options.update(optimize=True)
+    else:
+        options.update(quality=quality)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return RenderedImage(
+        label=label,
+        data=buffer.getvalue(),
+        width=image.width,
+        height=image.height,
+        content_type=content_type,
+        extension=extension,
+    )
+
+
+def _transcodes(image, fallback: RenderedImage, formats: Sequence[str], quality: int) -> List[RenderedImage]:
+    """Encode an image in each modern format, keeping only files smaller than ``fallback``."""
+    encoded = (_encode(image, fallback.label, name, quality) for name in formats)
+    return [rendered for rendered in encoded if len(rendered.data) < len(fallback.data)]
+
+
+def render_photo(
+    data: bytes,
+    sizes: Sequence[int],
+    quality: int,
+    formats: Sequence[str] = (),
+    original_quality: Optional[int] = None
+) -> RenderedPhoto:
+    """
+    Re-encode an upload and render its derivatives.
+
+    The image is rotated according to its EXIF orientation and every
+    output is written without EXIF or other metadata (the ICC colour
+    profile is kept): JPEG for opaque images, PNG when it has transparency,
+    plus each of ``formats`` (e.g. WebP, AVIF) at every size where that
+    encoding comes out smaller. Sizes at least as large as the original are
+    skipped, since the original is already that small. Animated images keep
+    their original file and only get still derivatives of the first frame.
+
+    Args:
+        data: Encoded source image
+        sizes: Bounding box edge lengths in pixels
+        quality: Quality of resized derivatives (1-95)
+        formats: Additional output formats, as returned by ``supported_formats``
+        original_quality: Quality the full-size original is re-encoded at;
+            None keeps the upload unchanged and skips full-size transcodes
+
+    Returns:
+        Re-encoded original and derivatives, smallest size first with
+        full-size transcodes last
+
+    Raises:
+        RuntimeError: If Pillow is not installed
+        OSError: If the data is not a readable image
+    """
+    if not IMAGING_AVAILABLE:
+        raise RuntimeError("Pillow is required to render photos")
+
+    with Image.open(io.BytesIO(data)) as source:
+        animated = getattr(source, "is_animated", False)
+        source.seek(0)  # First frame of animations
+        icc_profile = source.info.get("icc_profile")
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {"icc_profile": icc_profile} if icc_profile else {}
+    base = "png" if has_alpha else "jpeg"
+
+    photo = RenderedPhoto()
+    for size in sorted(set(sizes)):
+        if size >= max(image.size):
+            continue
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        fallback = _encode(resized, str(size), base, quality)
+        photo.variants.append(fallback)
+        photo.variants.extend(_transcodes(resized, fallback, formats, quality))
+
+    if original_quality is not None and not animated:
+        photo.original = _encode(image, ORIGINAL_LABEL, base, original_quality)
+        photo.variants.extend(_transcodes(image, photo.original, formats, original_quality))
+    return photo
@@ -0,0 +1,236 @@
+"""
+Background generation of photo derivatives.
+
+After an upload is committed, ``photo_variant_pipeline.generate`` runs as a
+response background task: it reads the original from storage, renders the
+configured sizes and formats in a process pool (Pillow work is CPU-bound
+and would otherwise hold the GIL against request handling), stores each
+derivative next to the original and records them in ``TodoPhoto.variants``.
+By default a full-size re-encode without EXIF metadata is stored as one
+more derivative and becomes the photo's ``url``, so location and camera
+data in the upload are no longer handed out. The upload itself is never
+rewritten, moved or deleted: its key and the URL already returned to the
+client keep working.
+
+``select_variant`` picks the smallest stored derivative a client accepts,
+so cards can load a few-KB WebP/AVIF thumbnail instead of the
+full-resolution upload.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+
+from todo_api.config.database import AsyncSessionLocal
+from todo_api.config.logging import get_logger, log_error
+from todo_api.config.settings import settings
+from todo_api.core.etag import bump_data_version
+from todo_api.core.negotiation import explicitly_accepts, parse_accept
+from todo_api.models import TodoPhoto
+from todo_api.services.deletion import schedule_photo_deletion
+from todo_api.services.images import (
+    IMAGING_AVAILABLE,
+    ORIGINAL_LABEL,
+    RenderedImage,
+    RenderedPhoto,
+    render_photo,
+    supported_formats,
+)
+from todo_api.services.storage import StorageBackend
+
+logger = get_logger("photo_variants")
+
+# Content types every client can display, served even if not listed in Accept
+FALLBACK_TYPES = ("image/jpeg", "image/png")
+
+
+def variant_key(key: str, rendered: RenderedImage) -> str:
+    """Storage key of a derivative, placed next to the original."""
+    stem, _ = os.path.splitext(key)
+    return f"{stem}_{rendered.label}{rendered.extension}"
+
+
+class PhotoVariantPipeline:
+    """Renders photo derivatives in a process pool and records them."""
+
+    def __init__(
+        self,
+        sizes: Sequence[int],
+        quality: int,
+        max_workers: int,
+        formats: Sequence[str] = (),
+        original_quality: Optional[int] = None,
+        enabled: bool = True,
+        session_factory: Callable[[], Any] = AsyncSessionLocal
+    ):
+        self.sizes = list(sizes)
+        self.quality = quality
+        self.formats = supported_formats(formats)
+        self.original_quality = original_quality
+        self.max_workers = max_workers
+        self.enabled = enabled and IMAGING_AVAILABLE and bool(self.sizes)
+        self.session_factory = session_factory
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker processes if derivatives are enabled."""
+        if not self.enabled:
+            if not IMAGING_AVAILABLE:
+                logger.info("Pillow is not installed; photo derivatives are disabled")
+            return
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers do not inherit the server's threads and locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+
+    def stop(self) -> None:
+        """Stop the worker processes, dropping derivatives not yet started."""
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def render(self, data: bytes) -> RenderedPhoto:
+        """Render the configured sizes and formats of an encoded image in a worker process."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, render_photo, data, self.sizes, self.quality, self.formats, self.original_quality
+        )
+
+    async def generate(self, storage: StorageBackend, photo_id: int, key: str, user_id: int) -> None:
+        """
+        Build, store and record the derivatives of one uploaded photo.
+
+        Runs after the response is sent; failures are logged and leave the
+        photo without derivatives, so clients keep using the original.
+        A re-encoded original is recorded as a full-size derivative and,
+        unless the stored URL is the negotiating delivery route of a
+        presigning backend, replaces the photo's ``url``. ``s3_key`` is
+        left unchanged.
+
+        Args:
+            storage: Backend holding the original
+            photo_id: ID of the photo row
+            key: Storage key of the original
+            user_id: Owner of the photo, whose data version is bumped
+        """
+        if not self.enabled:
+            return
+
+        stored_keys: List[str] = []
+        try:
+            data = await run_in_threadpool(storage.read, key)
+            rendered = await self.render(data)
+            images = [rendered.original] if rendered.original is not None else []
+            images.extend(rendered.variants)
+            if not images:
+                return
+
+            values: Dict[str, Any] = {}
+            variants: List[Dict[str, Any]] = []
+            for image in images:
+                image_key = variant_key(key, image)
+                url = await self._store(storage, image_key, image)
+                stored_keys.append(image_key)
+                variants.append({
+                    "label": image.label,
+                    "url": url,
+                    "key": image_key,
+                    "width": image.width,
+                    "height": image.height,
+                    "content_type": image.content_type,
+                    "bytes": len(image.data),
+                })
+                if image is rendered.original and not storage.delivery_url_ttl:
+                    values["url"] = url
+
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    update(TodoPhoto)
+                    .where(TodoPhoto.id == photo_id, TodoPhoto.s3_key == key)
+                    .values(variants=variants, **values)
+                    .returning(TodoPhoto.id)
+                )
+                if result.scalar_one_or_none() is None:
+                    # The photo was deleted while its derivatives were rendering
+                    await db.rollback()
+                    schedule_photo_deletion(storage, stored_keys)
+                    return
+                await bump_data_version(db, user_id)
+                await db.commit()
+
+            logger.info(f"Stored {len(stored_keys)} derivatives for photo {photo_id}")
+        except OSError as e:
+            # Pillow could not decode the upload; keep serving the original
+            logger.warning(f"Could not render derivatives for photo {photo_id}: {e}")
+            schedule_photo_deletion(storage, stored_keys)
+        except Exception as e:
+            log_error(logger, e, "photo_variants")
+            schedule_photo_deletion(storage, stored_keys)
+
+    @staticmethod
+    async def _store(storage: StorageBackend, key: str, image: RenderedImage) -> str:
+        """Save one rendered image and return its URL."""
+        return await run_in_threadpool(storage.save, key, io.BytesIO(image.data), image.content_type)
+
+
+def select_variant(
+    variants: Optional[List[Dict[str, Any]]],
+    accept: Optional[str],
+    size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Choose the stored derivative to serve for a request.
+
+    Derivatives of the smallest rendered size at least ``size`` pixels
+    (full size when ``size`` is omitted or larger than every rendition) are
+    considered, and the smallest file whose content type ``accept`` allows
+    wins. WebP and AVIF are only served to clients that list them
+    explicitly; JPEG and PNG renditions are always acceptable. Full-size
+    requests get the metadata-free re-encode, so the upload itself is only
+    served until derivatives exist or when re-encoding is disabled.
+
+    Args:
+        variants: Stored ``TodoPhoto.variants`` value
+        accept: Request ``Accept`` header
+        size: Bounding box edge length the client displays the photo at
+
+    Returns:
+        Chosen derivative, or None when the original should be served
+    """
+    variants = variants or []
+    labels = sorted({int(v["label"]) for v in variants if v["label"].isdigit()})
+    fitting = [label for label in labels if size is not None and label >= size]
+    label = str(fitting[0]) if fitting else ORIGINAL_LABEL
+
+    accepted = parse_accept(accept)
+    candidates = [
+        variant for variant in variants
+        if variant["label"] == label
+        and (variant["content_type"] in FALLBACK_TYPES or explicitly_accepts(accepted, variant["content_type"]))
+    ]
+    return min(candidates, key=lambda variant: variant["bytes"], default=None)
+
+
+# Shared pipeline used by the photo upload endpoint; started at startup or on first use
+photo_variant_pipeline = PhotoVariantPipeline(
+    sizes=settings.PHOTO_VARIANT_SIZES,
+    quality=settings.PHOTO_VARIANT_QUALITY,
+    max_workers=settings.PHOTO_VARIANT_WORKERS,
+    formats=settings.PHOTO_VARIANT_FORMATS,
+    original_quality=settings.PHOTO_ORIGINAL_QUALITY if settings.PHOTO_REENCODE_ORIGINALS else None,
+    enabled=settings.PHOTO_VARIANTS_ENABLED,
+)
@@ -0,0 +1,115 @@
+"""
+Hot lookup queries as prebuilt statements with bound parameters.
+
+SQLAlchemy caches the compiled SQL of a statement under a cache key
+derived from its structure, but a ``select()`` written inline is rebuilt
+on every call and its cache key is recomputed by walking the whole
+expression before the cache can be consulted. The statements here are
+built once at import with ``bindparam()`` placeholders; statements are
+immutable and memoize their cache key, so executing one only binds the
+parameter values and looks up the compiled form.
+
+Only fixed-shape lookups run on most requests belong here; queries whose
+shape depends on filters or pagination stay with their endpoints. See
+``benchmarks/bench_query_construction.py`` for the per-request saving.
+"""
+
+from typing import Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_api.core.serialization import TODO_COLUMNS
+from todo_api.models import Todo, TodoPhoto, User, UserColumnSettings
+
+_owned_todo = (Todo.id == bindparam("todo_id"), Todo.user_id == bindparam("user_id"))
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+DATA_VERSION = select(User.data_version).where(User.id == bindparam("user_id"))
+INCREMENT_DATA_VERSION = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(data_version=User.data_version + 1)
+    .returning(User.data_version)
+    .execution_options(synchronize_session=False)
+)
+TODO_BY_OWNER = select(Todo).where(*_owned_todo)
+TODO_ROW_BY_OWNER = select(*TODO_COLUMNS).where(*_owned_todo)
+TODO_ID_BY_OWNER = select(Todo.id).where(*_owned_todo)
+PHOTO_BY_OWNER = select(TodoPhoto).join(Todo).where(
+    TodoPhoto.id == bindparam("photo_id"), Todo.user_id == bindparam("user_id")
+)
+PHOTO_DELIVERY = select(TodoPhoto.url, TodoPhoto.variants).where(TodoPhoto.s3_key == bindparam("key"))
+COLUMN_SETTINGS_BY_USER = select(UserColumnSettings).where(UserColumnSettings.user_id == bindparam("user_id"))
+
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Load a user by primary key."""
+    result = await db.execute(USER_BY_ID, {"user_id": user_id})
+    return result.scalar_one_or_none()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Load a user by email address."""
+    result = await db.execute(USER_BY_EMAIL, {"email": email})
+    return result.scalar_one_or_none()
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """Read a user's stored data version."""
+    result = await db.execute(DATA_VERSION, {"user_id": user_id})
+    return result.scalar_one()
+
+
+async def increment_data_version(db: AsyncSession, user_id: int) -> int:
+    """Increment a user's data version in SQL, as part of the current transaction, and return it."""
+    result = await db.execute(INCREMENT_DATA_VERSION, {"user_id": user_id})
+    return result.scalar_one()
+
+
+async def get_todo(db: AsyncSession, todo_id: int, user_id: int) -> Optional[Todo]:
+    """
+    Load a todo if it belongs to the user.
+
+    Args:
+        db: Database session
+        todo_id: ID of the todo item
+        user_id: ID of the user
+
+    Returns:
+        The todo, or None if it does not exist or belongs to someone else
+    """
+    result = await db.execute(TODO_BY_OWNER, {"todo_id": todo_id, "user_id": user_id})
+    return result.scalar_one_or_none()
+
+
+async def get_todo_row(db: AsyncSession, todo_id: int, user_id: int) -> Optional[Row]:
+    """Select a user's todo as a row tuple in ``TODO_COLUMNS`` order."""
+    result = await db.execute(TODO_ROW_BY_OWNER, {"todo_id": todo_id, "user_id": user_id})
+    return result.first()
+
+
+async def todo_exists(db: AsyncSession, todo_id: int, user_id: int) -> bool:
+    """Check that a todo exists and belongs to the user."""
+    result = await db.execute(TODO_ID_BY_OWNER, {"todo_id": todo_id, "user_id": user_id})
+    return result.scalar_one_or_none() is not None
+
+
+async def get_user_photo(db: AsyncSession, photo_id: int, user_id: int) -> Optional[TodoPhoto]:
+    """Load a photo if it is attached to one of the user's todos."""
+    result = await db.execute(PHOTO_BY_OWNER, {"photo_id": photo_id, "user_id": user_id})
+    return result.scalar_one_or_none()
+
+
+async def get_photo_delivery(db: AsyncSession, key: str) -> Optional[Row]:
+    """Select the ``(url, variants)`` of the photo stored under a key."""
+    result = await db.execute(PHOTO_DELIVERY, {"key": key})
+    return result.one_or_none()
+
+
+async def get_column_settings(db: AsyncSession, user_id: int) -> Optional[UserColumnSettings]:
+    """Load a user's column settings, if they have been created."""
+    result = await db.execute(COLUMN_SETTINGS_BY_USER, {"user_id": user_id})
+    return result.scalar_one_or_none()
@@ -0,0 +1,457 @@
+"""
+Photo storage backends.
+
+Photos are stored through a ``StorageBackend`` chosen once per process by
+``get_storage_backend()``. Backends are long-lived: the S3 backend owns a
+single boto3 client whose HTTP connection pool is shared by every request,
+so credential resolution, endpoint setup and TLS handshakes are not
+repeated per call. All backend methods block and should be run in a
+worker thread from async code.
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from todo_api.config.logging import get_logger
+from todo_api.config.settings import settings
+from todo_api.core.uploads import save_upload
+
+logger = get_logger("storage")
+
+
+# Maximum number of keys S3 accepts in one DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+class StorageError(Exception):
+    """
+    Raised when a storage backend operation fails.
+
+    ``failed_keys`` lists the keys a bulk delete could not remove, so a
+    retry can skip the ones that succeeded.
+    """
+
+    def __init__(self, message: str, failed_keys: Optional[List[str]] = None):
+        super().__init__(message)
+        self.failed_keys = failed_keys or []
+
+
+class StorageBackend(ABC):
+    """Interface for storing and deleting uploaded photos."""
+
+    name: str = "base"
+
+    # Lifetime in seconds of URLs from ``delivery_url``; None if they never expire
+    delivery_url_ttl: Optional[int] = None
+
+    @abstractmethod
+    def make_key(self, user_id: int, filename: str) -> str:
+        """Build the storage key for a user's uploaded file."""
+
+    @abstractmethod
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> str:
+        """
+        Store a file under ``key``.
+
+        Args:
+            key: Storage key from :meth:`make_key`
+            source: Readable binary file object
+            content_type: MIME type of the file, if known
+
+        Returns:
+            URL the stored file can be fetched from
+
+        Raises:
+            StorageError: If the file could not be stored
+        """
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL stored for the file under ``key``, as returned by :meth:`save`."""
+
+    @abstractmethod
+    def object_size(self, key: str) -> Optional[int]:
+        """
+        Size in bytes of a stored file, or None if there is none under ``key``.
+
+        Raises:
+            StorageError: If the store could not be queried
+        """
+
+    def presign_upload(self, key: str, content_type: str, max_bytes: int, expires_in: int) -> Optional[Dict[str, Any]]:
+        """
+        Let a client upload a file straight to the store.
+
+        Args:
+            key: Storage key the file must be stored under
+            content_type: MIME type the file must be sent with
+            max_bytes: Largest accepted file size
+            expires_in: Seconds the upload stays possible
+
+        Returns:
+            ``method``, ``url`` and form ``fields`` of the request to send,
+            or None if the backend cannot accept direct uploads
+        """
+        return None
+
+    @abstractmethod
+    def read(self, key: str) -> bytes:
+        """
+        Return the contents of a stored file.
+
+        Raises:
+            StorageError: If the file is missing or cannot be read
+        """
+
+    def delivery_url(self, key: str, url: str) -> str:
+        """
+        URL clients should fetch a stored file from.
+
+        Args:
+            key: Storage key of the file
+            url: URL returned by :meth:`save` when the file was stored
+
+        Returns:
+            The stored URL, unless the backend hands out temporary URLs
+        """
+        return url
+
+    def owns_key(self, key: str) -> bool:
+        """Whether ``key`` is in the part of the store this application writes photos to."""
+        return True
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Delete a stored file. Missing keys are ignored.
+
+        Raises:
+            StorageError: If the file could not be deleted
+        """
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Delete several stored files. Missing keys are ignored.
+
+        Raises:
+            StorageError: If any file could not be deleted; ``failed_keys``
+                lists the ones that remain
+        """
+        failed = []
+        for key in keys:
+            try:
+                self.delete(key)
+            except StorageError:
+                failed.append(key)
+        if failed:
+            raise StorageError(f"Failed to delete {len(failed)} objects", failed_keys=failed)
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores photos as flat files in a local directory served at ``url_prefix``."""
+
+    name = "local"
+
+    def __init__(self, directory: str, url_prefix: str, max_bytes: int, chunk_size: int):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, user_id: int, filename: str) -> str:
+        # Flat keys keep existing /uploads/<name> URLs valid
+        return filename
+
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> str:
+        try:
+            save_upload(source, self.directory, key, self.max_bytes, self.chunk_size)
+        except OSError as e:
+            raise StorageError(f"Failed to store {key}: {e}") from e
+        return self.url(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+    def object_size(self, key: str) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(self.directory, os.path.basename(key))).st_size
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise StorageError(f"Failed to inspect {key}: {e}") from e
+
+    def read(self, key: str) -> bytes:
+        try:
+            with open(os.path.join(self.directory, os.path.basename(key)), "rb") as stored:
+                return stored.read()
+        except OSError as e:
+            raise StorageError(f"Failed to read {key}: {e}") from e
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(os.path.join(self.directory, os.path.basename(key)))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            raise StorageError(f"Failed to delete {key}: {e}") from e
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Stores photos in an S3 bucket or an S3-compatible service.
+
+    The boto3 client is created once and is safe to share between threads;
+    ``max_pool_connections`` sizes its urllib3 connection pool and should be
+    at least the number of threads issuing storage calls concurrently.
+    Files of ``multipart_threshold`` bytes or more are uploaded as multipart
+    uploads with up to ``multipart_concurrency`` parts in flight, so each
+    upload needs that many connections.
+
+    With ``presign_expiry`` set the bucket can stay private: stored URLs
+    point at ``url_prefix`` (the API's photo route) and ``delivery_url``
+    returns a presigned GET URL valid for that many seconds, so clients
+    download straight from S3 without the bytes passing through the API.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        max_pool_connections: int = 50,
+        max_attempts: int = 3,
+        key_prefix: str = "todo-photos",
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        multipart_concurrency: int = 4,
+        presign_expiry: Optional[int] = None,
+        url_prefix: Optional[str] = None
+    ):
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url.rstrip("/") if endpoint_url else None
+        self.key_prefix = key_prefix
+        self.delivery_url_ttl = presign_expiry
+        self.url_prefix = url_prefix.rstrip("/") if url_prefix else None
+        self.client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                retries={"max_attempts": max_attempts, "mode": "standard"},
+                tcp_keepalive=True,
+                # Presigned URLs must use SigV4, which every region accepts
+                signature_version="s3v4",
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=multipart_concurrency,
+            use_threads=multipart_concurrency > 1,
+        )
+
+    def make_key(self, user_id: int, filename: str) -> str:
+        return f"{self.key_prefix}/{user_id}/{filename}"
+
+    def url(self, key: str) -> str:
+        """URL stored for an object: under ``url_prefix`` if set, else its public bucket URL."""
+        if self.url_prefix:
+            return f"{self.url_prefix}/{key}"
+        if self.endpoint_url:
+            return f"{self.endpoint_url}/{self.bucket}/{key}"
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> str:
+        extra_args = {"ContentType": content_type} if content_type else None
+        try:
+            self.client.upload_fileobj(
+                source, self.bucket, key, ExtraArgs=extra_args, Config=self.transfer_config
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to upload {key}: {e}") from e
+        return self.url(key)
+
+    def object_size(self, key: str) -> Optional[int]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise StorageError(f"Failed to inspect {key}: {e}") from e
+        except BotoCoreError as e:
+            raise StorageError(f"Failed to inspect {key}: {e}") from e
+
+    def presign_upload(self, key: str, content_type: str, max_bytes: int, expires_in: int) -> Optional[Dict[str, Any]]:
+        """Presigned POST whose policy pins the key, content type and size range."""
+        post = self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]],
+            ExpiresIn=expires_in,
+        )
+        return {"method": "POST", "url": post["url"], "fields": post["fields"]}
+
+    def read(self, key: str) -> bytes:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        except (BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to read {key}: {e}") from e
+
+    def delivery_url(self, key: str, url: str) -> str:
+        if not self.delivery_url_ttl:
+            return url
+        # Signing is local; no request is made to S3
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.delivery_url_ttl,
+        )
+
+    def owns_key(self, key: str) -> bool:
+        return key.startswith(f"{self.key_prefix}/")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except (BotoCoreError, ClientError) as e:
+            raise StorageError(f"Failed to delete {key}: {e}") from e
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete objects with one ``DeleteObjects`` request per 1000 keys."""
+        keys = list(keys)
+        failed: List[str] = []
+        last_error: Optional[Exception] = None
+
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                failed.extend(batch)
+                last_error = e
+                continue
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+
+        if failed:
+            detail = f": {last_error}" if last_error else ""
+            raise StorageError(f"Failed to delete {len(failed)} objects{detail}", failed_keys=failed)
+
+
+class InMemoryStorageBackend(StorageBackend):
+    """Keeps photos in process memory; intended for tests and local development."""
+
+    name = "memory"
+
+    def __init__(self, url_prefix: str = "memory://"):
+        self.url_prefix = url_prefix
+        self.objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, user_id: int, filename: str) -> str:
+        return f"{user_id}/{filename}"
+
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> str:
+        data = source.read()
+        with self._lock:
+            self.objects[key] = data
+        return self.url(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}{key}"
+
+    def object_size(self, key: str) -> Optional[int]:
+        with self._lock:
+            data = self.objects.get(key)
+        return None if data is None else len(data)
+
+    def read(self, key: str) -> bytes:
+        with self._lock:
+            try:
+                return self.objects[key]
+            except KeyError:
+                raise StorageError(f"Failed to read {key}: not found") from None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.objects.pop(key, None)
+
+    def keys(self) -> List[str]:
+        """Return the stored keys."""
+        with self._lock:
+            return list(self.objects)
+
+
+def create_storage_backend(backend: Optional[str] = None) -> StorageBackend:
+    """
+    Build a storage backend from settings.
+
+    Args:
+        backend: ``"local"``, ``"s3"``, ``"memory"`` or ``"auto"``; defaults to
+            ``settings.STORAGE_BACKEND``. ``"auto"`` selects S3 when AWS
+            credentials or an S3 endpoint are configured, otherwise local disk.
+
+    Returns:
+        Configured storage backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    if backend == "auto":
+        has_credentials = settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY
+        backend = "s3" if has_credentials or settings.AWS_S3_ENDPOINT_URL else "local"
+
+    if backend == "s3":
+        return S3StorageBackend(
+            bucket=settings.AWS_S3_BUCKET,
+            region=settings.AWS_REGION,
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            access_key_id=settings.AWS_ACCESS_KEY_ID,
+            secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            multipart_concurrency=settings.S3_MULTIPART_CONCURRENCY,
+            presign_expiry=settings.S3_PRESIGN_EXPIRY_SECONDS if settings.S3_PRESIGNED_URLS else None,
+            url_prefix=f"{settings.API_V1_STR}/photos" if settings.S3_PRESIGNED_URLS else None,
+        )
+    if backend == "local":
+        return LocalStorageBackend(
+            directory=settings.UPLOAD_DIR,
+            url_prefix="/uploads",
+            max_bytes=settings.MAX_UPLOAD_SIZE,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
+    if backend == "memory":
+        return InMemoryStorageBackend()
+
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+@lru_cache()
+def get_storage_backend() -> StorageBackend:
+    """Get the process-wide storage backend, creating it on first use."""
+    storage = create_storage_backend()
+    logger.info(f"Using {storage.name} photo storage")
+    return storage
@@ -0,0 +1,147 @@
+"""
+Bounded executor for blocking photo uploads.
+
+Storage backends block (boto3, file I/O), so uploads must not run on the
+event loop. They also should not share the default threadpool, where a
+burst of slow uploads would starve every other sync dependency. Uploads
+run on ``upload_executor``, a dedicated pool with a fixed number of
+workers and a bounded wait queue. When the queue is full, new uploads are
+refused so the API can answer ``503`` instead of piling up request bodies.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from todo_api.config.settings import settings
+from todo_api.monitoring.metrics import record_storage_upload, set_storage_upload_queue
+
+T = TypeVar("T")
+
+
+class UploadQueueFullError(RuntimeError):
+    """Raised when the upload queue has no room for another upload."""
+
+
+class UploadExecutor:
+    """Runs blocking storage uploads on a dedicated, bounded thread pool."""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+
+    @property
+    def waiting(self) -> int:
+        """Uploads queued for a worker."""
+        return self._waiting
+
+    @property
+    def running(self) -> int:
+        """Uploads currently being stored."""
+        return self._running
+
+    def start(self) -> None:
+        """Create the worker pool if it is not already running."""
+        with self._lock:
+            self._ensure_executor()
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool, creating it if needed. Caller must hold the lock."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="photo-upload"
+            )
+        return self._executor
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Shut the pool down.
+
+        Blocking when ``wait`` is True; call it from a worker thread in
+        async code.
+
+        Args:
+            wait: Wait for in-flight uploads to finish
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    async def run(
+        self,
+        backend: str,
+        fn: Callable[..., T],
+        *args: Any,
+        size: Optional[int] = None
+    ) -> T:
+        """
+        Run ``fn(*args)`` on an upload worker and wait for the result.
+
+        Args:
+            backend: Storage backend name, used as a metrics label
+            fn: Blocking upload function
+            args: Arguments for ``fn``
+            size: Size of the upload in bytes, for throughput metrics
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            UploadQueueFullError: If ``max_queue`` uploads are already waiting
+        """
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                record_storage_upload(backend, "rejected")
+                raise UploadQueueFullError(f"{self._waiting} uploads already waiting")
+            self._waiting += 1
+            self._publish()
+            future = self._ensure_executor().submit(self._call, backend, fn, args, size)
+
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A request cancelled before a worker picked the upload up frees its slot
+            if future.cancel():
+                with self._lock:
+                    self._waiting -= 1
+                    self._publish()
+            raise
+
+    def _call(self, backend: str, fn: Callable[..., T], args: tuple, size: Optional[int]) -> T:
+        """Worker-side wrapper keeping queue gauges and upload metrics."""
+        with self._lock:
+            self._waiting -= 1
+            self._running += 1
+            self._publish()
+
+        started = time.perf_counter()
+        result = "failed"
+        try:
+            value = fn(*args)
+            result = "stored"
+            return value
+        finally:
+            record_storage_upload(backend, result, time.perf_counter() - started, size if result == "stored" else None)
+            with self._lock:
+                self._running -= 1
+                self._publish()
+
+    def _publish(self) -> None:
+        """Update the queue gauges. Caller must hold the lock."""
+        set_storage_upload_queue(self._waiting, self._running)
+
+
+# Shared executor used by the photo upload endpoint; started at startup or on first use
+upload_executor = UploadExecutor(
+    max_workers=settings.UPLOAD_MAX_WORKERS,
+    max_queue=settings.UPLOAD_MAX_QUEUE,
+)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Add data_version column to users table
+
+import os
+import sys
+import psycopg2
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.settings import settings  # type: ignore
+
+def add_data_version_column():
+    # Connect to the database
+    conn = psycopg2.connect(
+        dbname=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT
+    )
+    conn.autocommit = True
+    cursor = conn.cursor()
+    
+    try:
+        # Check if column exists
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='data_version';")
+        if cursor.fetchone() is None:
+            print("Adding 'data_version' column to users table...")
+            cursor.execute("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0;")
+            print("data_version column added successfully!")
+        else:
+            print("data_version column already exists.")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    add_data_version_column()
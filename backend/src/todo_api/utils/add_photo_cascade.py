@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Make todo_photos.todo_id cascade on todo deletion
+
+import os
+import sys
+import psycopg2
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.settings import settings  # type: ignore
+
+def add_photo_cascade():
+    # Connect to the database
+    conn = psycopg2.connect(
+        dbname=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT
+    )
+    conn.autocommit = True
+    cursor = conn.cursor()
+    
+    try:
+        # Find the foreign key from todo_photos.todo_id to todos and its delete action
+        cursor.execute("""
+            SELECT c.conname, c.confdeltype
+            FROM pg_constraint c
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+            WHERE c.contype = 'f'
+              AND c.conrelid = 'todo_photos'::regclass
+              AND c.confrelid = 'todos'::regclass
+              AND a.attname = 'todo_id';
+        """)
+        row = cursor.fetchone()
+        if row is None:
+            print("Adding cascading foreign key on todo_photos.todo_id...")
+            cursor.execute("""
+                ALTER TABLE todo_photos
+                ADD CONSTRAINT todo_photos_todo_id_fkey
+                FOREIGN KEY (todo_id) REFERENCES todos(id) ON DELETE CASCADE;
+            """)
+            print("Foreign key added successfully!")
+        elif row[1] != 'c':
+            print(f"Replacing foreign key {row[0]} with ON DELETE CASCADE...")
+            cursor.execute("BEGIN;")
+            cursor.execute(f'ALTER TABLE todo_photos DROP CONSTRAINT "{row[0]}";')
+            cursor.execute(f"""
+                ALTER TABLE todo_photos
+                ADD CONSTRAINT "{row[0]}"
+                FOREIGN KEY (todo_id) REFERENCES todos(id) ON DELETE CASCADE;
+            """)
+            cursor.execute("COMMIT;")
+            print("Foreign key now cascades on delete!")
+        else:
+            print("todo_photos.todo_id already cascades on delete.")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    add_photo_cascade()
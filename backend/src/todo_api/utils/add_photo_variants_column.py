@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Add variants column to todo_photos table
+
+import os
+import sys
+import psycopg2
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.settings import settings  # type: ignore
+
+def add_photo_variants_column():
+    # Connect to the database
+    conn = psycopg2.connect(
+        dbname=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT
+    )
+    conn.autocommit = True
+    cursor = conn.cursor()
+    
+    try:
+        # Check if column exists
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='todo_photos' AND column_name='variants';")
+        if cursor.fetchone() is None:
+            print("Adding 'variants' column to todo_photos table...")
+            cursor.execute("ALTER TABLE todo_photos ADD COLUMN variants JSONB;")
+            print("variants column added successfully!")
+        else:
+            print("variants column already exists.")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    add_photo_variants_column()
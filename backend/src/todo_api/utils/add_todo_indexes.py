@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# Add composite indexes to the todos table
+
+import os
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.database import engine  # type: ignore
+from todo_api.models import Todo  # type: ignore
+
+def add_todo_indexes():
+    """Create any indexes declared on the Todo model that are missing."""
+    for index in Todo.__table__.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+            print(f"Index {index.name} is present.")
+        except Exception as e:
+            print(f"Error creating index {index.name}: {e}")
+            raise
+
+if __name__ == "__main__":
+    add_todo_indexes()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Convert user_column_settings JSON text columns to native JSONB
+
+import os
+import sys
+import psycopg2
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.settings import settings  # type: ignore
+
+COLUMNS = ("column_order", "columns_config")
+
+def convert_column_settings_to_jsonb():
+    # Connect to the database
+    conn = psycopg2.connect(
+        dbname=settings.POSTGRES_DB,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT
+    )
+    conn.autocommit = True
+    cursor = conn.cursor()
+    
+    try:
+        for column in COLUMNS:
+            cursor.execute(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name='user_column_settings' AND column_name=%s;",
+                (column,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                print(f"user_column_settings.{column} does not exist; run add_column_settings first.")
+            elif row[0] != "jsonb":
+                print(f"Converting user_column_settings.{column} from {row[0]} to jsonb...")
+                # Empty strings were written by early versions; store them as NULL
+                cursor.execute(f"""
+                    ALTER TABLE user_column_settings
+                    ALTER COLUMN {column} TYPE JSONB
+                    USING NULLIF({column}::text, '')::jsonb;
+                """)
+                print(f"{column} converted successfully!")
+            else:
+                print(f"user_column_settings.{column} is already jsonb.")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    convert_column_settings_to_jsonb()
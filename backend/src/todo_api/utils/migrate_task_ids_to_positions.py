@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Move column membership from columns_config taskIds blobs to todos.position
+
+import json
+import os
+import sys
+
+from sqlalchemy import func, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(os.path.dirname(current_dir))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# Import from todo_api structure (using type: ignore for Pylance)
+from todo_api.config.database import engine  # type: ignore
+from todo_api.models import Todo, UserColumnSettings  # type: ignore
+from todo_api.services.columns import POSITION_STEP, dump_columns_config  # type: ignore
+
+def add_position_column():
+    """Add todos.position and its index if they are missing."""
+    columns = {column["name"] for column in inspect(engine).get_columns("todos")}
+    if "position" not in columns:
+        print("Adding 'position' column to todos table...")
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE todos ADD COLUMN position FLOAT"))
+        print("position column added successfully!")
+    else:
+        print("position column already exists.")
+
+    for index in Todo.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+        print(f"Index {index.name} is present.")
+
+def convert_task_ids():
+    """Turn every stored taskIds list into todo positions and empty the lists."""
+    with Session(engine) as db:
+        settings_rows = db.execute(select(UserColumnSettings)).scalars().all()
+        converted = 0
+
+        for settings in settings_rows:
+            config = settings.columns_config or {}
+            if isinstance(config, str):
+                # Column not yet converted to JSONB
+                try:
+                    config = json.loads(config)
+                except ValueError:
+                    print(f"Skipping unreadable columns_config for user {settings.user_id}")
+                    continue
+
+            statuses = dict(
+                db.execute(
+                    select(Todo.id, Todo.status).where(Todo.user_id == settings.user_id)
+                ).all()
+            )
+
+            rows = []
+            for column_id, column in config.items():
+                task_ids = column.get("taskIds") if isinstance(column, dict) else None
+                for index, task_id in enumerate(task_ids or []):
+                    try:
+                        task_id = int(task_id)
+                    except (TypeError, ValueError):
+                        continue
+                    # Membership always follows status; only the order is taken from the blob
+                    if statuses.get(task_id) == column_id:
+                        rows.append({"id": task_id, "position": (index + 1) * POSITION_STEP})
+
+            if rows:
+                db.execute(update(Todo), rows)
+            settings.columns_config = dump_columns_config(config)
+            converted += 1
+
+        db.flush()
+
+        # Todos that no blob listed go after the listed ones, in id order
+        last_positions = {
+            (user_id, status): position or 0.0
+            for user_id, status, position in db.execute(
+                select(Todo.user_id, Todo.status, func.max(Todo.position))
+                .group_by(Todo.user_id, Todo.status)
+            ).all()
+        }
+        unplaced = db.execute(
+            select(Todo.id, Todo.user_id, Todo.status)
+            .where(Todo.position.is_(None))
+            .order_by(Todo.user_id, Todo.status, Todo.id)
+        ).all()
+        rows = []
+        for todo_id, user_id, status in unplaced:
+            last_positions[(user_id, status)] += POSITION_STEP
+            rows.append({"id": todo_id, "position": last_positions[(user_id, status)]})
+        if rows:
+            db.execute(update(Todo), rows)
+
+        db.commit()
+        print(f"Converted column settings for {converted} users; placed {len(rows)} unlisted todos.")
+
+if __name__ == "__main__":
+    add_position_column()
+    convert_task_ids()
@@ -13,6 +13,7 @@ from typing import Generator
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 # Add src directory to Python path for imports
@@ -23,12 +24,13 @@ if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
 # Import from todo_api structure (pyproject.toml pythonpath handles this for pytest)
-from todo_api.config.database import Base, get_db  # type: ignore
+from todo_api.config.database import Base, get_async_db, get_db  # type: ignore
 from todo_api.models import User, Todo, UserColumnSettings  # type: ignore
 from todo_api.main import app  # type: ignore
 
 # Test database URL - using SQLite for testing
 TEST_DATABASE_URL = "sqlite:///./test.db"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 
 @pytest.fixture(scope="session")
@@ -74,7 +76,15 @@ def client(test_db: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
     
+    async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL)
+    TestAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as session:
+            yield session
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -118,8 +128,13 @@ def test_column_settings(test_db: Session, test_user: User) -> UserColumnSetting
     """Create test column settings with blocked column."""
     settings = UserColumnSettings(
         user_id=test_user.id,
-        column_order='["todo", "inProgress", "blocked", "done"]',
-        columns_config='{"todo": {"id": "todo", "title": "To Do", "taskIds": []}, "inProgress": {"id": "inProgress", "title": "In Progress", "taskIds": []}, "blocked": {"id": "blocked", "title": "Blocked", "taskIds": []}, "done": {"id": "done", "title": "Completed", "taskIds": []}}'
+        column_order=["todo", "inProgress", "blocked", "done"],
+        columns_config={
+            "todo": {"id": "todo", "title": "To Do", "taskIds": []},
+            "inProgress": {"id": "inProgress", "title": "In Progress", "taskIds": []},
+            "blocked": {"id": "blocked", "title": "Blocked", "taskIds": []},
+            "done": {"id": "done", "title": "Completed", "taskIds": []}
+        }
     )
     test_db.add(settings)
     test_db.commit()
@@ -0,0 +1,34 @@
+"""
+Unit tests for cached access token decoding.
+"""
+
+import hashlib
+import time
+from datetime import timedelta
+
+from todo_api.api.v1.endpoints.auth import create_access_token, decode_token
+from todo_api.core.cache import claims_cache
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def test_decoded_claims_are_cached_until_token_expiry():
+    token = create_access_token({"sub": "cached@example.com", "uid": 7}, timedelta(seconds=30))
+    payload = decode_token(token)
+    assert payload["sub"] == "cached@example.com"
+    assert payload["uid"] == 7
+
+    expires_at, cached, _ = claims_cache._entries[_digest(token)]
+    assert cached is payload
+    assert expires_at <= time.monotonic() + 30
+    assert decode_token(token) is payload
+
+
+def test_invalid_tokens_are_not_cached():
+    assert decode_token("not-a-jwt") is None
+    assert claims_cache.get(_digest("not-a-jwt")) is None
+
+    expired = create_access_token({"sub": "old@example.com"}, timedelta(seconds=-5))
+    assert decode_token(expired) is None
@@ -0,0 +1,58 @@
+"""
+Unit tests for conflicting operations in the batch todos endpoint.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from todo_api.api.v1.endpoints.auth import get_current_user
+from todo_api.config.database import get_async_db
+from todo_api.main import app
+from todo_api.models import Base, Todo, User
+from todo_api.services.storage import InMemoryStorageBackend, get_storage_backend
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}")
+
+    async def seed():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            user = User(email="batch@example.com", name="Batch")
+            db.add(user)
+            await db.flush()
+            db.add(Todo(id=1, title="Edit then delete", status="todo", user_id=user.id, position=1.0))
+            await db.commit()
+            return user
+
+    user = asyncio.run(seed())
+
+    async def batch_db():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = batch_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_storage_backend] = InMemoryStorageBackend
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    asyncio.run(engine.dispose())
+
+
+def test_update_of_a_todo_deleted_later_in_the_batch_is_not_found(client):
+    response = client.post("/api/v1/todos/batch", json={"operations": [
+        {"op": "update", "id": 1, "title": "Edited"},
+        {"op": "delete", "id": 1},
+        {"op": "update", "id": 1, "title": "Too late"},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [404, 204, 404]
+    assert results[0]["detail"] == "Todo deleted later in the batch"
+    assert results[0]["todo"] is None
@@ -0,0 +1,52 @@
+"""
+Unit tests for the in-process TTL/LRU cache.
+"""
+
+import time
+
+from todo_api.core.cache import TTLCache
+
+
+def test_get_returns_stored_value():
+    cache = TTLCache("test", max_entries=10, ttl_seconds=60)
+    cache.set("a", b"payload")
+    assert cache.get("a") == b"payload"
+    assert cache.get("missing") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache("test", max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache("test", max_entries=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=60)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_invalidate_owner_removes_only_that_owners_entries():
+    cache = TTLCache("test", max_entries=10, ttl_seconds=60)
+    cache.set(("u1", "todos"), 1, owner=1)
+    cache.set(("u1", "todo"), 2, owner=1)
+    cache.set(("u2", "todos"), 3, owner=2)
+    cache.invalidate_owner(1)
+    assert cache.get(("u1", "todos")) is None
+    assert cache.get(("u1", "todo")) is None
+    assert cache.get(("u2", "todos")) == 3
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache("test", max_entries=0, ttl_seconds=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,48 @@
+"""
+Unit tests for position-based column ordering helpers.
+"""
+
+from todo_api.schemas.column_settings import DefaultColumnSettings
+from todo_api.services.columns import (
+    assign_positions,
+    dump_columns_config,
+    order_positions,
+    position_between,
+    with_task_ids,
+)
+
+
+def test_position_between_neighbours():
+    assert position_between(None, None) == 1.0
+    assert position_between(None, 3.0) == 2.0
+    assert position_between(3.0, None) == 4.0
+    assert position_between(1.0, 2.0) == 1.5
+
+
+def test_order_positions_moves_only_out_of_order_todos():
+    # A card dragged from the end of the column to the middle
+    assert order_positions([1.0, 2.0, 5.0, 3.0, 4.0]) == [1.0, 2.0, 2.5, 3.0, 4.0]
+    assert order_positions([3.0, 1.0, None]) == [0.0, 1.0, 2.0]
+    assert order_positions([1.0, 2.0]) == [1.0, 2.0]
+
+
+def test_order_positions_renumbers_when_a_gap_cannot_be_split():
+    assert order_positions([1.0, 3.0, 1.0000000000000002]) == [1.0, 2.0, 3.0]
+
+
+def test_assign_positions_appends_per_column():
+    starts = {"todo": 3.0}
+    assert assign_positions(starts, ["todo", "done", "todo"]) == [4.0, 1.0, 5.0]
+    assert starts == {"todo": 5.0, "done": 1.0}
+
+
+def test_task_ids_are_stored_empty_and_derived_on_read():
+    config = DefaultColumnSettings.get_default().columns_config
+    config["todo"].taskIds = [3, 1]
+    stored = dump_columns_config(config)
+    assert stored["todo"] == {"id": "todo", "title": "To Do", "taskIds": []}
+
+    derived = with_task_ids(stored, {"todo": [1, 3], "archived": [9]})
+    assert derived["todo"]["taskIds"] == [1, 3]
+    assert derived["done"]["taskIds"] == []
+    assert "archived" not in derived
@@ -0,0 +1,37 @@
+"""
+Unit tests for direct-to-storage upload tickets.
+"""
+
+import pytest
+
+from todo_api.services.direct_uploads import (
+    LOCAL_UPLOAD,
+    UPLOAD_TICKET,
+    InvalidUploadTokenError,
+    issue_upload,
+    read_upload_token,
+)
+from todo_api.services.storage import InMemoryStorageBackend
+
+
+def test_backends_without_presigning_get_a_signed_put_url():
+    ticket = issue_upload(InMemoryStorageBackend(), user_id=3, todo_id=9, filename="Cat.PNG")
+
+    assert ticket["method"] == "PUT"
+    assert ticket["key"].startswith("3/") and ticket["key"].endswith(".png")
+    assert ticket["headers"] == {"Content-Type": "image/png"}
+
+    put_token = ticket["url"].split("token=", 1)[1]
+    assert read_upload_token(put_token, LOCAL_UPLOAD)["key"] == ticket["key"]
+
+    claims = read_upload_token(ticket["upload_token"], UPLOAD_TICKET)
+    assert (claims["key"], claims["user"], claims["todo"], claims["filename"]) == (ticket["key"], 3, 9, "Cat.PNG")
+    assert "sub" not in claims and "uid" not in claims
+
+
+def test_tokens_are_not_interchangeable():
+    ticket = issue_upload(InMemoryStorageBackend(), user_id=3, todo_id=9, filename="a.jpg")
+    with pytest.raises(InvalidUploadTokenError):
+        read_upload_token(ticket["upload_token"], LOCAL_UPLOAD)
+    with pytest.raises(InvalidUploadTokenError):
+        read_upload_token("not-a-token", UPLOAD_TICKET)
@@ -0,0 +1,67 @@
+"""
+Unit tests for ETag matching and data version loading.
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from todo_api.core import replicas
+from todo_api.core.cache import version_cache
+from todo_api.core.etag import bump_data_version, etag_matches, load_data_version
+from todo_api.core.replicas import RequestWrites
+from todo_api.models import Base, User
+
+ETAG = '"todos-1-7"'
+
+
+def test_missing_header_does_not_match():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_exact_and_listed_etags_match():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f'"todos-1-6", {ETAG}', ETAG)
+
+
+def test_weak_comparison_and_wildcard():
+    assert etag_matches(f"W/{ETAG}", ETAG)
+    assert etag_matches("*", ETAG)
+
+
+def test_stale_etag_does_not_match():
+    assert not etag_matches('"todos-1-6"', ETAG)
+    assert not etag_matches('"todo-1-7"', ETAG)
+
+
+def test_data_versions_are_cached_until_a_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(version_cache, "max_entries", 10)
+    monkeypatch.setattr(version_cache, "ttl_seconds", 60)
+    version_cache.clear()
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'versions.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(User(id=1, email="version@example.com"))
+            await db.commit()
+
+            loaded = [await load_data_version(db, User(id=1))]
+            # Written through another process
+            await db.execute(text("UPDATE users SET data_version = 5"))
+            await db.commit()
+            loaded.append(await load_data_version(db, User(id=1)))
+            # ...by this client, which reports the version in its cookie
+            replicas._request_writes.set(RequestWrites((1, 5)))
+            loaded.append(await load_data_version(db, User(id=1)))
+
+            await bump_data_version(db, 1)
+            await db.commit()
+            loaded.append(await load_data_version(db, User(id=1)))
+        await engine.dispose()
+        return loaded
+
+    assert asyncio.run(scenario()) == [0, 0, 5, 6]
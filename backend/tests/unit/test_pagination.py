@@ -0,0 +1,24 @@
+"""
+Unit tests for keyset pagination cursors.
+"""
+
+import pytest
+
+from todo_api.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("inProgress", 42)
+    assert decode_cursor(cursor) == ("inProgress", 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("todo", 10**12)
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bnVsbA", "WyJ0b2RvIiwgInRlbiJd"])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
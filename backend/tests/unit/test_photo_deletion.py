@@ -0,0 +1,37 @@
+"""
+Unit tests for the background photo deletion worker.
+"""
+
+from todo_api.services.deletion import PhotoDeletionWorker
+from todo_api.services.storage import InMemoryStorageBackend, StorageError
+
+
+class FlakyStorage(InMemoryStorageBackend):
+    """In-memory storage that fails the first bulk delete for one key."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        self.calls.append(keys)
+        if len(self.calls) == 1:
+            super().delete_many(keys[1:])
+            raise StorageError("transient", failed_keys=keys[:1])
+        super().delete_many(keys)
+
+
+def test_keys_are_batched_and_failures_retried():
+    storage = FlakyStorage()
+    for index in range(5):
+        storage.objects[f"k{index}"] = b""
+
+    worker = PhotoDeletionWorker(batch_size=3, linger_seconds=0.5, retry_backoff_seconds=0)
+    assert worker.enqueue(storage, ["k0", "k1", "", "k2", "k3", "k4"]) == 5
+    worker.stop()
+
+    assert storage.keys() == []
+    assert storage.calls[0] == ["k0", "k1", "k2"]
+    assert storage.calls[1] == ["k0"]
+    assert all(len(call) <= 3 for call in storage.calls)
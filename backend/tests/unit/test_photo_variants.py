@@ -0,0 +1,132 @@
+"""
+Unit tests for photo derivative rendering and selection.
+"""
+
+import asyncio
+import io
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from todo_api.models import Base, Todo, TodoPhoto, User
+from todo_api.models.todo import photo_storage_keys
+from todo_api.services.images import render_photo
+from todo_api.services.photo_variants import PhotoVariantPipeline, select_variant
+from todo_api.services.storage import InMemoryStorageBackend
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _encode(image, format):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def test_thumbnails_fit_each_size_and_skip_larger_ones():
+    data = _encode(Image.new("RGB", (1000, 600), (10, 20, 30)), "JPEG")
+    rendered = render_photo(data, [512, 128, 2048], quality=80).variants
+
+    assert [(image.label, image.width, image.height) for image in rendered] == [
+        ("128", 128, 77),
+        ("512", 512, 307),
+    ]
+    assert all(image.content_type == "image/jpeg" for image in rendered)
+    assert Image.open(io.BytesIO(rendered[0].data)).size == (128, 77)
+
+
+def test_transparent_images_stay_png():
+    data = _encode(Image.new("RGBA", (300, 300), (0, 0, 0, 0)), "PNG")
+    (image,) = render_photo(data, [128], quality=80).variants
+    assert (image.content_type, image.extension) == ("image/png", ".png")
+
+
+def test_storage_keys_include_variants():
+    variants = [{"label": "128", "key": "a_128.jpg"}, {"label": "512", "key": "a_512.jpg"}]
+    assert photo_storage_keys("a.jpg", variants) == ["a.jpg", "a_128.jpg", "a_512.jpg"]
+    assert photo_storage_keys("a.jpg", None) == ["a.jpg"]
+
+
+def test_reencoded_original_drops_exif_and_applies_orientation():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    exif[0x0112] = 6  # Rotated 90 degrees
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 200)).save(buffer, format="JPEG", exif=exif.tobytes())
+
+    photo = render_photo(buffer.getvalue(), [], quality=80, original_quality=85)
+
+    reencoded = Image.open(io.BytesIO(photo.original.data))
+    assert reencoded.size == (200, 400)
+    assert dict(reencoded.getexif()) == {}
+
+
+def _variant(label, content_type, size):
+    return {"label": label, "content_type": content_type, "bytes": size, "url": f"{label}-{content_type}"}
+
+
+VARIANTS = [
+    _variant("128", "image/jpeg", 2000),
+    _variant("128", "image/webp", 900),
+    _variant("128", "image/avif", 700),
+    _variant("512", "image/jpeg", 9000),
+    _variant("original", "image/webp", 50000),
+]
+
+
+def test_select_variant_prefers_smallest_explicitly_accepted_format():
+    accept = "image/avif,image/webp,image/*,*/*;q=0.8"
+    assert select_variant(VARIANTS, accept, size=100)["url"] == "128-image/avif"
+    assert select_variant(VARIANTS, "image/webp,image/avif;q=0", size=100)["url"] == "128-image/webp"
+
+
+def test_select_variant_ignores_wildcards_and_falls_back():
+    assert select_variant(VARIANTS, "image/*,*/*", size=100)["url"] == "128-image/jpeg"
+    assert select_variant(VARIANTS, None, size=300)["url"] == "512-image/jpeg"
+    assert select_variant(VARIANTS, None) is None
+    assert select_variant(VARIANTS, "image/webp", size=4000)["url"] == "original-image/webp"
+
+
+def test_generate_serves_the_reencode_and_keeps_the_uploaded_key(tmp_path):
+    storage = InMemoryStorageBackend()
+    url = storage.save("1/cat.jpg", io.BytesIO(_encode(Image.new("RGB", (400, 200)), "JPEG")))
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'photos.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = lambda: AsyncSession(engine, expire_on_commit=False)  # noqa: E731
+        async with session_factory() as db:
+            user = User(email="photo@example.com", name="Photo")
+            db.add(user)
+            await db.flush()
+            todo = Todo(title="Photo", user_id=user.id, status="todo")
+            db.add(todo)
+            await db.flush()
+            photo = TodoPhoto(filename="cat.jpg", url=url, s3_key="1/cat.jpg", todo_id=todo.id)
+            db.add(photo)
+            await db.commit()
+
+        pipeline = PhotoVariantPipeline(
+            sizes=[128], quality=80, max_workers=1, original_quality=85, session_factory=session_factory
+        )
+
+        async def render(data):
+            return render_photo(data, pipeline.sizes, pipeline.quality, (), pipeline.original_quality)
+
+        pipeline.render = render
+        await pipeline.generate(storage, photo.id, "1/cat.jpg", user.id)
+
+        async with session_factory() as db:
+            stored = (await db.execute(select(TodoPhoto))).scalar_one()
+        await engine.dispose()
+        return stored
+
+    stored = asyncio.run(scenario())
+
+    assert [variant["label"] for variant in stored.variants] == ["original", "128"]
+    assert stored.url == stored.variants[0]["url"] != url
+    assert stored.s3_key == "1/cat.jpg"
+    assert "1/cat.jpg" in storage.keys()
+    assert all(variant["key"] in storage.keys() for variant in stored.variants)
@@ -0,0 +1,91 @@
+"""
+Unit tests for scrape-time pool metrics and statement timing.
+"""
+
+import sqlite3
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from todo_api import main
+from todo_api.core.pool import MeteredQueuePool
+from todo_api.core.replicas import Replica
+from todo_api.monitoring.metrics import PoolCollector, setup_database_metrics
+
+
+def _engine(**kwargs):
+    return create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        **kwargs,
+    )
+
+
+def _samples(collector):
+    return {
+        (family.name, sample.labels["pool"]): sample.value
+        for family in collector.collect()
+        for sample in family.samples
+    }
+
+
+def test_pool_state_is_read_when_collected():
+    engine = _engine(poolclass=MeteredQueuePool, pool_size=2, max_overflow=1)
+    collector = PoolCollector()
+    collector.add("t-pool", engine)
+    collector.add("t-null", _engine(poolclass=NullPool))
+
+    first = engine.connect()
+    second = engine.connect()
+    third = engine.connect()
+    assert _samples(collector) == {
+        ("db_connections_active", "t-pool"): 3,
+        ("db_connections_total", "t-pool"): 2,
+        ("db_connections_idle", "t-pool"): 0,
+        ("db_connections_overflow", "t-pool"): 1,
+    }
+
+    for connection in (first, second, third):
+        connection.close()
+    samples = _samples(collector)
+    assert samples[("db_connections_active", "t-pool")] == 0
+    assert samples[("db_connections_idle", "t-pool")] == 2
+    assert samples[("db_connections_overflow", "t-pool")] == 0
+
+
+def test_statements_are_timed_and_counted_by_operation():
+    engine = _engine(poolclass=MeteredQueuePool)
+    setup_database_metrics(engine, "t-timed")
+
+    def observed():
+        return (
+            REGISTRY.get_sample_value("db_query_duration_seconds_count") or 0,
+            REGISTRY.get_sample_value("db_query_total", {"operation": "select"}) or 0,
+        )
+
+    before = observed()
+    with engine.connect() as connection:
+        connection.execute(text("  SELECT 1"))
+    after = observed()
+
+    assert after[0] == before[0] + 1
+    assert after[1] == before[1] + 1
+    assert REGISTRY.get_sample_value("db_connections_active", {"pool": "t-timed"}) == 0
+
+
+def test_replica_pools_are_reported(tmp_path, monkeypatch):
+    replica = Replica(
+        "t-replica1",
+        _engine(poolclass=MeteredQueuePool, pool_size=3),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", pool_size=4),
+    )
+    monkeypatch.setattr(main.replica_router, "replicas", [replica])
+    monkeypatch.setattr(main.settings, "ENABLE_METRICS", True)
+
+    main.setup_metrics(FastAPI())
+
+    assert REGISTRY.get_sample_value("db_connections_total", {"pool": "t-replica1"}) == 4
+    assert REGISTRY.get_sample_value("db_connections_total", {"pool": "t-replica1-sync"}) == 3
@@ -0,0 +1,64 @@
+"""
+Unit tests for connection pool metering and adaptive overflow.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from todo_api.core.pool import MeteredQueuePool, PoolController, name_pool
+from todo_api.monitoring.metrics import CheckoutStats, take_db_checkout_stats
+
+
+def _engine(name, pool_size=1, max_overflow=0):
+    engine = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=0.05,
+    )
+    name_pool(engine, name)
+    return engine
+
+
+def _controller(engine, name):
+    return PoolController(engine, name, min_overflow=2, max_overflow=10, target_wait=0.05, step=4, interval=1)
+
+
+def test_overflow_grows_on_slow_checkouts_and_timeouts():
+    controller = _controller(_engine("t-grow"), "t-grow")
+
+    assert controller.next_overflow(4, CheckoutStats(10, 1.0, 0.2, 0), 0.9) == 8
+    assert controller.next_overflow(4, CheckoutStats(10, 0.0, 0.0, 1), 0.9) == 8
+    assert controller.next_overflow(8, CheckoutStats(10, 1.0, 0.2, 0), 0.9) == 10
+
+
+def test_overflow_shrinks_only_while_idle():
+    controller = _controller(_engine("t-shrink"), "t-shrink")
+    quiet = CheckoutStats(10, 0.0, 0.001, 0)
+
+    assert controller.next_overflow(6, quiet, 0.1) == 5
+    assert controller.next_overflow(6, quiet, 0.8) == 6
+    assert controller.next_overflow(2, quiet, 0.0) == 2
+
+
+def test_timed_out_checkout_is_recorded_and_grows_the_pool():
+    engine = _engine("t-timeout")
+    controller = _controller(engine, "t-timeout")
+    take_db_checkout_stats("t-timeout")
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    assert controller.adjust() == 4
+    assert engine.pool.max_overflow() == 4
+    # The extra capacity is usable straight away
+    engine.connect().close()
+    held.close()
+
+    stats = take_db_checkout_stats("t-timeout")
+    assert stats.count == 1 and stats.timeouts == 0
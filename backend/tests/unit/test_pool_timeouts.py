@@ -0,0 +1,45 @@
+"""
+Unit tests for answering connection pool exhaustion on write endpoints with 503.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from todo_api.api.v1.endpoints.auth import get_current_user
+from todo_api.config.database import get_async_db
+from todo_api.main import app
+from todo_api.models import User
+from todo_api.services.storage import InMemoryStorageBackend, get_storage_backend
+
+
+@pytest.fixture
+def client(tmp_path):
+    # One connection, held by the request itself, so every session checkout times out
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+
+    async def exhausted_db():
+        async with engine.connect():
+            async with AsyncSession(engine) as session:
+                yield session
+
+    app.dependency_overrides[get_async_db] = exhausted_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="pool@example.com", data_version=0)
+    app.dependency_overrides[get_storage_backend] = InMemoryStorageBackend
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path, request_kwargs", [
+    ("/api/v1/todos/", {"json": {"title": "Busy", "status": "todo"}}),
+    ("/api/v1/todos/batch", {"json": {"operations": [{"op": "create", "title": "Busy", "status": "todo"}]}}),
+    ("/api/v1/todos/1/photos", {"files": {"file": ("cat.jpg", b"jpeg", "image/jpeg")}}),
+])
+def test_write_endpoints_answer_pool_timeouts_with_503(client, path, request_kwargs):
+    response = client.post(path, **request_kwargs)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json() == {"detail": "Database is busy, please retry"}
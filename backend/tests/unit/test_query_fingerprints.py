@@ -0,0 +1,121 @@
+"""
+Unit tests for statement fingerprints, per-fingerprint metrics and the slow query log.
+"""
+
+import contextvars
+import logging
+import sqlite3
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from todo_api import main
+from todo_api.api.v1.endpoints.auth import get_current_user
+from todo_api.monitoring import metrics
+from todo_api.monitoring.metrics import (
+    OTHER_FINGERPRINT,
+    fingerprint_statement,
+    set_query_route,
+    setup_database_metrics,
+)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(metrics, "_fingerprint_labels", {})
+    monkeypatch.setattr(metrics, "_fingerprint_limit", 200)
+    monkeypatch.setattr(metrics, "_slow_query_seconds", 0.0)
+    engine = create_engine(
+        "sqlite://", creator=lambda: sqlite3.connect(":memory:", check_same_thread=False)
+    )
+    setup_database_metrics(engine, "t-fingerprints")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER, name TEXT)"))
+    return engine
+
+
+def test_fingerprints_ignore_literals_placeholders_and_list_lengths():
+    fingerprint = fingerprint_statement(
+        "SELECT items.name FROM items  -- lookup\nWHERE items.id IN (?, ?, ?) AND items.name = 'a''b'"
+    )
+
+    assert fingerprint.statement == "SELECT items.name FROM items WHERE items.id IN (...) AND items.name = ?"
+    assert fingerprint.operation == "select"
+    assert fingerprint_statement(
+        "SELECT items.name FROM items WHERE items.id IN (%(id_1)s) AND items.name = %(name)s"
+    ).id == fingerprint.id
+    assert fingerprint_statement(
+        "INSERT INTO items (id, name) VALUES ($1, $2), ($3, $4)"
+    ).statement == "INSERT INTO items (id, name) VALUES (...)"
+
+
+def test_latency_and_rows_are_recorded_per_fingerprint_up_to_the_limit(engine, monkeypatch):
+    monkeypatch.setattr(metrics, "_fingerprint_limit", len(metrics._fingerprint_labels) + 1)
+    insert = fingerprint_statement("INSERT INTO items (id, name) VALUES (?, ?)")
+
+    def observed(fingerprint, name):
+        labels = {"fingerprint": fingerprint, "operation": "insert"}
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    before = observed(insert.id, "db_query_fingerprint_rows_sum")
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO items (id, name) VALUES (:id, :name)"), [
+            {"id": 1, "name": "one"}, {"id": 2, "name": "two"},
+        ])
+    assert observed(insert.id, "db_query_fingerprint_rows_sum") == before + 2
+    assert observed(insert.id, "db_query_fingerprint_duration_seconds_count") >= 1
+    assert REGISTRY.get_sample_value(
+        "db_query_fingerprint_info", {"fingerprint": insert.id, "statement": insert.statement}
+    ) == 1
+
+    before = observed(OTHER_FINGERPRINT, "db_query_fingerprint_duration_seconds_count")
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO items (name) VALUES ('beyond the limit')"))
+    assert observed(OTHER_FINGERPRINT, "db_query_fingerprint_duration_seconds_count") == before + 1
+
+
+def test_slow_queries_are_logged_with_route_and_parameter_shape(engine, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "_slow_query_seconds", 1e-9)
+
+    def query():
+        set_query_route("GET /items/{item_id}")
+        with engine.connect() as connection:
+            connection.execute(text("SELECT name FROM items WHERE id = :id AND name = :name"), {
+                "id": 7, "name": "secret",
+            })
+
+    with caplog.at_level(logging.WARNING, logger="todo_api.slow_queries"):
+        contextvars.copy_context().run(query)
+
+    record = caplog.records[-1]
+    assert record.route == "GET /items/{item_id}"
+    assert record.parameters == ["int", "str[6]"]
+    assert record.operation == "select"
+    assert "secret" not in record.getMessage()
+    assert "WHERE id = ? AND name = ?" in record.getMessage()
+
+
+def test_requests_record_their_route_template(monkeypatch):
+    routes = []
+    monkeypatch.setattr(main, "set_query_route", routes.append)
+
+    def unauthenticated():
+        raise HTTPException(status_code=401)
+
+    main.app.dependency_overrides[get_current_user] = unauthenticated
+    try:
+        client = TestClient(main.app)
+        client.get("/api/v1/todos/12")
+        client.delete("/api/v1/todos/column/todo")
+        client.delete("/api/v1/todos/photos/1")
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert routes == [
+        "GET /api/v1/todos/{todo_id}",
+        "DELETE /api/v1/todos/column/{column_status}",
+        "DELETE /api/v1/todos/photos/{photo_id}",
+    ]
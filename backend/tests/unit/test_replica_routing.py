@@ -0,0 +1,168 @@
+"""
+Unit tests for read-replica session routing, using two SQLite databases.
+"""
+
+import asyncio
+import contextvars
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from todo_api.core import replicas
+from todo_api.core.cache import version_cache
+from todo_api.core.etag import load_data_version
+from todo_api.core.replicas import (
+    AsyncRoutingSession,
+    ReadYourWritesMiddleware,
+    Replica,
+    ReplicaRouter,
+    RequestWrites,
+    RoutingSession,
+    set_request_user,
+    written_version,
+)
+from todo_api.models import Base, User
+
+
+def _database(path, source):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE source (name TEXT)"))
+        connection.execute(text("INSERT INTO source VALUES (:name)"), {"name": source})
+    return engine
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = _database(tmp_path / "primary.db", "primary")
+    replica = Replica(
+        "replica1",
+        _database(tmp_path / "replica.db", "replica"),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"),
+    )
+    router = ReplicaRouter([replica], max_lag=1.0, stickiness=60, check_interval=1)
+    yield primary, replica, router
+    asyncio.run(replica.async_engine.dispose())
+
+
+def _read(session):
+    return session.execute(text("SELECT name FROM source")).scalar_one()
+
+
+def _session(primary, router, **info):
+    Session = sessionmaker(bind=primary, class_=RoutingSession, info={"replica_router": router})
+    session = Session()
+    session.info.update(info)
+    return session
+
+
+def test_reads_go_to_a_current_replica_until_the_session_writes(databases):
+    primary, replica, router = databases
+    replica.lag = 0.0
+
+    with _session(primary, router) as session:
+        assert _read(session) == "primary"
+
+    with _session(primary, router, read_only=True, anonymous_reads=True) as session:
+        assert _read(session) == "replica"
+        session.execute(text("UPDATE source SET name = 'written'"))
+        assert _read(session) == "written"
+
+
+def test_lagging_or_unchecked_replicas_fall_back_to_the_primary(databases):
+    primary, replica, router = databases
+
+    for lag in (None, 5.0):
+        replica.lag = lag
+        with _session(primary, router, read_only=True, anonymous_reads=True) as session:
+            assert _read(session) == "primary"
+
+
+def test_user_reads_wait_for_authentication_and_stick_after_writes(databases):
+    primary, replica, router = databases
+    replica.lag = 0.0
+
+    def read_as(user_id):
+        set_request_user(user_id)
+        with _session(primary, router, read_only=True) as session:
+            return _read(session)
+
+    with _session(primary, router, read_only=True) as session:
+        assert _read(session) == "primary"
+
+    router.note_write(7)
+    assert contextvars.copy_context().run(read_as, 7) == "primary"
+    assert contextvars.copy_context().run(read_as, 8) == "replica"
+
+
+def test_async_sessions_use_the_replica_async_engine_after_a_lag_check(databases):
+    primary, replica, router = databases
+    primary_async = create_async_engine(str(primary.url).replace("sqlite://", "sqlite+aiosqlite://"))
+
+    async def scenario():
+        await router.check()
+        async with AsyncSession(
+            primary_async,
+            sync_session_class=AsyncRoutingSession,
+            info={"replica_router": router, "read_only": True, "anonymous_reads": True},
+        ) as session:
+            name = (await session.execute(text("SELECT name FROM source"))).scalar_one()
+        await primary_async.dispose()
+        return name
+
+    assert asyncio.run(scenario()) == "replica"
+    assert replica.lag == 0.0
+
+
+def test_write_versions_reach_other_requests_through_a_cookie(databases):
+    _, _, router = databases
+
+    async def app(scope, receive, send):
+        if scope["method"] == "POST":
+            router.note_write(7, 3)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"%d" % written_version(7)})
+
+    client = TestClient(ReadYourWritesMiddleware(app, max_age=5))
+    written = client.post("/")
+    assert "Max-Age=5" in written.headers["set-cookie"]
+
+    read = client.get("/")
+    assert read.text == "3"
+    assert "set-cookie" not in read.headers
+
+
+@pytest.mark.parametrize("reported, expected", [(None, 2), ((7, 3), 3)])
+def test_versions_behind_the_clients_write_are_read_from_the_primary(tmp_path, reported, expected):
+    version_cache.clear()
+
+    async def database(name, version):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(User(id=7, email="replica@example.com", data_version=version))
+            await session.commit()
+        return engine
+
+    async def scenario():
+        primary = await database("primary.db", 3)
+        replica = Replica("replica1", None, await database("replica.db", 2))
+        replica.lag = 0.0
+        router = ReplicaRouter([replica], max_lag=1.0, stickiness=60, check_interval=1)
+        set_request_user(7)
+        replicas._request_writes.set(RequestWrites(reported))
+        async with AsyncSession(
+            primary,
+            sync_session_class=AsyncRoutingSession,
+            info={"replica_router": router, "read_only": True},
+        ) as session:
+            version = await load_data_version(session, User(id=7))
+        await primary.dispose()
+        await replica.async_engine.dispose()
+        return version
+
+    assert asyncio.run(scenario()) == expected
@@ -0,0 +1,70 @@
+"""
+Unit tests for the prebuilt lookup statements.
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from todo_api.models import Base, Todo, TodoPhoto, User
+from todo_api.services import repository
+
+
+def _run(scenario):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                owner, other = User(email="owner@example.com"), User(email="other@example.com")
+                db.add_all([owner, other])
+                await db.flush()
+                todo = Todo(title="Mine", user_id=owner.id, status="todo")
+                db.add(todo)
+                await db.flush()
+                db.add(TodoPhoto(todo_id=todo.id, filename="a.jpg", url="/uploads/a.jpg", s3_key="1/a.jpg"))
+                await db.commit()
+                return await scenario(db, owner, other, todo)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_todo_lookups_are_scoped_to_the_owner():
+    async def scenario(db, owner, other, todo):
+        assert (await repository.get_todo(db, todo.id, owner.id)).title == "Mine"
+        assert await repository.get_todo(db, todo.id, other.id) is None
+        assert (await repository.get_todo_row(db, todo.id, owner.id)).title == "Mine"
+        assert await repository.todo_exists(db, todo.id, owner.id)
+        assert not await repository.todo_exists(db, todo.id, other.id)
+
+    _run(scenario)
+
+
+def test_user_and_photo_lookups():
+    async def scenario(db, owner, other, todo):
+        assert (await repository.get_user(db, owner.id)).email == "owner@example.com"
+        assert (await repository.get_user_by_email(db, "other@example.com")).id == other.id
+        assert await repository.get_user_by_email(db, "nobody@example.com") is None
+        assert await repository.get_column_settings(db, owner.id) is None
+
+        photo = await repository.get_photo_delivery(db, "1/a.jpg")
+        assert photo.url == "/uploads/a.jpg"
+        assert await repository.get_user_photo(db, 1, other.id) is None
+
+    _run(scenario)
+
+
+def test_data_version_increments_in_sql():
+    async def scenario(db, owner, other, todo):
+        before = await repository.get_data_version(db, owner.id)
+        await repository.increment_data_version(db, owner.id)
+        await repository.increment_data_version(db, owner.id)
+        await db.commit()
+        return before, await repository.get_data_version(db, owner.id), await repository.get_data_version(db, other.id)
+
+    before, after, untouched = _run(scenario)
+    assert after == before + 2
+    assert untouched == before
@@ -0,0 +1,62 @@
+"""
+Unit tests for photo storage backends.
+"""
+
+import io
+
+import pytest
+
+from todo_api.services.storage import InMemoryStorageBackend, LocalStorageBackend, S3StorageBackend
+
+
+def test_in_memory_backend_round_trip():
+    storage = InMemoryStorageBackend()
+    key = storage.make_key(1, "a.jpg")
+    assert storage.save(key, io.BytesIO(b"data")) == "memory://1/a.jpg"
+    assert storage.objects[key] == b"data"
+    storage.delete_many([key, "missing"])
+    assert storage.keys() == []
+
+
+def test_local_backend_keeps_flat_upload_urls(tmp_path):
+    storage = LocalStorageBackend(str(tmp_path), "/uploads", max_bytes=1024, chunk_size=16)
+    key = storage.make_key(1, "a.jpg")
+    assert storage.save(key, io.BytesIO(b"data")) == "/uploads/a.jpg"
+    assert (tmp_path / "a.jpg").read_bytes() == b"data"
+    storage.delete(key)
+    storage.delete(key)
+    assert not (tmp_path / "a.jpg").exists()
+
+
+def test_s3_backend_against_mocked_s3():
+    moto = pytest.importorskip("moto")
+    with moto.mock_aws():
+        storage = S3StorageBackend(
+            bucket="photos", region="us-east-1", access_key_id="test", secret_access_key="test"
+        )
+        storage.client.create_bucket(Bucket="photos")
+        key = storage.make_key(7, "a.jpg")
+        url = storage.save(key, io.BytesIO(b"data"), "image/jpeg")
+        assert url == "https://photos.s3.us-east-1.amazonaws.com/todo-photos/7/a.jpg"
+        assert storage.client.get_object(Bucket="photos", Key=key)["Body"].read() == b"data"
+        storage.delete(key)
+        assert storage.client.list_objects_v2(Bucket="photos").get("KeyCount") == 0
+
+
+def test_s3_backend_presigns_delivery_urls():
+    moto = pytest.importorskip("moto")
+    requests = pytest.importorskip("requests")
+    with moto.mock_aws():
+        storage = S3StorageBackend(
+            bucket="photos", region="us-east-1", access_key_id="test", secret_access_key="test",
+            presign_expiry=300, url_prefix="/api/v1/photos"
+        )
+        storage.client.create_bucket(Bucket="photos")
+        key = storage.make_key(7, "a.jpg")
+        url = storage.save(key, io.BytesIO(b"data"), "image/jpeg")
+        assert url == "/api/v1/photos/todo-photos/7/a.jpg"
+        assert storage.owns_key(key) and not storage.owns_key("elsewhere/a.jpg")
+
+        presigned = storage.delivery_url(key, url)
+        assert "X-Amz-Expires=300" in presigned
+        assert requests.get(presigned).content == b"data"
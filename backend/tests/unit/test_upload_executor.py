@@ -0,0 +1,40 @@
+"""
+Unit tests for the bounded photo upload executor.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from todo_api.services.upload_executor import UploadExecutor, UploadQueueFullError
+
+
+def test_uploads_run_off_the_event_loop_and_full_queue_is_refused():
+    executor = UploadExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    loop_thread = threading.get_ident()
+
+    def slow_upload(value):
+        release.wait(5)
+        assert threading.get_ident() != loop_thread
+        return value
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run("memory", slow_upload, "a"))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(executor.run("memory", slow_upload, "b"))
+        await asyncio.sleep(0.05)
+        assert (executor.running, executor.waiting) == (1, 1)
+
+        with pytest.raises(UploadQueueFullError):
+            await executor.run("memory", slow_upload, "c")
+
+        release.set()
+        return await first, await second
+
+    try:
+        assert asyncio.run(scenario()) == ("a", "b")
+        assert (executor.running, executor.waiting) == (0, 0)
+    finally:
+        executor.stop()
@@ -0,0 +1,23 @@
+"""
+Unit tests for streaming upload storage.
+"""
+
+import io
+import os
+
+import pytest
+
+from todo_api.core.uploads import UploadTooLargeError, save_upload
+
+
+def test_upload_is_copied_in_chunks(tmp_path):
+    written = save_upload(io.BytesIO(b"x" * 1000), str(tmp_path), "a.jpg", max_bytes=1000, chunk_size=64)
+    assert written == 1000
+    assert os.listdir(tmp_path) == ["a.jpg"]
+    assert (tmp_path / "a.jpg").read_bytes() == b"x" * 1000
+
+
+def test_oversized_upload_leaves_no_files(tmp_path):
+    with pytest.raises(UploadTooLargeError):
+        save_upload(io.BytesIO(b"x" * 1001), str(tmp_path), "a.jpg", max_bytes=1000, chunk_size=64)
+    assert os.listdir(tmp_path) == []